@@ -0,0 +1,128 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         assets.py
+SPECIFICATION:    Load the images of the game the first time they are drawn and keep them in a sprite cache.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import os
+
+import const
+
+# The assets folder, found from this file so the game can be started from any directory
+ASSET_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "assets")
+
+# Sprite names and the image file of each, the names are the entity types of the drawn entities
+# 'pipe_top' and 'background' are made from other images when they are loaded
+SPRITE_FILES = {
+    'pipe_bottom': "pipe.png",
+    'bird': "bird1.png",
+    'base': "base.png",
+    'background': "bg.png",
+    **{f'num_{digit}': os.path.join("numbers", f"{digit}.png") for digit in range(10)},
+}
+# Sprites without transparent pixels, converted without an alpha channel so they are drawn faster
+OPAQUE_SPRITES = ('base', 'background')
+# Entity types that can be drawn, 'rectangle' draws a primitive shape and doesn't have a sprite
+ENTITY_TYPES = ('rectangle', 'pipe_top', 'pipe_bottom', 'bird', 'base')
+
+# Sprites loaded so far by name
+_sprites = dict()
+# Strips of sprites side by side, by the sprite name and how many times it is repeated
+_strips = dict()
+
+
+def get_sprite(name: str) -> "pygame.Surface":
+    """
+    NAME:           get_sprite
+    PARAMETERS:     name, the name of the sprite, an entity type, 'background', or 'num_0' to 'num_9'
+    PURPOSE:        This function returns the surface of a sprite, loading it the first time it is used.
+                    pygame is only imported here, so the simulation and the search can run without it.
+    PRECONDITION:   name is a key of SPRITE_FILES, 'pipe_top', or 'background'
+    POSTCONDITION:  The cached surface is returned, it must not be modified.
+    """
+    sprite = _sprites.get(name)
+    if sprite is None:
+        sprite = _load(name)
+        _sprites[name] = sprite
+    return sprite
+
+
+def get_number(digit: int) -> "pygame.Surface":
+    """
+    NAME:           get_number
+    PARAMETERS:     digit, the digit to draw
+    PURPOSE:        This function returns the sprite of a digit of the pipe counter.
+    PRECONDITION:   digit is from 0 to 9
+    POSTCONDITION:  The cached surface is returned, it must not be modified.
+    """
+    return get_sprite(f'num_{digit}')
+
+
+def get_strip(name: str, count: int) -> "pygame.Surface":
+    """
+    NAME:           get_strip
+    PARAMETERS:     name, the name of the sprite
+                    count, how many copies of the sprite are side by side
+    PURPOSE:        This function returns one surface with the sprite repeated from left to right, composed the first
+                    time it is used. Drawing the strip is one blit instead of one for every copy.
+    PRECONDITION:   name is a valid sprite name and count is greater than zero
+    POSTCONDITION:  The cached surface is returned, it must not be modified.
+    """
+    strip = _strips.get((name, count))
+    if strip is None:
+        import pygame
+
+        sprite = get_sprite(name)
+        width = sprite.get_width()
+        strip = pygame.Surface((width * count, sprite.get_height()), sprite.get_flags(), sprite)
+        for index in range(count):
+            strip.blit(sprite, (index * width, 0))
+        _strips[(name, count)] = strip
+    return strip
+
+
+def render_number(value: int) -> "pygame.Surface":
+    """
+    NAME:           render_number
+    PARAMETERS:     value, the number to render
+    PURPOSE:        This function draws the digits of a number from left to right onto a new transparent surface,
+                    each digit const.NUM_X pixels after the one before it.
+    PRECONDITION:   value is greater than or equal to zero
+    POSTCONDITION:  A new surface of the number is returned.
+    """
+    import pygame
+
+    digits = str(value)
+    surface = pygame.Surface((len(digits) * const.NUM_X, const.NUM_Y), pygame.SRCALPHA)
+    for index, digit in enumerate(digits):
+        surface.blit(get_number(int(digit)), (index * const.NUM_X, 0))
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+
+def _load(name: str) -> "pygame.Surface":
+    """
+    NAME:           _load
+    PARAMETERS:     name, the name of the sprite
+    PURPOSE:        This function loads a sprite from its file and converts it to the pixel format of the window,
+                    so it is not converted again every time it is drawn. Before the window is open there is no
+                    format to convert to and the image is kept as it was loaded.
+    PRECONDITION:   name is a valid sprite name
+    POSTCONDITION:  A new surface of the sprite is returned.
+    """
+    import pygame
+
+    # The top pipe is the bottom pipe upside down
+    if name == 'pipe_top':
+        return pygame.transform.flip(get_sprite('pipe_bottom'), False, True)
+
+    image = pygame.image.load(os.path.join(ASSET_DIR, SPRITE_FILES[name]))
+    if name == 'background':
+        image = pygame.transform.scale(image, (const.WIDTH, const.HEIGHT))
+
+    if pygame.display.get_surface() is not None:
+        image = image.convert() if name in OPAQUE_SPRITES else image.convert_alpha()
+    return image
+
@@ -0,0 +1,227 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         ballistic.py
+SPECIFICATION:    Predict a bird that doesn't jump for many frames at once instead of updating it frame by frame.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import numpy as np
+
+import const
+from batch import dist_to_rect_sides
+
+
+class NoJumpProjection:
+    """
+    NAME:           NoJumpProjection
+    PURPOSE:        The positions of a game state for a number of frames where the bird never jumps.
+                    Without a jump the bird only has constant gravity and the pipes and floor only move at a constant
+                    speed, so every frame is calculated directly from the starting state instead of from the frame
+                    before it. The collision test of every frame is then done at once to find when, and if, the bird
+                    dies on a pipe or the floor, or reaches const.BIRD_MIN_Y.
+    INVARIANTS:     Index i of each array is the frame after i + 1 updates.
+                    event_frame is None when nothing happens within frames, event is then None as well.
+    """
+    # How many frames were projected
+    frames: int
+
+    # The bird after each frame
+    bird_y: np.ndarray
+    velocity: np.ndarray
+
+    # The pipe pairs after each frame, with shape (frames, pipes)
+    pipe_x: np.ndarray
+    top_y: np.ndarray
+    bot_y: np.ndarray
+    # The passed flag of each pipe pair after the last frame, and how many pipes were passed in total
+    passed: list[bool]
+    newly_passed: int
+    # How many pipe pairs were respawned
+    spawns: int
+
+    # The floor tile x positions after each frame, with shape (frames, tiles)
+    floor_x: np.ndarray
+
+    # The distance and location of the closest side during each frame
+    threat_dist: np.ndarray
+    threat_x: np.ndarray
+    threat_y: np.ndarray
+
+    # The first frame where the bird dies or has to be moved back from the top, and what happened
+    event_frame: int
+    event: str
+
+    def __init__(self, game_state, frames: int):
+        """
+        NAME:           NoJumpProjection.__init__
+        PARAMETERS:     game_state, the state to project from, it is not modified
+                        frames, how many frames to project
+        PURPOSE:        This method calculates every frame of the projection and finds the first event.
+        PRECONDITION:   frames is greater than zero and the bird of game_state is not dead.
+        POSTCONDITION:  This instance's fields hold the projection.
+        """
+        self.frames = frames
+        delta = game_state.delta
+        movement = game_state.pipe_speed * delta
+        k = np.arange(1, frames + 1)
+
+        # Velocity after k updates is v0 + k * g * dt, and the position is the sum of those velocities
+        bird = game_state.bird
+        self.velocity = np.clip(bird.velocity + const.GRAVITY * delta * k, const.MIN_VELOCITY, const.MAX_VELOCITY)
+        self.bird_y = bird.y + delta * np.cumsum(self.velocity)
+        # Collisions and bounds are checked on the position before the bird moves each frame
+        y_before = np.concatenate(([bird.y], self.bird_y[:-1]))
+
+        self._project_pipes(game_state, k, movement)
+        self._project_floor(game_state, k, movement)
+        self._find_event(y_before)
+
+    def _project_pipes(self, game_state, k: np.ndarray, movement: float) -> None:
+        """
+        NAME:           NoJumpProjection._project_pipes
+        PARAMETERS:     game_state, the state to project from
+                        k, the number of updates for each frame
+                        movement, how far the pipes move each frame
+        PURPOSE:        This method moves every pipe pair along its straight line, respawning it with the next gap
+                        of the schedule whenever it passes const.PIPE_TRASH, the same way PipePair.update does.
+        PRECONDITION:   None
+        POSTCONDITION:  The pipe arrays, passed flags, and counters are set.
+        """
+        pipes = game_state.pipes
+        self.pipe_x = np.empty((self.frames, len(pipes)))
+        self.top_y = np.empty_like(self.pipe_x)
+        self.bot_y = np.empty_like(self.pipe_x)
+        self.passed = list()
+        self.newly_passed = 0
+
+        # Frame index and pipe index of each respawn
+        respawns = list()
+        for j, pipe_pair in enumerate(pipes):
+            x = pipe_pair.x - k * movement
+            self.top_y[:, j] = pipe_pair.top_pipe.y
+            self.bot_y[:, j] = pipe_pair.bot_pipe.y
+
+            passed = pipe_pair.passed
+            start = 0
+            # The pipes only move left between respawns, so the last frame is checked first
+            while x[-1] < const.PIPE_TRASH:
+                gone = np.flatnonzero(x[start:] < const.PIPE_TRASH)
+                # The pipes are passed before they can be respawned
+                if not passed:
+                    self.newly_passed += 1
+                passed = False
+
+                index = start + gone[0]
+                respawns.append((index, j))
+                x[index:] = const.PIPE_SPAWN - (k[index:] - k[index]) * movement
+                start = index + 1
+
+            if not passed and x[-1] + const.PIPE_X < const.BIRD_POS_X:
+                self.newly_passed += 1
+                passed = True
+            self.passed.append(passed)
+            self.pipe_x[:, j] = x
+
+        # Gaps are taken from the schedule frame by frame, and in pipe order within a frame
+        respawns.sort()
+        for spawn, (index, j) in enumerate(respawns):
+            self.top_y[index:, j], self.bot_y[index:, j] = game_state.gap_schedule.get(
+                game_state.pipes_spawned + spawn)
+        self.spawns = len(respawns)
+
+    def _project_floor(self, game_state, k: np.ndarray, movement: float) -> None:
+        """
+        NAME:           NoJumpProjection._project_floor
+        PARAMETERS:     game_state, the state to project from
+                        k, the number of updates for each frame
+                        movement, how far the floor moves each frame
+        PURPOSE:        This method moves every floor tile along its straight line, moving it back to the right by the
+                        length of the floor as many times as Floor.update would have.
+        PRECONDITION:   None
+        POSTCONDITION:  floor_x is set.
+        """
+        tiles = game_state.floor.tiles
+        length = const.BASE_X * len(tiles)
+        x = np.array([tile.x for tile in tiles])[None, :] - k[:, None] * movement
+        wraps = np.where(const.BASE_X + x < 0, np.ceil(-(const.BASE_X + x) / length), 0)
+        self.floor_x = x + wraps * length
+
+    def _find_event(self, y_before: np.ndarray) -> None:
+        """
+        NAME:           NoJumpProjection._find_event
+        PARAMETERS:     y_before, the bird y position at the start of each frame
+        PURPOSE:        This method measures the closest side of every pipe and the floor plane for each frame and
+                        finds the first frame where the bird dies, or where it is above const.BIRD_MIN_Y and would be
+                        moved back. A bird below const.BIRD_MAX_Y is always inside the floor and dies.
+        PRECONDITION:   The pipes and floor have been projected.
+        POSTCONDITION:  The threat arrays, event_frame, and event are set.
+        """
+        pipes = self.pipe_x.shape[1]
+
+        # Top then bottom pipe of each pair, then the floor plane, the same as in BatchState._update_threat
+        left = np.repeat(self.pipe_x, 2, axis=1)
+        top = np.empty_like(left)
+        top[:, 0::2] = self.top_y
+        top[:, 1::2] = self.bot_y
+
+        c_x = np.full((self.frames, 1), const.BIRD_POS_X + const.BIRD_X / 2)
+        c_y = (y_before + const.BIRD_Y / 2)[:, None]
+        dist, p_x, p_y = dist_to_rect_sides(c_x, c_y, left, top, left + const.PIPE_X, top + const.PIPE_Y)
+        dist = np.concatenate((dist, np.maximum(const.FLOOR_Y - c_y, 0.0)), axis=1)
+        p_x = np.concatenate((p_x, c_x), axis=1)
+        p_y = np.concatenate((p_y, np.full((self.frames, 1), float(const.FLOOR_Y))), axis=1)
+
+        closest = np.argmin(dist, axis=1)
+        index = np.arange(self.frames)
+        self.threat_dist = dist[index, closest]
+        self.threat_x = p_x[index, closest]
+        self.threat_y = p_y[index, closest]
+
+        dies = self.threat_dist < const.BIRD_DEATH
+        too_high = y_before < const.BIRD_MIN_Y
+        events = np.flatnonzero(dies | too_high)
+        if len(events) == 0:
+            self.event_frame = None
+            self.event = None
+        else:
+            first = events[0]
+            self.event_frame = int(first) + 1
+            if too_high[first] and not dies[first]:
+                self.event = 'ceiling'
+            else:
+                self.event = 'floor' if closest[first] >= 2 * pipes else 'pipe'
+
+    def apply(self, game_state) -> None:
+        """
+        NAME:           NoJumpProjection.apply
+        PARAMETERS:     game_state, a clone of the state this projection was made from
+        PURPOSE:        This method moves the game state to the last frame of the projection, the same as calling
+                        GameState.do_update once for each frame.
+        PRECONDITION:   event_frame is None, the bird survives every frame without being moved back.
+        POSTCONDITION:  game_state is at the last frame of the projection.
+        """
+        game_state.pipes_passed += self.newly_passed
+        game_state.pipes_spawned += self.spawns
+
+        # The background counts down from -1 to -const.WIDTH and then starts over
+        game_state.bg_i = -((-game_state.bg_i + self.frames - 1) % const.WIDTH + 1)
+
+        for tile, x in zip(game_state.floor.tiles, self.floor_x[-1].tolist()):
+            tile.x = x
+
+        for j, pipe_pair in enumerate(game_state.pipes):
+            pipe_pair.x = float(self.pipe_x[-1, j])
+            pipe_pair.passed = self.passed[j]
+            pipe_pair.top_pipe.x = pipe_pair.x
+            pipe_pair.bot_pipe.x = pipe_pair.x
+            pipe_pair.top_pipe.y = float(self.top_y[-1, j])
+            pipe_pair.bot_pipe.y = float(self.bot_y[-1, j])
+
+        bird = game_state.bird
+        bird.y = float(self.bird_y[-1])
+        bird.velocity = float(self.velocity[-1])
+        bird.threat = float(self.threat_dist[-1]), [float(self.threat_x[-1]), float(self.threat_y[-1])]
+
+        # Entities outside of the simulation, such as debug lines, update themselves from the new positions
+        for entity in game_state.updatables:
+            entity.update(game_state)
@@ -0,0 +1,257 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         batch.py
+SPECIFICATION:    Advance many game states at once with NumPy arrays instead of per entity method calls.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import numpy as np
+
+import const
+
+
+def dist_to_rect_sides(c_x: np.ndarray, c_y: np.ndarray, left: np.ndarray, top: np.ndarray,
+                       right: np.ndarray, bot: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NAME:           dist_to_rect_sides
+    PARAMETERS:     c_x and c_y, the center of each bird as arrays with shape (n, 1)
+                    left, top, right, and bot, the sides of each rectangle as arrays with shape (n, r)
+    PURPOSE:        This function is the vectorized form of game.dist_to_rect_side. Outside of a rectangle the closest
+                    point of the 8 areas is the center clamped to the rectangle, inside of it (area 5) the point is on
+                    the right side, so every row gets the same point the scalar function would return.
+    PRECONDITION:   The arrays can be broadcast against each other.
+    POSTCONDITION:  The distance to the closest side of each rectangle and the x/y of that point are returned
+                    as arrays with shape (n, r).
+    """
+    p_x = np.minimum(np.maximum(c_x, left), right)
+    p_y = np.minimum(np.maximum(c_y, top), bot)
+    inside = (p_x == c_x) & (p_y == c_y)
+    p_x = np.where(inside, right, p_x)
+
+    return np.sqrt((c_x - p_x) ** 2 + (c_y - p_y) ** 2), p_x, p_y
+
+
+class BatchState:
+    """
+    NAME:           BatchState
+    PURPOSE:        A struct-of-arrays copy of many game states, one row per state, which can be advanced
+                    one frame for every row with a single call to step.
+    INVARIANTS:     Every array has the same number of rows.
+                    Pipe arrays keep the order of GameState.pipes and floor arrays keep the order of Floor.tiles.
+    """
+    # Frame timing and movement for each row
+    delta: np.ndarray
+    pipe_speed: np.ndarray
+    bg_i: np.ndarray
+    pipes_passed: np.ndarray
+    # The gap schedule of each row and how many pipes each row has spawned from it
+    gap_schedules: list
+    pipes_spawned: np.ndarray
+
+    # Bird fields for each row
+    bird_y: np.ndarray
+    velocity: np.ndarray
+    dead: np.ndarray
+    # Distance and location of the closest side, only updated when the bird doesn't die
+    threat_dist: np.ndarray
+    threat_x: np.ndarray
+    threat_y: np.ndarray
+
+    # Pipe pair fields with shape (rows, pipes)
+    pipe_x: np.ndarray
+    top_y: np.ndarray
+    bot_y: np.ndarray
+    passed: np.ndarray
+
+    # Floor tile x positions with shape (rows, tiles)
+    floor_x: np.ndarray
+
+    def __init__(self, game_states: list, repeat: int = 1):
+        """
+        NAME:           BatchState.__init__
+        PARAMETERS:     game_states, the states to copy into arrays
+                        repeat, how many consecutive rows each state is copied to
+        PURPOSE:        This method initializes the arrays from the fields of each game state.
+        PRECONDITION:   game_states is not empty and every state has the same number of pipes and floor tiles.
+        POSTCONDITION:  Row i * repeat + k holds a copy of game_states[i] for every k below repeat.
+        """
+        def column(values, dtype=float) -> np.ndarray:
+            return np.repeat(np.array(values, dtype=dtype), repeat, axis=0)
+
+        self.delta = column([gs.delta for gs in game_states])
+        self.pipe_speed = column([gs.pipe_speed for gs in game_states])
+        self.bg_i = column([gs.bg_i for gs in game_states], int)
+        self.pipes_passed = column([gs.pipes_passed for gs in game_states], int)
+        self.gap_schedules = [gs.gap_schedule for gs in game_states for _ in range(repeat)]
+        self.pipes_spawned = column([gs.pipes_spawned for gs in game_states], int)
+
+        self.bird_y = column([gs.bird.y for gs in game_states])
+        self.velocity = column([gs.bird.velocity for gs in game_states])
+        self.dead = column([gs.bird.dead for gs in game_states], bool)
+        # A bird without a threat yet has an infinite distance, which is never written back
+        self.threat_dist = column([gs.bird.threat[0] if gs.bird.threat else np.inf for gs in game_states])
+        self.threat_x = column([gs.bird.threat[1][0] if gs.bird.threat else 0.0 for gs in game_states])
+        self.threat_y = column([gs.bird.threat[1][1] if gs.bird.threat else 0.0 for gs in game_states])
+
+        self.pipe_x = column([[pp.x for pp in gs.pipes] for gs in game_states])
+        self.top_y = column([[pp.top_pipe.y for pp in gs.pipes] for gs in game_states])
+        self.bot_y = column([[pp.bot_pipe.y for pp in gs.pipes] for gs in game_states])
+        self.passed = column([[pp.passed for pp in gs.pipes] for gs in game_states], bool)
+
+        self.floor_x = column([[tile.x for tile in gs.floor.tiles] for gs in game_states])
+
+    def take(self, rows: np.ndarray) -> "BatchState":
+        """
+        NAME:           BatchState.take
+        PARAMETERS:     rows, the indexes of the rows to keep, in the order they are kept
+        PURPOSE:        This method selects rows of this batch into a new batch without going through any GameState.
+        PRECONDITION:   Every index is below len(self).
+        POSTCONDITION:  A new batch is returned whose row i is a copy of row rows[i] of this batch.
+        """
+        new = object.__new__(BatchState)
+        new.delta = self.delta[rows]
+        new.pipe_speed = self.pipe_speed[rows]
+        new.bg_i = self.bg_i[rows]
+        new.pipes_passed = self.pipes_passed[rows]
+        new.gap_schedules = [self.gap_schedules[row] for row in rows.tolist()]
+        new.pipes_spawned = self.pipes_spawned[rows]
+
+        new.bird_y = self.bird_y[rows]
+        new.velocity = self.velocity[rows]
+        new.dead = self.dead[rows]
+        new.threat_dist = self.threat_dist[rows]
+        new.threat_x = self.threat_x[rows]
+        new.threat_y = self.threat_y[rows]
+
+        new.pipe_x = self.pipe_x[rows]
+        new.top_y = self.top_y[rows]
+        new.bot_y = self.bot_y[rows]
+        new.passed = self.passed[rows]
+
+        new.floor_x = self.floor_x[rows]
+        return new
+
+    def branch(self) -> "BatchState":
+        """
+        NAME:           BatchState.branch
+        PARAMETERS:     None
+        PURPOSE:        This method simulates the no jump and jump future of every row in one step, the array form of
+                        TreeNode._populate_children for a whole layer of the tree.
+        PRECONDITION:   None
+        POSTCONDITION:  A new batch with two rows for each row of this batch is returned, row 2 * i is the future of
+                        row i without a jump and row 2 * i + 1 the future with a jump. Rows where the bird dies are
+                        kept and marked dead.
+        """
+        children = self.take(np.repeat(np.arange(len(self)), 2))
+        # Even rows fall and odd rows jump, the same order TreeNode._populate_children updates them in
+        children.step(np.tile(np.array([False, True]), len(self)))
+        return children
+
+    def get_scores(self) -> np.ndarray:
+        """
+        NAME:           BatchState.get_scores
+        PARAMETERS:     None
+        PURPOSE:        This method is the array form of tree.get_state_score for every row.
+        PRECONDITION:   Every row has been stepped at least once.
+        POSTCONDITION:  The score of each row is returned, higher is better.
+        """
+        return self.threat_dist - np.abs(self.bird_y - const.SCREEN_MIDDLE)
+
+    def __len__(self) -> int:
+        """
+        NAME:           BatchState.__len__
+        PARAMETERS:     None
+        PURPOSE:        This method returns the number of states in this batch.
+        PRECONDITION:   None
+        POSTCONDITION:  The number of rows is returned.
+        """
+        return len(self.bird_y)
+
+    def step(self, jump: np.ndarray) -> None:
+        """
+        NAME:           BatchState.step
+        PARAMETERS:     jump, a boolean array with one value per row, True if that bird jumps before the update
+        PURPOSE:        This method advances every row by one frame the same way GameState.do_update does.
+                        The background, floor, pipes, and bird are updated in that order.
+        PRECONDITION:   jump has one value for each row.
+        POSTCONDITION:  Every row has been advanced by its own delta.
+        """
+        self.velocity = np.where(jump, float(const.JUMP_VELOCITY), self.velocity)
+
+        # Background, same as GameState.do_update
+        self.bg_i = np.where(self.bg_i == -const.WIDTH, 0, self.bg_i) - 1
+
+        # Floor, same as Floor.update
+        movement = (self.pipe_speed * self.delta)[:, None]
+        self.floor_x = self.floor_x - movement
+        self.floor_x = np.where(const.BASE_X + self.floor_x < 0,
+                                self.floor_x + const.BASE_X * self.floor_x.shape[1], self.floor_x)
+
+        # Pipes, same as PipePair.update
+        self.pipe_x = self.pipe_x - movement
+        newly_passed = (self.pipe_x + const.PIPE_X < const.BIRD_POS_X) & ~self.passed
+        self.passed = self.passed | newly_passed
+        self.pipes_passed = self.pipes_passed + newly_passed.sum(axis=1)
+
+        respawn = self.pipe_x < const.PIPE_TRASH
+        if respawn.any():
+            self.pipe_x = np.where(respawn, float(const.PIPE_SPAWN), self.pipe_x)
+            self.passed = self.passed & ~respawn
+            # Row major order matches the order PipePair.change_gap takes gaps from the schedule of each row
+            for row, pipe in zip(*np.nonzero(respawn)):
+                self.top_y[row, pipe], self.bot_y[row, pipe] = self.gap_schedules[row].get(self.pipes_spawned[row])
+                self.pipes_spawned[row] += 1
+
+        # Bird collision, same as Bird.update and get_closest_point
+        self._update_threat()
+
+        # Bird position check, a bird out of bounds is moved back and skips the gravity update
+        too_high = self.bird_y < const.BIRD_MIN_Y
+        too_low = ~too_high & (self.bird_y > const.BIRD_MAX_Y)
+        in_bounds = ~(too_high | too_low)
+        self.bird_y = np.where(too_high, float(const.BIRD_MIN_Y),
+                               np.where(too_low, float(const.BIRD_MAX_Y), self.bird_y))
+
+        velocity = np.clip(self.velocity + const.GRAVITY * self.delta, const.MIN_VELOCITY, const.MAX_VELOCITY)
+        self.velocity = np.where(in_bounds, velocity, 0.0)
+        self.bird_y = np.where(in_bounds, self.bird_y + self.velocity * self.delta, self.bird_y)
+
+    def _update_threat(self) -> None:
+        """
+        NAME:           BatchState._update_threat
+        PARAMETERS:     None
+        PURPOSE:        This method finds the closest side of every pipe and the floor plane for each bird and marks
+                        the birds within const.BIRD_DEATH as dead.
+        PRECONDITION:   The pipes and floor have been moved for this frame.
+        POSTCONDITION:  dead is set for colliding birds, the threat arrays are updated for the others.
+        """
+        rows = len(self)
+        pipes = self.pipe_x.shape[1]
+
+        # Top then bottom pipe of each pair, every pair is checked since that costs the same as finding the closest
+        left = np.empty((rows, 2 * pipes))
+        top = np.empty_like(left)
+        left[:, 0::2] = self.pipe_x
+        left[:, 1::2] = self.pipe_x
+        top[:, 0::2] = self.top_y
+        top[:, 1::2] = self.bot_y
+
+        c_x = np.full((rows, 1), const.BIRD_POS_X + const.BIRD_X / 2)
+        c_y = (self.bird_y + const.BIRD_Y / 2)[:, None]
+        dist, p_x, p_y = dist_to_rect_sides(c_x, c_y, left, top, left + const.PIPE_X, top + const.PIPE_Y)
+
+        # The floor plane goes last, the same as in get_closest_point
+        dist = np.concatenate((dist, np.maximum(const.FLOOR_Y - c_y, 0.0)), axis=1)
+        p_x = np.concatenate((p_x, c_x), axis=1)
+        p_y = np.concatenate((p_y, np.full((rows, 1), float(const.FLOOR_Y))), axis=1)
+
+        # The first closest collider wins ties, same as the strict comparison in get_closest_point
+        closest = np.argmin(dist, axis=1)
+        index = np.arange(rows)
+        dist = dist[index, closest]
+
+        alive = dist >= const.BIRD_DEATH
+        self.dead = self.dead | ~alive
+        self.threat_dist = np.where(alive, dist, self.threat_dist)
+        self.threat_x = np.where(alive, p_x[index, closest], self.threat_x)
+        self.threat_y = np.where(alive, p_y[index, closest], self.threat_y)
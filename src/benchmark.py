@@ -0,0 +1,341 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         benchmark.py
+SPECIFICATION:    Time the simulation and search hot paths on seeded scenarios and compare them to a saved baseline.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import const
+from ballistic import NoJumpProjection
+from batch import BatchState
+from game import GameState, dist_to_rect_side, get_closest_point
+from strategy import DepthFirst
+from transposition import TranspositionTable
+from tree import Tree, TreeNode, run_headless
+
+# Seeds and frames the scenario states are taken from, changing these invalidates saved baselines
+SCENARIO_SEEDS = (1, 2, 3, 4)
+SCENARIO_FRAMES = 400
+SCENARIO_STEP = 20
+# The (delta, depth) settings and frames of each end to end run
+END_TO_END = ((0.06, 40), (0.03, 80), (0.2, 20))
+END_TO_END_FRAMES = 300
+# The backends also played end to end with the first settings of END_TO_END
+END_TO_END_BACKENDS = ('arena',)
+
+
+def build_scenarios() -> list[GameState]:
+    """
+    NAME:           build_scenarios
+    PARAMETERS:     None
+    PURPOSE:        This function plays each scenario seed with the search tree and keeps a copy of the game every
+                    SCENARIO_STEP frames, so benchmarks run on states the AI actually reaches, near pipes and the floor.
+    PRECONDITION:   None
+    POSTCONDITION:  A list of game states is returned, the same list on every run.
+    """
+    scenarios = list()
+    for seed in SCENARIO_SEEDS:
+        tree = Tree(GameState(False, seed), delta=const.TREE_DELTA, depth_limit=const.TREE_DEPTH)
+        for frame in range(SCENARIO_FRAMES):
+            tree.search()
+            if len(tree.path) == 0:
+                break
+            game_state = tree.proceed()
+            if frame % SCENARIO_STEP == 0:
+                scenarios.append(game_state.clone())
+    return scenarios
+
+
+def measure(run, setup=None, repeat: int = 5, number: int = 1) -> float:
+    """
+    NAME:           measure
+    PARAMETERS:     run, the function to time, it is given the result of setup
+                    setup, a function called before each repeat that isn't timed, None to pass None to run
+                    repeat, how many times to time run
+                    number, how many operations each call of run performs
+    PURPOSE:        This function times run several times and keeps the fastest, which is the least affected by
+                    other processes on the machine.
+    PRECONDITION:   repeat and number are greater than zero
+    POSTCONDITION:  The fastest time per operation in seconds is returned.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        argument = setup() if setup is not None else None
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+    return best / number
+
+
+def bench_dist_to_rect_side(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_dist_to_rect_side
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times dist_to_rect_side from the bird to every pipe of every scenario.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per call are returned.
+    """
+    pairs = [(gs.bird, pipe) for gs in scenarios for pp in gs.pipes for pipe in (pp.top_pipe, pp.bot_pipe)]
+    pairs *= 20
+
+    def run(_):
+        for bird, pipe in pairs:
+            dist_to_rect_side(bird, pipe)
+
+    return measure(run, repeat=repeat, number=len(pairs))
+
+
+def bench_get_closest_point(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_get_closest_point
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times the collision query of the bird in every scenario.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per call are returned.
+    """
+    states = scenarios * 20
+
+    def run(_):
+        for game_state in states:
+            get_closest_point(game_state.bird, game_state)
+
+    return measure(run, repeat=repeat, number=len(states))
+
+
+def bench_do_update(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_do_update
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times one GameState.do_update of fresh clones of every scenario.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per call are returned.
+    """
+    copies = 10
+
+    def setup():
+        return [game_state.clone() for game_state in scenarios for _ in range(copies)]
+
+    def run(states):
+        for game_state in states:
+            game_state.do_update()
+
+    return measure(run, setup, repeat, len(scenarios) * copies)
+
+
+def bench_populate_children(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_populate_children
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times TreeNode._populate_children on new root nodes of every scenario.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per call are returned.
+    """
+    copies = 10
+
+    def setup():
+        # noinspection PyTypeChecker
+        return [TreeNode(None, game_state) for game_state in scenarios for _ in range(copies)]
+
+    def run(nodes):
+        for node in nodes:
+            node._populate_children()
+
+    return measure(run, setup, repeat, len(scenarios) * copies)
+
+
+def bench_no_jump_projection(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_no_jump_projection
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times projecting every scenario const.TREE_WAIT_FRAMES frames ahead without a jump,
+                    the check TreeNode._populate_children makes before waiting several frames at once.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per projection are returned.
+    """
+    states = scenarios * 10
+
+    def run(_):
+        for game_state in states:
+            NoJumpProjection(game_state, const.TREE_WAIT_FRAMES)
+
+    return measure(run, repeat=repeat, number=len(states))
+
+
+def bench_batch_branch(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_batch_branch
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times BatchState.branch on a layer of const.TREE_BEAM_WIDTH copies of every
+                    scenario, one frame of the beam search.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per layer are returned.
+    """
+    layers = [BatchState([game_state], const.TREE_BEAM_WIDTH) for game_state in scenarios] * 10
+
+    def run(_):
+        for layer in layers:
+            layer.branch()
+
+    return measure(run, repeat=repeat, number=len(layers))
+
+
+def bench_tree_search(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_tree_search
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times a full Tree.search from an empty tree rooted at every scenario, the
+                    most expensive search a frame can need.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per search are returned.
+    """
+    def setup():
+        return [Tree(game_state.clone(), delta=const.TREE_DELTA, depth_limit=const.TREE_DEPTH)
+                for game_state in scenarios]
+
+    def run(trees):
+        for tree in trees:
+            tree.search()
+
+    return measure(run, setup, repeat, len(scenarios))
+
+
+def bench_tree_search_table(scenarios: list[GameState], repeat: int) -> float:
+    """
+    NAME:           bench_tree_search_table
+    PARAMETERS:     scenarios, the seeded game states
+                    repeat, how many times to time the benchmark
+    PURPOSE:        This function times the same searches as bench_tree_search with the depth first search and a
+                    transposition table, so the cost of reading and recording the table is tracked too.
+    PRECONDITION:   scenarios is not empty
+    POSTCONDITION:  The seconds per search are returned.
+    """
+    def setup():
+        return [Tree(game_state.clone(), TranspositionTable(), const.TREE_DELTA, const.TREE_DEPTH,
+                     strategy=DepthFirst()) for game_state in scenarios]
+
+    def run(trees):
+        for tree in trees:
+            tree.search()
+
+    return measure(run, setup, repeat, len(scenarios))
+
+
+def bench_end_to_end(delta: float, depth: int, repeat: int, backend: str = None) -> float:
+    """
+    NAME:           bench_end_to_end
+    PARAMETERS:     delta and depth, the search settings to play with
+                    repeat, how many times to time the benchmark
+                    backend, the kind of tree to play with, const.TREE_BACKEND when None
+    PURPOSE:        This function plays every scenario seed headlessly and measures the frames per second.
+    PRECONDITION:   None
+    POSTCONDITION:  The seconds per frame are returned, the frames per second is the inverse.
+    """
+    frames = list()
+
+    def run(_):
+        frames.clear()
+        for seed in SCENARIO_SEEDS:
+            frames.append(run_headless(END_TO_END_FRAMES, seed, delta, depth, backend=backend)[0])
+
+    per_run = measure(run, repeat=repeat)
+    return per_run / max(sum(frames), 1)
+
+
+def run_benchmarks(repeat: int, only: list[str] = None) -> dict[str, float]:
+    """
+    NAME:           run_benchmarks
+    PARAMETERS:     repeat, how many times to time each benchmark
+                    only, the names of the benchmarks to run, None to run all of them
+    PURPOSE:        This function runs the benchmarks and prints each result as it finishes.
+    PRECONDITION:   repeat is greater than zero
+    POSTCONDITION:  A dictionary of benchmark name to seconds per operation is returned.
+    """
+    scenarios = build_scenarios()
+    benchmarks = {
+        'dist_to_rect_side': lambda: bench_dist_to_rect_side(scenarios, repeat),
+        'get_closest_point': lambda: bench_get_closest_point(scenarios, repeat),
+        'do_update': lambda: bench_do_update(scenarios, repeat),
+        'populate_children': lambda: bench_populate_children(scenarios, repeat),
+        'no_jump_projection': lambda: bench_no_jump_projection(scenarios, repeat),
+        'batch_branch': lambda: bench_batch_branch(scenarios, repeat),
+        'tree_search': lambda: bench_tree_search(scenarios, repeat),
+        'tree_search_table': lambda: bench_tree_search_table(scenarios, repeat),
+    }
+    for delta, depth in END_TO_END:
+        benchmarks[f'frame_delta{delta}_depth{depth}'] = \
+            lambda delta=delta, depth=depth: bench_end_to_end(delta, depth, max(1, repeat // 2))
+    delta, depth = END_TO_END[0]
+    for backend in END_TO_END_BACKENDS:
+        benchmarks[f'frame_{backend}_delta{delta}_depth{depth}'] = \
+            lambda backend=backend, delta=delta, depth=depth: \
+            bench_end_to_end(delta, depth, max(1, repeat // 2), backend)
+
+    results = dict()
+    for name, benchmark in benchmarks.items():
+        if only and name not in only:
+            continue
+        results[name] = benchmark()
+        line = f"{name:32} {results[name] * 1e6:12.2f} us"
+        if name.startswith('frame_'):
+            line += f" ({1 / results[name]:.0f} frames/sec)"
+        print(line, flush=True)
+    return results
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    NAME:           compare
+    PARAMETERS:     results, the seconds per operation of this run
+                    baseline, the seconds per operation of the saved run
+                    threshold, how much slower a benchmark can be before it is a regression, 0.1 is 10%
+    PURPOSE:        This function prints how each benchmark changed from the baseline.
+    PRECONDITION:   None
+    POSTCONDITION:  The names of the benchmarks slower than the threshold are returned.
+    """
+    regressions = list()
+    for name, seconds in results.items():
+        if name not in baseline:
+            print(f"{name:32} not in baseline")
+            continue
+        change = seconds / baseline[name] - 1
+        regressed = change > threshold
+        if regressed:
+            regressions.append(name)
+        print(f"{name:32} {change:+8.1%}{'  REGRESSION' if regressed else ''}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the simulation and search hot paths.")
+    parser.add_argument('--repeat', type=int, default=5, help="times each benchmark is timed, the fastest is kept")
+    parser.add_argument('--only', nargs='+', default=None, help="names of the benchmarks to run")
+    parser.add_argument('--save', default=None, help="file to save the results to as a baseline")
+    parser.add_argument('--compare', default=None, help="baseline file to compare the results to")
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help="how much slower than the baseline is a regression, 0.1 is 10%%")
+    args = parser.parse_args()
+
+    benchmark_results = run_benchmarks(args.repeat, args.only)
+
+    if args.save is not None:
+        with open(args.save, 'w') as file:
+            json.dump({'seconds_per_op': benchmark_results}, file, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as file:
+            saved = json.load(file)['seconds_per_op']
+        print()
+        if len(compare(benchmark_results, saved, args.threshold)) > 0:
+            sys.exit(1)
@@ -0,0 +1,177 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         compare.py
+SPECIFICATION:    Play several controllers side by side, each with its own bird in one game, so they are compared on
+                  exactly the same pipes.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import argparse
+import time
+
+import const
+from game import Bird, GameState
+from tree import BACKENDS, close_tree, create_tree
+
+
+class Lane:
+    """
+    NAME:           Lane
+    PURPOSE:        One controller in a comparison. The controller searches its own game state with a single bird,
+                    which plays the same as the lane's bird in the shared game because both games have the same
+                    seed and frame delta. The shared game decides when the bird dies and how many pipes it passed.
+    INVARIANTS:     tree is None once the controller found no path where its bird survives.
+                    died and pipes_passed are None while the bird is alive.
+    """
+    __slots__ = ('name', 'tree', 'bird', 'died', 'pipes_passed', 'gave_up', 'search_time')
+
+    # The controller as it was given, BACKEND[:DEPTH]
+    name: str
+    # The search tree of the controller, None after it gave up
+    tree: object
+    # The lane's bird in the shared game
+    bird: Bird
+    # The frame the bird died on and the pipes passed by then
+    died: int
+    pipes_passed: int
+    # The frame the controller found no path on, None if it never did
+    gave_up: int
+    # Seconds spent searching and advancing the controller
+    search_time: float
+
+    def __init__(self, name: str, seed: int, bird: Bird):
+        """
+        NAME:           Lane.__init__
+        PARAMETERS:     name, the controller as BACKEND or BACKEND:DEPTH, with a backend of BACKENDS
+                        seed, the seed of the shared game
+                        bird, the bird of this lane in the shared game
+        PURPOSE:        This method initializes fields for a new Lane instance and creates its controller.
+        PRECONDITION:   No frames of the shared game have been played.
+        POSTCONDITION:  This instance's fields are initialized, a ValueError is raised if name isn't a controller.
+        """
+        backend, _, depth = name.partition(':')
+        if backend not in BACKENDS:
+            raise ValueError(f"{name} is not a controller, the backend must be one of {', '.join(BACKENDS)}")
+        if depth != '' and not depth.isdigit():
+            raise ValueError(f"{name} is not a controller, the depth must be a number of frames")
+
+        self.name = name
+        self.tree = create_tree(GameState(False, seed), depth_limit=int(depth) if depth != '' else None,
+                                backend=backend)
+        self.bird = bird
+        self.died = None
+        self.pipes_passed = None
+        self.gave_up = None
+        self.search_time = 0.0
+
+    def act(self, frame: int) -> None:
+        """
+        NAME:           Lane.act
+        PARAMETERS:     frame, the frame about to be played
+        PURPOSE:        This method lets the controller choose the action of its bird for this frame and plays it in
+                        the controller's own game. A controller that finds no path gives up, and its bird falls until
+                        the shared game ends it.
+        PRECONDITION:   The bird is alive and the shared game hasn't been updated for this frame yet.
+        POSTCONDITION:  The bird jumped if the controller chose to, and the controller is one frame ahead.
+        """
+        if self.tree is None:
+            return
+        start = time.perf_counter()
+        self.tree.search()
+        if len(self.tree.path) == 0:
+            close_tree(self.tree)
+            self.tree = None
+            self.gave_up = frame
+        else:
+            if self.tree.next_action():
+                self.bird.jump()
+            self.tree.proceed()
+        self.search_time += time.perf_counter() - start
+
+
+def compare(names: list[str], seed: int, frames: int, debug: bool = False, renderer=None,
+            scheduler=None) -> list[Lane]:
+    """
+    NAME:           compare
+    PARAMETERS:     names, the controllers to compare, each as BACKEND or BACKEND:DEPTH
+                    seed, the seed of the pipe gaps
+                    frames, the most frames to play
+                    debug, if the threat line of every bird should be drawn
+                    renderer, the Renderer to draw the shared game with, None to play without a window
+                    scheduler, the FrameScheduler to wait between drawn frames with, None to not wait
+    PURPOSE:        This function plays one game with a bird for every controller. Each frame every living bird's
+                    controller acts, and then the shared game is updated once for all of them. The controllers are
+                    closed when the game ends, even if it ends with an error.
+    PRECONDITION:   names is not empty
+    POSTCONDITION:  The lanes are returned in the order of names, with the outcome of each bird.
+    """
+    world = GameState(debug, seed, len(names))
+    world.delta = const.TREE_DELTA
+    lanes = list()
+    try:
+        for name, bird in zip(names, world.birds):
+            lanes.append(Lane(name, seed, bird))
+
+        for frame in range(frames):
+            alive = [lane for lane in lanes if lane.died is None]
+            if len(alive) == 0:
+                break
+            for lane in alive:
+                lane.act(frame)
+
+            world.do_update()
+            for lane in alive:
+                if lane.bird.dead:
+                    lane.died = frame
+                    lane.pipes_passed = world.pipes_passed
+
+            if renderer is not None:
+                renderer.draw(world, [])
+                if scheduler is not None:
+                    scheduler.wait()
+    finally:
+        for lane in lanes:
+            if lane.tree is not None:
+                close_tree(lane.tree)
+
+    for lane in lanes:
+        if lane.died is None:
+            lane.pipes_passed = world.pipes_passed
+    return lanes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare controllers on the same pipes, one bird for each.")
+    parser.add_argument('controllers', nargs='+',
+                        help="controllers as BACKEND or BACKEND:DEPTH, such as object:40 object:20 policy neural")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the pipe gaps")
+    parser.add_argument('--frames', type=int, default=const.COMPARE_FRAMES, help="max number of frames to play")
+    parser.add_argument('--window', action='store_true', help="draw the game while it is played")
+    parser.add_argument('--fast', action='store_true', help="don't wait between frames in the window")
+    parser.add_argument('--debug', action='store_true', help="draw the threat line of every bird in the window")
+    args = parser.parse_args()
+
+    frame_renderer = None
+    frame_scheduler = None
+    if args.window:
+        # Only needed to draw, so the comparison can run without pygame
+        import pygame
+        from renderer import Renderer
+        from scheduler import FrameScheduler
+
+        window_surface = pygame.display.set_mode((const.WIDTH, const.HEIGHT))
+        pygame.display.set_caption("Flappy Bird AI Comparison")
+        frame_renderer = Renderer(window_surface)
+        if not args.fast:
+            frame_scheduler = FrameScheduler(const.TREE_DELTA)
+
+    played = compare(args.controllers, args.seed, args.frames, args.window and args.debug, frame_renderer,
+                     frame_scheduler)
+
+    width = max(len('Controller'), *(len(lane.name) for lane in played))
+    print(f"{'Controller':<{width}}  {'Frames':>7}  {'Pipes':>5}  {'Gave up':>7}  {'us/frame':>9}")
+    for lane in played:
+        survived = args.frames if lane.died is None else lane.died
+        gave_up = '' if lane.gave_up is None else lane.gave_up
+        print(f"{lane.name:<{width}}  {survived:>7}  {lane.pipes_passed:>5}  {gave_up:>7}  "
+              f"{lane.search_time * 1e6 / max(survived, 1):>9.1f}")
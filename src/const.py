@@ -7,6 +7,31 @@ TREE_DEPTH = 40
 TREE_DELTA = 0.06  # Wait time for each frame/level in seconds
 TREE_PREVIEW = 4  # How often to render the bird previews per second
 TREE_STEP = int((1 / TREE_DELTA) / TREE_PREVIEW)  # Used to determine when to render bird previews
+TREE_BACKEND = 'object'  # 'object' Tree, 'arena' ArenaTree, 'parallel' ParallelTree, 'policy' table, 'neural' network
+TREE_ARENA_SIZE = 4096  # How many nodes ArenaTree allocates up front, it doubles when full
+TREE_WAIT_FRAMES = 1  # Frames the bird can wait without jumping as a single tree node, 1 to disable (Tree only)
+TREE_BUDGET_MS = None  # Max milliseconds each frame's search may take, None to always search to TREE_DEPTH
+TREE_PREVIEW_SKIP = True  # Skip drawing the bird previews on frames that are already late
+TREE_LOOKAHEAD = 0  # Frames a search thread can be ahead of the window, 0 to search on the window's thread
+TREE_PARALLEL_PREFIX = 3  # ParallelTree searches every action sequence of this many frames in parallel
+TREE_PARALLEL_WORKERS = None  # Processes used by ParallelTree, None for one per core
+TREE_PARALLEL_EVERY_FRAME = True  # ParallelTree searches every prefix each frame, False only at dead ends of its plan
+TREE_PARALLEL_MAX_NODES = 500  # Max nodes each process expands searching one prefix, None to search it to the end
+TREE_STRATEGY = 'dfs'  # How Tree searches: 'dfs' depth first, 'best' best first, 'beam' beam search
+TREE_BEST_DEPTH_WEIGHT = 50  # Score added per frame ahead of the root when picking the next node for 'best'
+TREE_BEAM_WIDTH = 8  # Nodes kept per frame ahead of the root for 'beam'
+TREE_ADAPTIVE_DEPTH = False  # Pick each search's depth from the next pipes and the search cost instead of TREE_DEPTH
+TREE_MIN_DEPTH = 20  # Shallowest adaptive depth, used while the next pipes are further away than this many frames
+TREE_MAX_DEPTH = 60  # Deepest adaptive depth
+TREE_DEPTH_MARGIN = 10  # Frames the adaptive depth looks past the far side of the next pipes
+TREE_DEPTH_GAP_FRAMES = 10  # Extra frames looked ahead for the smallest gap, none for the largest
+TREE_DEPTH_COST_MS = 5  # Average search milliseconds above which the adaptive depth is shortened
+TREE_DEPTH_COST_WEIGHT = 0.2  # Weight of the latest search in the average search milliseconds
+TREE_FINE_DEPTH = None  # Frames ahead of the root the bird can jump on any frame, None for the whole depth (Tree only)
+TREE_COARSE_FACTOR = 2  # Each TREE_FINE_DEPTH frames further ahead, nodes cover this many times more frames
+TREE_COARSE_MAX = 4  # Most frames one coarse node covers
+TREE_MAX_NODES = None  # Most tree nodes kept, branches off the path are evicted past it, None for no limit (Tree only)
+TREE_MAX_BYTES = None  # Most estimated bytes of tree nodes kept, None for no limit (Tree only)
 # Size of the numbers
 NUM_X = 24
 NUM_Y = 36
@@ -45,3 +70,34 @@ GRAVITY = 1600
 JUMP_VELOCITY = -300
 MAX_VELOCITY = GRAVITY * 30
 MIN_VELOCITY = GRAVITY * -50
+# Transposition table for the search tree
+TT_ENABLED = False  # Remember searched states so equivalent states are not searched again (Tree/dfs only)
+TT_SIZE = 200000  # Max number of states remembered before the least recently used is forgotten
+TT_Y = 1  # Bird y positions within this many pixels are treated as the same
+TT_VELOCITY = 1  # Bird velocities within this amount are treated as the same
+TT_PIPE_X = 1  # Pipe x positions within this many pixels are treated as the same
+# Policy table for the 'policy' backend
+POLICY_FILE = 'policy.npy'  # The table made by policy.py, memory mapped when the game starts
+POLICY_Y_STEP = 5  # Pixels of bird height above the bottom pipe in each cell
+POLICY_VELOCITY_STEP = 25  # Bird velocity in each cell
+POLICY_X_STEP = 10  # Pixels of distance to the next pipes in each cell
+POLICY_GAP_STEP = 25  # Pixels of gap size in each cell
+POLICY_MIN_SAMPLES = 2  # Times the search must have played a cell for it to be used
+POLICY_AGREEMENT = 0.9  # Share of those times the search must have chosen the same action
+# Neuroevolution for the 'neural' backend
+EVOLVE_FILE = 'controller.npy'  # The weights of the best network found by evolve.py
+EVOLVE_HIDDEN = 8  # Hidden neurons of each network
+EVOLVE_POPULATION = 200  # Birds sharing one game on each island
+EVOLVE_ELITE = 4  # Fittest networks of each generation kept unchanged
+EVOLVE_TOURNAMENT = 3  # Random networks compared to pick each parent
+EVOLVE_MUTATION = 0.2  # Standard deviation of the noise added to each weight of a child
+EVOLVE_FRAMES = 10000  # Most frames each generation plays
+EVOLVE_PIPE_BONUS = 100  # Fitness for each pipe passed, on top of one for each frame survived
+EVOLVE_MIGRATION = 5  # Generations each island evolves on its own before its fittest networks move to the next
+EVOLVE_MIGRANTS = 2  # Networks that move to the next island
+# Side by side comparisons of controllers with compare.py
+COMPARE_FRAMES = 10000  # Most frames each comparison plays
+# Rendering
+RENDER_SCROLL_BG = True  # Scroll the background, False keeps it still so only the areas that change are redrawn
+# Search telemetry
+TELEMETRY_BUFFER = 256  # How many frame records are held in memory before they are written to the file
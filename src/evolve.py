@@ -0,0 +1,402 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         evolve.py
+SPECIFICATION:    Evolve small neural networks that play with a whole population of birds sharing one game, and play
+                  with the best of them.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+import const
+from game import GameState
+from telemetry import Telemetry
+
+# Inputs of the network, see get_features
+INPUTS = 5
+# Weights of the hidden layer, its biases, the weights of the output, and the output bias
+GENOME_SIZE = INPUTS * const.EVOLVE_HIDDEN + const.EVOLVE_HIDDEN + const.EVOLVE_HIDDEN + 1
+
+
+def get_features(game_state: GameState, ys: np.ndarray, velocities: np.ndarray) -> np.ndarray:
+    """
+    NAME:           get_features
+    PARAMETERS:     game_state, the game the birds are in
+                    ys, the y position of each bird
+                    velocities, the velocity of each bird
+    PURPOSE:        This function describes what each bird sees to its network: how far it is below the top of the
+                    gap and above the bottom of the gap of the next pipes, its velocity, how far away the pipes are,
+                    and how far it is from the middle of the screen. Every bird has the same x, so the next pipes
+                    are found once for all of them. The values are scaled to about -1 to 1.
+    PRECONDITION:   ys and velocities have the same length
+    POSTCONDITION:  An array with one row of INPUTS features for each bird is returned.
+    """
+    pipes = min((pipe_pair for pipe_pair in game_state.pipes if pipe_pair.x + const.PIPE_X > const.BIRD_POS_X),
+                key=lambda pipe_pair: pipe_pair.x, default=None)
+    features = np.empty((len(ys), INPUTS))
+    if pipes is None:
+        gap_top, gap_bot, distance = 0, const.HEIGHT, const.WIDTH
+    else:
+        gap_top = pipes.top_pipe.y + pipes.top_pipe.size_y
+        gap_bot = pipes.bot_pipe.y
+        distance = pipes.x - const.BIRD_POS_X
+    features[:, 0] = (ys - gap_top) / const.HEIGHT
+    features[:, 1] = (gap_bot - ys) / const.HEIGHT
+    features[:, 2] = velocities / -const.JUMP_VELOCITY
+    features[:, 3] = distance / const.WIDTH
+    features[:, 4] = (ys - const.SCREEN_MIDDLE) / const.HEIGHT
+    return features
+
+
+def unpack(genomes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    NAME:           unpack
+    PARAMETERS:     genomes, one row of GENOME_SIZE weights for each network
+    PURPOSE:        This function splits each genome into the layers of its network, as views of the genomes.
+    PRECONDITION:   genomes has GENOME_SIZE columns
+    POSTCONDITION:  A tuple of the hidden weights (n, INPUTS, hidden), hidden biases (n, hidden), output weights
+                    (n, hidden), and output biases (n,) is returned.
+    """
+    hidden = const.EVOLVE_HIDDEN
+    end_weights = INPUTS * hidden
+    hidden_weights = genomes[:, :end_weights].reshape(len(genomes), INPUTS, hidden)
+    hidden_biases = genomes[:, end_weights:end_weights + hidden]
+    output_weights = genomes[:, end_weights + hidden:end_weights + 2 * hidden]
+    output_biases = genomes[:, -1]
+    return hidden_weights, hidden_biases, output_weights, output_biases
+
+
+def decide(layers: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray], features: np.ndarray) -> np.ndarray:
+    """
+    NAME:           decide
+    PARAMETERS:     layers, the unpacked networks of the birds
+                    features, the features of each bird
+    PURPOSE:        This function evaluates every network on its own bird's features at once. The hidden layer is
+                    one batched matrix multiply of each bird's features with its own weights.
+    PRECONDITION:   layers and features have the same number of rows
+    POSTCONDITION:  An array with True for each bird that jumps is returned.
+    """
+    hidden_weights, hidden_biases, output_weights, output_biases = layers
+    hidden = np.tanh(np.matmul(features[:, np.newaxis, :], hidden_weights)[:, 0, :] + hidden_biases)
+    return np.einsum('ij,ij->i', hidden, output_weights) + output_biases > 0
+
+
+def play_generation(genomes: np.ndarray, seed: int, frames: int) -> np.ndarray:
+    """
+    NAME:           play_generation
+    PARAMETERS:     genomes, the network of each bird
+                    seed, the seed of the pipe gaps
+                    frames, the most frames to play
+    PURPOSE:        This function plays one game with a bird for every genome against the same pipes. The game is
+                    updated once per frame for every living bird. Each bird's fitness gains one for every frame it
+                    survives and const.EVOLVE_PIPE_BONUS for every pipe passed while alive.
+    PRECONDITION:   genomes has GENOME_SIZE columns
+    POSTCONDITION:  The fitness of each bird is returned.
+    """
+    game_state = GameState(False, seed, len(genomes))
+    game_state.delta = const.TREE_DELTA
+    birds = game_state.birds
+    layers = unpack(genomes)
+    alive = np.arange(len(birds))
+
+    for _ in range(frames):
+        living = [birds[index] for index in alive]
+        ys = np.fromiter((bird.y for bird in living), float, len(living))
+        velocities = np.fromiter((bird.velocity for bird in living), float, len(living))
+        jumps = decide(tuple(layer[alive] for layer in layers), get_features(game_state, ys, velocities))
+        for bird, jump in zip(living, jumps):
+            if jump:
+                bird.jump()
+
+        pipes_passed = game_state.pipes_passed
+        game_state.do_update()
+        reward = 1 + const.EVOLVE_PIPE_BONUS * (game_state.pipes_passed - pipes_passed)
+        survivors = list()
+        for index, bird in zip(alive, living):
+            if not bird.dead:
+                bird.fitness += reward
+                survivors.append(index)
+        if len(survivors) == 0:
+            break
+        alive = np.array(survivors)
+
+    return np.array([bird.fitness for bird in birds], dtype=float)
+
+
+def next_generation(genomes: np.ndarray, fitness: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    NAME:           next_generation
+    PARAMETERS:     genomes, the networks of the generation that was played
+                    fitness, the fitness each of them reached
+                    rng, the random generator of the island
+    PURPOSE:        This function breeds the next generation. The const.EVOLVE_ELITE fittest genomes are kept as they
+                    are, and every other child mixes the weights of two parents, each the fittest of
+                    const.EVOLVE_TOURNAMENT random genomes, and adds noise with a standard deviation of
+                    const.EVOLVE_MUTATION to every weight.
+    PRECONDITION:   genomes and fitness have the same number of rows
+    POSTCONDITION:  The new genomes are returned, fittest elite first.
+    """
+    count = len(genomes)
+    children = np.empty_like(genomes)
+    order = np.argsort(fitness)[::-1]
+    children[:const.EVOLVE_ELITE] = genomes[order[:const.EVOLVE_ELITE]]
+
+    bred = count - const.EVOLVE_ELITE
+    contenders = rng.integers(count, size=(bred, 2, const.EVOLVE_TOURNAMENT))
+    winners = np.argmax(fitness[contenders], axis=2)
+    parents = np.take_along_axis(contenders, winners[:, :, np.newaxis], axis=2)[:, :, 0]
+    mix = rng.random((bred, GENOME_SIZE)) < 0.5
+    children[const.EVOLVE_ELITE:] = np.where(mix, genomes[parents[:, 0]], genomes[parents[:, 1]])
+    children[const.EVOLVE_ELITE:] += rng.normal(0, const.EVOLVE_MUTATION, (bred, GENOME_SIZE))
+    return children
+
+
+def evolve_island(job: tuple[np.ndarray, np.random.Generator, int, int]) -> tuple[np.ndarray, np.random.Generator,
+                                                                                 list[float]]:
+    """
+    NAME:           evolve_island
+    PARAMETERS:     job, a tuple of the island's genomes, its random generator, the number of generations, and the
+                    most frames of each game
+    PURPOSE:        This function evolves one island on its own for several generations, it is the work done by each
+                    process of the pool. Every generation plays a new random seed, so the networks can't learn one
+                    set of pipes.
+    PRECONDITION:   The generations are greater than zero
+    POSTCONDITION:  A tuple of the next generation, the advanced random generator, and the best fitness of each
+                    played generation is returned.
+    """
+    genomes, rng, generations, frames = job
+    best = list()
+    for _ in range(generations):
+        fitness = play_generation(genomes, int(rng.integers(2 ** 32)), frames)
+        best.append(float(fitness.max()))
+        genomes = next_generation(genomes, fitness, rng)
+    return genomes, rng, best
+
+
+def migrate(populations: list[np.ndarray]) -> None:
+    """
+    NAME:           migrate
+    PARAMETERS:     populations, the genomes of each island
+    PURPOSE:        This function copies the const.EVOLVE_MIGRANTS fittest genomes of each island over the last genomes
+                    of the next island, in a ring, so good networks spread without every island becoming the same.
+    PRECONDITION:   Every population starts with its elite, as returned by next_generation
+    POSTCONDITION:  Every island holds the migrants of the island before it.
+    """
+    if len(populations) < 2:
+        return
+    migrants = [population[:const.EVOLVE_MIGRANTS].copy() for population in populations]
+    for index, population in enumerate(populations):
+        population[-const.EVOLVE_MIGRANTS:] = migrants[index - 1]
+
+
+def pick_best(populations: list[np.ndarray], seeds: list[int], frames: int) -> tuple[np.ndarray, float]:
+    """
+    NAME:           pick_best
+    PARAMETERS:     populations, the genomes of each island
+                    seeds, the seeds of the games to judge them on
+                    frames, the most frames of each game
+    PURPOSE:        This function plays the elite of every island together on the same games and picks the network
+                    with the highest mean fitness, so one lucky game doesn't decide the result.
+    PRECONDITION:   seeds is not empty
+    POSTCONDITION:  A tuple of the best genome and its mean fitness is returned.
+    """
+    candidates = np.concatenate([population[:const.EVOLVE_ELITE] for population in populations])
+    fitness = np.mean([play_generation(candidates, seed, frames) for seed in seeds], axis=0)
+    best = int(np.argmax(fitness))
+    return candidates[best], float(fitness[best])
+
+
+def load_genome(path: str = None) -> np.ndarray:
+    """
+    NAME:           load_genome
+    PARAMETERS:     path, the .npy file saved by evolve.py, const.EVOLVE_FILE when None
+    PURPOSE:        This function loads the weights of an evolved network.
+    PRECONDITION:   The file exists.
+    POSTCONDITION:  The genome is returned, a ValueError is raised if it was evolved with another network size.
+    """
+    genome = np.load(const.EVOLVE_FILE if path is None else path)
+    if genome.shape != (GENOME_SIZE,):
+        raise ValueError(f"The network has {genome.size} weights instead of {GENOME_SIZE}, evolve it again")
+    return genome
+
+
+class NeuralController:
+    """
+    NAME:           NeuralController
+    PURPOSE:        Plays with an evolved network, with the same interface as Tree. The network only looks at the
+                    current frame, so instead of searching ahead it picks one action, which costs one small matrix
+                    multiply, and simulates the frame it leads to. The path is the current game state and that frame.
+    INVARIANTS:     path holds the current game state followed by at most one state, the one after actions[0].
+                    path is empty when the action of the network kills the bird.
+    """
+    __slots__ = ('layers', 'path', 'actions', 'depth_limit', 'telemetry', 'budget', 'searches', 'budget_hits',
+                 'nodes_expanded')
+
+    # The unpacked network with one row
+    layers: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    # The current game state and the state after the chosen action
+    path: list[GameState]
+    # The chosen action, empty until the next search
+    actions: list[bool]
+    # Same as Tree, the network never looks ahead so only the next frame is in the path
+    depth_limit: int
+    telemetry: Telemetry
+    # Same statistics as Tree, budget is never used and no nodes are ever expanded
+    budget: float
+    searches: int
+    budget_hits: int
+    nodes_expanded: int
+
+    def __init__(self, game_state: GameState, delta: float = None, depth_limit: int = None,
+                 telemetry: Telemetry = None, genome: np.ndarray = None) -> None:
+        """
+        NAME:           NeuralController.__init__
+        PARAMETERS:     game_state: the game state to play from
+                        delta: the time of each frame, const.TREE_DELTA when None
+                        depth_limit: kept for the same interface as Tree, it isn't used
+                        telemetry: where to record each frame's statistics, None to not record them
+                        genome: the weights of the network, loaded from const.EVOLVE_FILE when None
+        PURPOSE:        This method initializes fields for a new NeuralController instance.
+        PRECONDITION:   game_state is not None
+        POSTCONDITION:  The path only holds game_state.
+        """
+        game_state.delta = const.TREE_DELTA if delta is None else delta
+        genome = load_genome() if genome is None else genome
+        self.layers = unpack(genome[np.newaxis, :])
+        self.path = [game_state]
+        self.actions = list()
+        self.depth_limit = const.TREE_DEPTH if depth_limit is None else depth_limit
+        self.telemetry = telemetry
+
+        self.budget = None
+        self.searches = 0
+        self.budget_hits = 0
+        self.nodes_expanded = 0
+
+    def search(self) -> None:
+        """
+        NAME:           NeuralController.search
+        PARAMETERS:     none
+        PURPOSE:        This method asks the network for the action of the current frame and simulates it.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The path holds the next frame, or is empty if the bird dies in it
+        """
+        self.searches += 1
+        start = time.perf_counter()
+
+        if len(self.path) == 1:
+            game_state = self.path[0]
+            bird = game_state.bird
+            features = get_features(game_state, np.array([bird.y]), np.array([bird.velocity]))
+            jump = bool(decide(self.layers, features)[0])
+            child = game_state.clone()
+            if jump:
+                child.bird.jump()
+            child.do_update()
+            if child.bird.dead:
+                self.path.clear()
+            else:
+                self.path.append(child)
+                self.actions.append(jump)
+
+        if self.telemetry is not None:
+            self.telemetry.frame.update({
+                'frame': self.searches - 1,
+                'search_ms': (time.perf_counter() - start) * 1000,
+                'nodes': 0,
+                'path_frames': len(self.path),
+            })
+
+    def proceed(self) -> GameState:
+        """
+        NAME:           NeuralController.proceed
+        PARAMETERS:     none
+        PURPOSE:        This method plays the chosen action.
+        PRECONDITION:   The length of path is 2
+        POSTCONDITION:  The next game state is returned and is the only state of the path
+        """
+        self.path.pop(0)
+        self.actions.pop(0)
+        return self.path[0]
+
+    def next_action(self) -> bool:
+        """
+        NAME:           NeuralController.next_action
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action the next call to proceed plays, so it can be recorded.
+        PRECONDITION:   The length of path is 2
+        POSTCONDITION:  True is returned if the bird jumps on the next frame, False if it doesn't
+        """
+        return self.actions[0]
+
+    def get_path_states(self) -> list[GameState]:
+        """
+        NAME:           NeuralController.get_path_states
+        PARAMETERS:     none
+        PURPOSE:        This method returns the current game state and the next one.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of the game states of the path is returned
+        """
+        return list(self.path)
+
+    def get_path_frames(self) -> list[int]:
+        """
+        NAME:           NeuralController.get_path_frames
+        PARAMETERS:     none
+        PURPOSE:        This method returns how many frames ahead of the current state each state of the path is.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of frame offsets matching get_path_states is returned
+        """
+        return list(range(len(self.path)))
+
+    def get_path_actions(self) -> list[bool]:
+        """
+        NAME:           NeuralController.get_path_actions
+        PARAMETERS:     none
+        PURPOSE:        This method returns the chosen action.
+        PRECONDITION:   none
+        POSTCONDITION:  A list with the action of the next frame is returned, empty before a search
+        """
+        return list(self.actions)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Evolve the network of the 'neural' backend on islands of birds.")
+    parser.add_argument('--generations', type=int, default=50, help="generations every island evolves")
+    parser.add_argument('--islands', type=int, default=os.cpu_count(), help="populations evolved in parallel")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first networks and of the games played")
+    parser.add_argument('--frames', type=int, default=const.EVOLVE_FRAMES, help="max frames of each game")
+    parser.add_argument('--judge', type=int, default=5, help="games the best networks are compared on at the end")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument('--output', default=const.EVOLVE_FILE, help="the .npy file to save the best network to")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    generators = [np.random.default_rng([args.seed, island]) for island in range(args.islands)]
+    islands = [generator.normal(0, 1, (const.EVOLVE_POPULATION, GENOME_SIZE)) for generator in generators]
+    evolved = 0
+    with multiprocessing.Pool(args.workers) as pool:
+        while evolved < args.generations:
+            epoch = min(const.EVOLVE_MIGRATION, args.generations - evolved)
+            results = pool.map(evolve_island, [(genomes, generator, epoch, args.frames)
+                                               for genomes, generator in zip(islands, generators)])
+            islands = [genomes for genomes, _, _ in results]
+            generators = [generator for _, generator, _ in results]
+            migrate(islands)
+            evolved += epoch
+            best_fitness = [max(best) for _, _, best in results]
+            print(f"Generation {evolved}: best fitness {max(best_fitness):.0f}, "
+                  f"by island {' '.join(f'{fitness:.0f}' for fitness in best_fitness)}")
+
+    # The judging games use seeds no generation was played on, the generations use 32 bit seeds
+    judge_seeds = [2 ** 32 + args.seed * args.judge + index for index in range(args.judge)]
+    best_genome, mean_fitness = pick_best(islands, judge_seeds, args.frames)
+    np.save(args.output, best_genome)
+    print(f"Evolved {args.islands} islands of {const.EVOLVE_POPULATION} birds for {args.generations} generations "
+          f"in {time.perf_counter() - start_time:.1f}s")
+    print(f"Saved {args.output}, mean fitness {mean_fitness:.0f} on {args.judge} new games")
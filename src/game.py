@@ -0,0 +1,1209 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         game.py
+SPECIFICATION:    The entities and state of a game of Flappy Bird, and the collision checks between them.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import math
+
+import assets
+import const
+from schedule import GapSchedule
+
+# pygame is only imported by the methods that draw or read input, so games can be simulated without it.
+
+
+def dist_to_rect_side(rectangle_1: "Rectangle", rectangle_2: "Rectangle") -> tuple[float, list[float]]:
+    """
+    NAME:           dist_to_rect_side
+    PARAMETERS:     rectangle_1, the rectangle to start from
+                    rectangle_2, the rectangle to calculate the distance to
+    PURPOSE:        This function calculates the distance from the center of rectangle_1
+                    to the closest edge of rectangle_2 to measure the distance to a collision.
+    PRECONDITION:   Both rectangles should be initialized and not None.
+    POSTCONDITION:  The rectangles will not be modified. A tuple will be returned.
+                    The first value of the tuple will be the distance to the closest edge as a float.
+                    The second value will be a coordinate pair of where the collision is, with
+                    the first value being the x position and the second value being the y position.
+                    The coordinates are returned as a list of floats.
+    """
+    # 8 states for the 8 areas created by dividing the coordinate space
+    # along the sides of the rectangle (as if they were infinite)
+    # Excluding inside the rectangle
+    #     LEFT    RIGHT
+    #     11 # 22 # 33
+    #     11 # 22 # 33
+    #     ## # ## # ## TOP
+    #     44 # XX # 55
+    #     44 # XX # 55
+    #     ## # ## # ## BOT
+    #     66 # 77 # 88
+    #     66 # 77 # 88
+
+    # Center of rectangle 1
+    r1_center = rectangle_1.get_center_pos()
+    r1_x = r1_center[0]
+    r1_y = r1_center[1]
+
+    # Rectangle sides as 1D planes
+    left = rectangle_2.x
+    right = rectangle_2.x + rectangle_2.size_x
+    top = rectangle_2.y
+    bot = rectangle_2.y + rectangle_2.size_y
+
+    # The point to check distance to
+    p: list[float]
+    # State 1
+    if r1_x < left and r1_y < top:
+        p = [rectangle_2.x, rectangle_2.y]
+    # State 3
+    elif r1_x > right and r1_y < top:
+        p = [rectangle_2.x + rectangle_2.size_x, rectangle_2.y]
+    # State 6
+    elif r1_x < left and r1_y > bot:
+        p = [rectangle_2.x, rectangle_2.y + rectangle_2.size_y]
+    # State 8
+    elif r1_x > right and r1_y > bot:
+        p = [rectangle_2.x + rectangle_2.size_x, rectangle_2.y + rectangle_2.size_y]
+    # State 2
+    elif r1_y < top:
+        p = [r1_x, rectangle_2.y]
+    # State 7
+    elif r1_y > bot:
+        p = [r1_x, rectangle_2.y + rectangle_2.size_y]
+    # State 4
+    elif r1_x < left:
+        p = [rectangle_2.x, r1_y]
+    # State 5
+    else:
+        p = [rectangle_2.x + rectangle_2.size_x, r1_y]
+
+    return math.dist([r1_x, r1_y], p), p
+
+
+def get_closest_point(rectangle: "Rectangle", game_state: "GameState") -> tuple[float, list[float]]:
+    """
+    NAME:           get_closest_point
+    PARAMETERS:     rectangle, the rectangle to start from
+                    game_state, the state of the game the rectangle is in
+    PURPOSE:        This function measures the distance from the provided rectangle
+                    to the closest collider in the game state. The floor is a plane across the whole screen.
+                    A pipe is never closer than the horizontal distance to its pair, so pairs further than the
+                    closest side found so far are skipped, which leaves only the next one or two pairs to check.
+    PRECONDITION:   Both parameters should be initialized and not None.
+    POSTCONDITION:  The parameters will not be modified. A tuple will be returned.
+                    The first value of the tuple will be the distance to the closest edge as a float.
+                    The second value will be a coordinate pair of where the collision is, with
+                    the first value being the x position and the second value being the y position.
+                    The coordinates are returned as a list of floats.
+    """
+    center_x, center_y = rectangle.get_center_pos()
+    floor_dist = max(const.FLOOR_Y - center_y, 0.0)
+
+    closest = 1000000.0, list[int]
+    # The floor bounds the search, but pipes are still checked first so they win ties
+    limit = floor_dist
+    for pipe_pair in game_state.pipes:
+        # Horizontal distance to the pair, zero when the center is between its sides
+        if max(pipe_pair.x - center_x, center_x - pipe_pair.x - const.PIPE_X) > limit:
+            continue
+        for pipe in (pipe_pair.top_pipe, pipe_pair.bot_pipe):
+            dist_tuple = dist_to_rect_side(rectangle, pipe)
+            if dist_tuple[0] < closest[0]:
+                closest = dist_tuple
+                limit = min(limit, dist_tuple[0])
+
+    if floor_dist < closest[0]:
+        closest = floor_dist, [center_x, const.FLOOR_Y]
+
+    return closest
+
+
+class GameEntity:
+    """
+    NAME:           GameEntity
+    PURPOSE:        A super class for all game entities which need to be updated or drawn to the screen
+                    x and y coordinate, and update/draw methods to be called each frame.
+    INVARIANTS:     x and y can be any positive or negative float value. x and y are not always the top left coordinate
+                    depending on the implementing class. x and y will not be none or uninitialized
+    """
+    # Slots keep instances small and make cloning a fixed set of attribute copies
+    __slots__ = ('x', 'y')
+
+    # Absolute positions can change based on the subclass
+    # Circle position is center, Rectangle is top left, etc.
+    # But for the most part, rectangle is used
+    x: float
+    y: float
+
+    def __init__(self, x, y):
+        """
+        NAME:           GameEntity.__init__
+        PARAMETERS:     x and y coordinates of the location of this entity
+        PURPOSE:        This method initializes fields for a new DrawableEntity instance.
+        PRECONDITION:   x and y are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        self.x = x
+        self.y = y
+
+    def clone(self) -> "GameEntity":
+        """
+        NAME:           GameEntity.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this entity without calling __init__.
+                        Subclasses extend this to copy their own mutable fields, immutable fields are shared.
+        PRECONDITION:   None
+        POSTCONDITION:  A new instance of the same class is returned with the same x and y values.
+        """
+        new = object.__new__(self.__class__)
+        new.x = self.x
+        new.y = self.y
+        return new
+
+    def copy_into(self, target: "GameEntity") -> None:
+        """
+        NAME:           GameEntity.copy_into
+        PARAMETERS:     target, an entity of the same class to overwrite
+        PURPOSE:        This method makes an existing entity the same as this one without creating any objects, so
+                        recycled entities can be reused instead of cloned. Subclasses extend this like clone, fields
+                        that never change after the entity is created are already the same and are not copied.
+        PRECONDITION:   target is an instance of the same class, created by cloning the same game.
+        POSTCONDITION:  target has the same x and y values as this entity.
+        """
+        target.x = self.x
+        target.y = self.y
+
+    def update(self, game_state: "GameState") -> None:
+        """
+        NAME:           GameEntity.update
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method updates the properties of this instance to be rendered on the next frame.
+        PRECONDITION:   This instance is a part of the provided game state
+        POSTCONDITION:  This instance is updated and ready to be rendered on the next frame.
+        """
+        # This is the default behavior, which is to not update since not every entity updates each frame
+        pass
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           GameEntity.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method draws this entity to the surface that will be used for the next frame.
+        PRECONDITION:   This instance is a part of the provided game state,
+        POSTCONDITION:  The surface will have this entity drawn onto it, and the area drawn to is returned so only
+                        that area needs to be updated on the display
+        """
+        # Error, this should be implemented for drawn entities, or not called if the entity doesn't draw itself
+        assert False
+
+
+class PositionEntity(GameEntity):
+    """
+    NAME:           PositionEntity
+    PURPOSE:        An abstract class which has no references to objects that cannot be cloned.
+                    The surface is looked up by entity_type when drawing, which keeps clones small.
+                    Provides default behavior to render the specified entity_type at the provided location
+    INVARIANTS:     x and y must be greater than zero
+                    entity_type must be one of assets.ENTITY_TYPES
+    """
+    __slots__ = ('entity_type',)
+
+    def __init__(self, entity_type: str, x: float, y: float):
+        """
+        NAME:           PositionEntity.__init__
+        PARAMETERS:     x and y coordinates of the location of this entity
+                        entity_type, a value within
+        PURPOSE:        This method initializes fields for a new PositionEntity instance.
+        PRECONDITION:   entity_type, x, and y are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__(x, y)
+        self.entity_type = entity_type
+
+        if entity_type not in assets.ENTITY_TYPES:
+            assert f"entity_type '{entity_type}' doesn't exist!"
+
+    def clone(self) -> "PositionEntity":
+        """
+        NAME:           PositionEntity.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this entity, the entity_type string is shared.
+        PRECONDITION:   None
+        POSTCONDITION:  A new instance with the same position and entity_type is returned.
+        """
+        new = super().clone()
+        new.entity_type = self.entity_type
+        return new
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           PositionEntity.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method gets the sprite of self.entity_type from the sprite cache
+                        and draws that entity_type with the x/y position being the top left of the surface.
+        PRECONDITION:   This instance is a part of the provided game state,
+        POSTCONDITION:  The surface will have this entity drawn onto it, and the area drawn to is returned
+        """
+        return surface.blit(assets.get_sprite(self.entity_type), (self.x, self.y))
+
+
+class Rectangle(PositionEntity):
+    """
+    NAME:           Rectangle
+    PURPOSE:        A game entity with a rectangular shape.
+    INVARIANTS:     size_x and size_y must be greater than 0, not None, and initialized.
+    """
+    __slots__ = ('size_x', 'size_y')
+
+    size_x: float
+    size_y: float
+
+    def __init__(self, entity_type, x, y, size_x, size_y):
+        """
+        NAME:           Rectangle.__init__
+        PARAMETERS:     entity_type is the type of entity this is, used by subclasses.
+                            Should be 'rectangle' when instantiated directly.
+                        x and y coordinates of the location of this entity
+                        size_x and size_y are the width and height of this entity
+        PURPOSE:        This method initializes fields for a new Rectangle instance.
+        PRECONDITION:   all parameters are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__(entity_type, x, y)
+        self.size_x = size_x
+        self.size_y = size_y
+
+    def clone(self) -> "Rectangle":
+        """
+        NAME:           Rectangle.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this rectangle, the sizes never change and are shared.
+        PRECONDITION:   None
+        POSTCONDITION:  A new instance with the same position and size is returned.
+        """
+        new = super().clone()
+        new.size_x = self.size_x
+        new.size_y = self.size_y
+        return new
+
+    def get_center_pos(self) -> list[float]:
+        """
+        NAME:           Rectangle.get_center_pos
+        PURPOSE:        This method calculates and returns the center coordinates of this entity
+        PRECONDITION:   x, y, size_x, and size_y are not none and initialized
+        POSTCONDITION:  This instance is not modified, and the coordinates for this entities center are returned
+                        in a list consisting of the x and y position as float values
+        """
+        return [self.x + (self.size_x / 2), self.y + (self.size_y / 2)]
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           Rectangle.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        If a rectangle type:
+                            This method draws a red rectangle to the surface that will be used for the next frame.
+                        If any other type:
+                            Ths method calls the superclass logic to draw the respective entity
+        PRECONDITION:   This instance is a part of the provided game state,
+        POSTCONDITION:  The surface of game_state will have this entity drawn onto it, and the area drawn to is
+                        returned
+        """
+        if self.entity_type == 'rectangle':
+            import pygame
+            # Draw a red rectangle for simple functionality
+            return pygame.draw.rect(surface, (255, 0, 0), pygame.Rect(self.x, self.y, self.size_x, self.size_y))
+        return super().draw(game_state, surface)
+
+
+class Bird(Rectangle):
+    """
+    NAME:           Bird
+    PURPOSE:        A game entity representing a moving bird.
+    INVARIANTS:     x and y must not be None and initialized
+                    y must be within the const.BIRD_MIN_Y and const.BIRD_MAX_Y
+    """
+    __slots__ = ('velocity', 'dead', 'threat', 'fitness')
+
+    # The y velocity of the bird
+    velocity: float
+    # If the bird is dead
+    dead: bool
+    # Distance to the closest threat and location of the closest point
+    threat: tuple[float, list[float]]
+    # The fitness of this bird within a generation
+    fitness: float
+
+    def __init__(self, y: float):
+        """
+        NAME:           Bird.__init__
+        PARAMETERS:     y coordinate of the top left corner of this entity
+        PURPOSE:        This method initializes fields for a new Bird instance.
+        PRECONDITION:   all parameters are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__('bird', const.BIRD_POS_X, y, const.BIRD_X, const.BIRD_Y)
+        self.velocity = 0
+        self.dead = False
+        self.threat = tuple()
+        self.fitness = 0
+
+    def clone(self) -> "Bird":
+        """
+        NAME:           Bird.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this bird for a simulated future.
+                        The threat tuple is replaced rather than modified on update, so it is shared.
+        PRECONDITION:   None
+        POSTCONDITION:  A new Bird with the same position, velocity, and state is returned.
+        """
+        new = super().clone()
+        new.velocity = self.velocity
+        new.dead = self.dead
+        new.threat = self.threat
+        new.fitness = self.fitness
+        return new
+
+    def copy_into(self, target: "Bird") -> None:
+        """
+        NAME:           Bird.copy_into
+        PARAMETERS:     target, the bird to overwrite
+        PURPOSE:        This method copies the position, velocity, and state of this bird into target.
+        PRECONDITION:   Same as GameEntity.copy_into.
+        POSTCONDITION:  target has the same position, velocity, and state as this bird.
+        """
+        super().copy_into(target)
+        target.velocity = self.velocity
+        target.dead = self.dead
+        target.threat = self.threat
+        target.fitness = self.fitness
+
+    def jump(self) -> None:
+        """
+        NAME:           Bird.jump
+        PURPOSE:        This method makes the bird jump from its current position regardless of current velocity.
+        PRECONDITION:   None
+        POSTCONDITION:  This instance's velocity is set to the jumping velocity
+        """
+        self.velocity = const.JUMP_VELOCITY
+
+    def update(self, game_state: "GameState") -> None:
+        """
+        NAME:           Bird.update
+        PURPOSE:        This method performs checks and calculations each frame to detect if the bird has died,
+                        and the new velocity/position for the bird.
+        PRECONDITION:   The bird is not dead.
+        POSTCONDITION:  This instance's fields have been updated
+        """
+        # Check if we're colliding
+        dist = get_closest_point(self, game_state)
+        if dist[0] < const.BIRD_DEATH:
+            self.dead = True
+        else:
+            self.threat = dist
+
+        # The bird has died, stop the update
+        if self.dead:
+            pass
+
+        # Position Check
+        # Move the bird to a safe area if needed
+        if self.y < const.BIRD_MIN_Y:
+            self.y = const.BIRD_MIN_Y
+            self.velocity = 0
+            return
+        elif self.y > const.BIRD_MAX_Y:
+            # FUTURE: This will be a death condition
+            self.y = const.BIRD_MAX_Y
+            self.velocity = 0
+            return
+
+        # Gravity update
+        self.velocity += const.GRAVITY * game_state.delta
+
+        # Bounds check for velocity
+        if self.velocity > const.MAX_VELOCITY:
+            self.velocity = const.MAX_VELOCITY
+        elif self.velocity < const.MIN_VELOCITY:
+            self.velocity = const.MIN_VELOCITY
+
+        # Update Position
+        self.y += self.velocity * game_state.delta
+
+
+class Pipe(Rectangle):
+    """
+    NAME:           Pipe
+    PURPOSE:        A game entity representing a pipe that will kill the bird on contact.
+    INVARIANTS:     x and y must not be None and initialized
+                    top must be True or False
+    """
+    __slots__ = ('top',)
+
+    top: bool
+
+    def __init__(self, x: float, y: float, top: bool):
+        """
+        NAME:           Pipe.__init__
+        PARAMETERS:     x and y coordinates of the top left corner of this entity
+                        top is False when this pipe connects with the floor
+                        top is True when this pipe should be flipped and go up through the top of the screen
+        PURPOSE:        This method initializes fields for a new Pipe instance.
+        PRECONDITION:   all parameters are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__('pipe_top' if top else 'pipe_bottom', x, y, const.PIPE_X, const.PIPE_Y)
+        self.top = top
+
+    def clone(self) -> "Pipe":
+        """
+        NAME:           Pipe.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this pipe.
+        PRECONDITION:   None
+        POSTCONDITION:  A new Pipe with the same position and orientation is returned.
+        """
+        new = super().clone()
+        new.top = self.top
+        return new
+
+
+class PipePair(GameEntity):
+    """
+    NAME:           PipePair
+    PURPOSE:        A game entity linked to two pipes that have the same x position.
+    INVARIANTS:     x must not be None and initialized
+    """
+    """
+    A Pair of Pipes in the game.
+    Both need to be tracked so that it is known when the bird passes one pair of pipes.
+    Also removes a check to move a pipe, since only this object needs to be updated.
+    We can get more control over the size and location by knowing where the pipes are.
+    """
+    __slots__ = ('top_pipe', 'bot_pipe', 'passed')
+
+    # Top and Bottom pipe
+    top_pipe: Pipe
+    bot_pipe: Pipe
+    # The X position of the pipes, their position is set to this
+    x: float
+    # If the bird has passed this set of pipes
+    passed: bool
+
+    def __init__(self, x: float, game_state: "GameState"):
+        """
+        NAME:           PipePair.__init__
+        PARAMETERS:     x, the location of the left side of both pipes
+                        game_state, the game state the pipes are spawned in, used for the gap of the pipes
+        PURPOSE:        This method initializes fields for a new PipePair instance.
+        PRECONDITION:   all parameters are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__(x, 0)
+        self.x = x
+        self.top_pipe = Pipe(x, 0, True)
+        self.bot_pipe = Pipe(x, 0, False)
+        self.change_gap(game_state)
+        self.passed = False
+
+    def clone(self) -> "PipePair":
+        """
+        NAME:           PipePair.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this pipe pair and both of its pipes.
+        PRECONDITION:   None
+        POSTCONDITION:  A new PipePair is returned with its own Pipe instances at the same positions.
+        """
+        new = super().clone()
+        new.top_pipe = self.top_pipe.clone()
+        new.bot_pipe = self.bot_pipe.clone()
+        new.passed = self.passed
+        return new
+
+    def copy_into(self, target: "PipePair") -> None:
+        """
+        NAME:           PipePair.copy_into
+        PARAMETERS:     target, the pipe pair to overwrite
+        PURPOSE:        This method copies the position of this pair and both of its pipes into target.
+        PRECONDITION:   Same as GameEntity.copy_into.
+        POSTCONDITION:  target and its pipes are at the same positions as this pair.
+        """
+        super().copy_into(target)
+        self.top_pipe.copy_into(target.top_pipe)
+        self.bot_pipe.copy_into(target.bot_pipe)
+        target.passed = self.passed
+
+    def change_gap(self, game_state: "GameState") -> None:
+        """
+        NAME:           PipePair.change_gap
+        PARAMETERS:     game_state, the game state the pipes are in
+        PURPOSE:        This method updates the y positions of both pipes to create a gap between them
+        PRECONDITION:   the pipes have passed the left side of the screen and are no longer visible
+        POSTCONDITION:  the pipes have new positions from the gap schedule of the game state which moves
+                        them and changes the size of their gap
+        """
+        # Move pipes
+        self.top_pipe.y, self.bot_pipe.y = game_state.next_gap()
+
+    def update(self, game_state: "GameState") -> None:
+        """
+        NAME:           PipePair.update
+        PURPOSE:        This method updates the locations of the pipes to move them to the left for their update.
+                        If the pipes are off-screen to the left of the bird then they are moved
+                        to the right side of the screen and have their gap/position updated.
+        PRECONDITION:   The pipes are initialized and not none.
+        POSTCONDITION:  The location of the pipes for this instance have been updated.
+                        The score counter is incremented if the popes are passed.
+                        The pipes are moved to the right side of the screen if they have moved off-screen.
+        """
+        self.x -= game_state.pipe_speed * game_state.delta
+
+        # Pipes have passed the bird, increment the pipe counter
+        if self.x + const.PIPE_X < const.BIRD_POS_X and not self.passed:
+            self.passed = True
+            game_state.pipes_passed += 1
+
+        # Pipes moved off-screen, change the gap and move them to the right
+        if self.x < const.PIPE_TRASH:
+            self.x = const.PIPE_SPAWN
+            self.change_gap(game_state)
+            # We're in front of the bird now
+            self.passed = False
+
+        # Set the new x positions of the pipes
+        self.top_pipe.x = self.x
+        self.bot_pipe.x = self.x
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           PipePair.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method draws the top pipe and then the bottom pipe of this pair.
+        PRECONDITION:   This instance is a part of the provided game state.
+        POSTCONDITION:  The surface will have both pipes drawn onto it, and the column they were drawn in is returned
+        """
+        return self.top_pipe.draw(game_state, surface).union(self.bot_pipe.draw(game_state, surface))
+
+
+class FloorTile(Rectangle):
+    """
+    NAME:           FloorTile
+    PURPOSE:        A game entity representing a floor section that will kill the bird on contact.
+    INVARIANTS:     x must not be None and initialized
+    """
+    __slots__ = ()
+
+    def __init__(self, x: float):
+        """
+        NAME:           FloorTile.__init__
+        PARAMETERS:     x, the location of the left side of this tile
+        PURPOSE:        This method initializes fields for a new FloorTile instance.
+        PRECONDITION:   all parameters are not none and are initialized.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__('base', x, const.FLOOR_Y, const.BASE_X, const.BASE_Y)
+
+
+class Floor(GameEntity):
+    """
+    NAME:           Floor
+    PURPOSE:        A game entity representing a floor section that will kill the bird on contact.
+    INVARIANTS:     x must not be None and initialized
+    """
+    __slots__ = ('tiles',)
+
+    # A list of all floor tiles used to render the floor
+    tiles: list[FloorTile]
+
+    def __init__(self):
+        """
+        NAME:           Floor.__init__
+        PARAMETERS:     None
+        PURPOSE:        This method initializes fields for a new Floor instance and creates
+                        the needed FloorTile instances.
+        PRECONDITION:   None
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__(0, 0)
+        self.tiles = list()
+
+        num_tiles = math.ceil((const.WIDTH + const.BASE_X) / const.BASE_X)
+        for nt in range(num_tiles):
+            self.tiles.append(FloorTile(nt * const.BASE_X))
+
+    def clone(self) -> "Floor":
+        """
+        NAME:           Floor.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this floor and each of its tiles.
+        PRECONDITION:   None
+        POSTCONDITION:  A new Floor is returned with its own FloorTile instances at the same positions.
+        """
+        new = super().clone()
+        new.tiles = [tile.clone() for tile in self.tiles]
+        return new
+
+    def copy_into(self, target: "Floor") -> None:
+        """
+        NAME:           Floor.copy_into
+        PARAMETERS:     target, the floor to overwrite
+        PURPOSE:        This method moves each tile of target to the position of the tile of this floor.
+        PRECONDITION:   Same as GameEntity.copy_into.
+        POSTCONDITION:  The tiles of target are at the same positions as the tiles of this floor.
+        """
+        super().copy_into(target)
+        for tile, target_tile in zip(self.tiles, target.tiles):
+            target_tile.x = tile.x
+
+    def update(self, game_state: "GameState") -> None:
+        """
+        NAME:           Floor.update
+        PURPOSE:        This method updates the locations of the FloorTile's to move them to the left for their update.
+                        If a tile is off-screen to the left of the bird then it is moved
+                        to the right side of the screen.
+        PRECONDITION:   None, this can be called at any time. But only one instance should exist.
+        POSTCONDITION:  The location of the FloorTiles in this instance have been updated.
+                        The tiles are moved to the right side of the screen if they have moved off-screen.
+        """
+        for tile in self.tiles:
+            tile.x -= game_state.pipe_speed * game_state.delta
+            # If the tile is off the screen then move it back to the right
+            if const.BASE_X + tile.x < 0:
+                tile.x += const.BASE_X * len(self.tiles)
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           Floor.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method draws every FloorTile of this floor. The tiles are always side by side, so they
+                        are drawn as one strip of tiles starting at the leftmost tile.
+        PRECONDITION:   This instance is a part of the provided game state.
+        POSTCONDITION:  The surface will have the floor drawn onto it, and the area drawn to is returned
+        """
+        left = min(self.tiles, key=lambda tile: tile.x)
+        return surface.blit(assets.get_strip(left.entity_type, len(self.tiles)), (left.x, left.y))
+
+
+class DistanceLine(GameEntity):
+    """
+    NAME:           DistanceLine
+    PURPOSE:        A game entity which draws a line from a referenced entity to the closest rectangle side.
+    INVARIANTS:     x must not be None and initialized
+    """
+    __slots__ = ('start', 'closest')
+
+    # the entity to start at
+    start: Rectangle
+    # The distance and location of the closest side
+    closest: tuple[float, list[float]]
+
+    def __init__(self, start: Rectangle):
+        """
+        NAME:           DistanceLine.__init__
+        PARAMETERS:     start, the entity which the line will start from and distance is measured from
+        PURPOSE:        This method initializes fields for a new DistanceLine instance and creates
+                        the needed FloorTile instances.
+        PRECONDITION:   None
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        # The position of this entity updates every frame
+        super().__init__(0, 0)
+        self.start = start
+        # Initialize to an empty tuple, this will always be updated before a draw
+        self.closest = tuple()
+
+    def clone(self) -> "DistanceLine":
+        """
+        NAME:           DistanceLine.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this line. The start entity is shared,
+                        GameState.clone points it at the cloned entity when the start is part of the state.
+        PRECONDITION:   None
+        POSTCONDITION:  A new DistanceLine with the same start and closest point is returned.
+        """
+        new = super().clone()
+        new.start = self.start
+        new.closest = self.closest
+        return new
+
+    def copy_into(self, target: "DistanceLine") -> None:
+        """
+        NAME:           DistanceLine.copy_into
+        PARAMETERS:     target, the line to overwrite
+        PURPOSE:        This method copies the closest point of this line. The start of target is not changed, it
+                        already measures from the matching entity of its own game state.
+        PRECONDITION:   Same as GameEntity.copy_into.
+        POSTCONDITION:  target has the same closest point as this line.
+        """
+        super().copy_into(target)
+        target.closest = self.closest
+
+    def update(self, game_state: "GameState") -> None:
+        """
+        NAME:           DistanceLine.update
+        PURPOSE:        This method updates the distance and closest surface location for the line to be drawn.
+                        A line from a bird reuses the threat the bird found during its own update.
+        PRECONDITION:   self.start must be set, the bird has been updated for this frame
+        POSTCONDITION:  The closest field is updated with the distance to the closest side and the intersecting point
+        """
+        if isinstance(self.start, Bird) and self.start.threat:
+            self.closest = self.start.threat
+        else:
+            self.closest = get_closest_point(self.start, game_state)
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           DistanceLine.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method draws a line from this instances start and to the closest point.
+        PRECONDITION:   This instance is a part of the provided game state.
+        POSTCONDITION:  The surface of game_state will have this entity drawn onto it, and the area drawn to is
+                        returned
+        """
+        import pygame
+        # The line will be pink
+        return pygame.draw.line(surface, (255, 0, 255), self.start.get_center_pos(), self.closest[1])
+
+
+class MouseLine(DistanceLine):
+    """
+    NAME:           MouseLine
+    PURPOSE:        A game entity which draws a line from the mouse location to the closest rectangle side.
+    INVARIANTS:     A mouse must exist within pygame, this may not work with touch screen devices.
+    """
+    __slots__ = ('mouse_rect',)
+
+    # A single pixel sized rectangle that is moved to the mouse position each frame
+    # This rectangle is not exposed to the game state and is not drawn
+    mouse_rect: Rectangle
+
+    def __init__(self):
+        """
+        NAME:           MouseLine.__init__
+        PARAMETERS:     None
+        PURPOSE:        This method initializes fields for a new MouseLine instance and creates
+                        a new rectangle instance.
+        PRECONDITION:   a mouse exists in pygame
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        self.mouse_rect = Rectangle('rectangle', 0, 0, 1, 1)
+        super().__init__(self.mouse_rect)
+
+    def clone(self) -> "MouseLine":
+        """
+        NAME:           MouseLine.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this line with its own mouse rectangle.
+        PRECONDITION:   None
+        POSTCONDITION:  A new MouseLine is returned which starts at its own copy of the mouse rectangle.
+        """
+        new = super().clone()
+        new.mouse_rect = self.mouse_rect.clone()
+        new.start = new.mouse_rect
+        return new
+
+    def copy_into(self, target: "MouseLine") -> None:
+        """
+        NAME:           MouseLine.copy_into
+        PARAMETERS:     target, the line to overwrite
+        PURPOSE:        This method copies the closest point and the mouse rectangle of this line.
+        PRECONDITION:   Same as GameEntity.copy_into.
+        POSTCONDITION:  target has the same closest point and mouse position as this line.
+        """
+        super().copy_into(target)
+        self.mouse_rect.copy_into(target.mouse_rect)
+
+    def update(self, game_state: "GameState") -> None:
+        """
+        NAME:           MouseLine.update
+        PURPOSE:        This method updates the distance and closest surface location for the line to be drawn.
+        PRECONDITION:   a mouse must be available in pygame
+        POSTCONDITION:  mouse_rect is updated to be at the same location as the mouse and the line is drawn
+        """
+        import pygame
+        # Update the rectangle to the mouse position
+        mouse_pos = pygame.mouse.get_pos()
+        self.mouse_rect.x = mouse_pos[0]
+        self.mouse_rect.y = mouse_pos[1]
+
+        # Update the closest point with super class logic
+        super().update(game_state)
+
+
+class PipePassCounter(GameEntity):
+    """
+    NAME:           PipePassCounter
+    PURPOSE:        A game entity which displays the number of pipes passed in the game.
+    INVARIANTS:     The number of pipes passed is greater than or equal to zero.
+                    rendered is None or holds a number and the surface of its digits.
+    """
+    __slots__ = ('game_score',)
+
+    # The last number drawn and its rendered digits, rendered again only when the number changes
+    # It is kept by the class because the drawn game states are clones made by the search before anything was drawn
+    rendered: tuple[int, "pygame.Surface"] = None
+
+    def __init__(self, x: float, y: float):
+        """
+        NAME:           PipePassCounter.__init__
+        PARAMETERS:     x and y are the coordinates of the top left location of where the numbers should appear
+        PURPOSE:        This method initializes fields for a new PipePassCounter instance
+        PRECONDITION:   There are no other instances of this class present
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        super().__init__(x, y)
+        self.game_score: int = 0
+
+    def clone(self) -> "PipePassCounter":
+        """
+        NAME:           PipePassCounter.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a copy of this counter.
+        PRECONDITION:   None
+        POSTCONDITION:  A new PipePassCounter at the same location is returned.
+        """
+        new = super().clone()
+        new.game_score = self.game_score
+        return new
+
+    def copy_into(self, target: "PipePassCounter") -> None:
+        """
+        NAME:           PipePassCounter.copy_into
+        PARAMETERS:     target, the counter to overwrite
+        PURPOSE:        This method copies the score of this counter.
+        PRECONDITION:   Same as GameEntity.copy_into.
+        POSTCONDITION:  target has the same position and score as this counter.
+        """
+        super().copy_into(target)
+        target.game_score = self.game_score
+
+    def draw(self, game_state: "GameState", surface: "pygame.Surface") -> "pygame.Rect":
+        """
+        NAME:           PipePassCounter.draw
+        PARAMETERS:     game_state, the game state this entity is a part of
+                        surface, the window surface to draw to
+        PURPOSE:        This method draws the numbers representing the value of game_state.pipes_passed.
+                        The digits are rendered to one surface, which is reused until the number changes.
+        PRECONDITION:   The number of pipes passed is greater than or equal to zero.
+        POSTCONDITION:  The surface of game_state will have multiple numbers drawn onto it, and the area drawn to is
+                        returned
+        """
+        rendered = PipePassCounter.rendered
+        if rendered is None or rendered[0] != game_state.pipes_passed:
+            rendered = (game_state.pipes_passed, assets.render_number(game_state.pipes_passed))
+            PipePassCounter.rendered = rendered
+        return surface.blit(rendered[1], (self.x, self.y))
+
+
+def is_dead_line(entity: GameEntity) -> bool:
+    """
+    NAME:           is_dead_line
+    PARAMETERS:     entity, an entity of a game state
+    PURPOSE:        This method checks if the entity is a DistanceLine from a bird that has died.
+    PRECONDITION:   None
+    POSTCONDITION:  True is returned for a line from a dead bird, False for anything else.
+    """
+    return isinstance(entity, DistanceLine) and isinstance(entity.start, Bird) and entity.start.dead
+
+
+def add_pipe_pair(game_state: "GameState", x: float) -> None:
+    """
+    NAME:           add_pipe_pair
+    PARAMETERS:     game_state, the game state to add the pipes to
+                    x, the x position to create the new pipes at
+    PURPOSE:        This method creates a new pipe pair instance and adds it to the pipe and drawable lists
+                    of the game state.
+    PRECONDITION:   The parameters are initialized.
+    POSTCONDITION:  The lists will have the new pipe pair appended to them
+    """
+    new_pair = PipePair(x, game_state)
+    game_state.pipes.append(new_pair)
+    game_state.drawables.append(new_pair)
+
+
+class GameState:
+    """
+    NAME:           GameState
+    PURPOSE:        A class which contains all entities and properties of an active game.
+                    This can be considered a class which represents the game itself.
+                    All dlineriving logic for the game is contained in this class.
+    INVARIANTS:     All fields are initialized and not none.
+                    Delta and pipes_passed are always positive.
+                    Delta cannot be zero.
+    """
+    __slots__ = ('delta', 'bird', 'birds', 'pipes_passed', 'pipes', 'floor', 'updatables', 'drawables', 'bg_i',
+                 'pipe_speed', 'gap_schedule', 'pipes_spawned')
+
+    # Time change since the last frame was rendered
+    delta: float
+
+    # The bird being controlled, the first of birds
+    bird: Bird
+    # Every bird in the game, they all fly through the same pipes and only die on their own
+    birds: list[Bird]
+    # The number of pipes the birds have passed
+    pipes_passed: int
+    # The pipe pairs in the game, these and the floor are the colliders the bird can die on
+    pipes: list[PipePair]
+    # The floor instance
+    floor: Floor
+    # Entities outside of the simulation, such as debug lines, updated after the bird each frame
+    updatables: list[GameEntity]
+    # The entities to draw each frame in order, the bird is always drawn last
+    drawables: list[GameEntity]
+    # The x location of the background images
+    bg_i: int
+
+    # How fast the pipes are moving each frame
+    pipe_speed: int
+
+    # Where pipes are placed when they spawn, shared by every simulated future of this game
+    gap_schedule: GapSchedule
+    # The number of pipe pairs spawned so far, the index of the next gap in the schedule
+    pipes_spawned: int
+
+    def __init__(self, debug_entities: bool, seed: int = None, birds: int = 1):
+        """
+        NAME:           GameState.__init__
+        PARAMETERS:     debug, if lines should be drawn from each bird and the mouse to the nearest threat
+                        seed, the seed of the pipe gaps, a random seed is used when None
+                        birds, how many birds play in the game
+        PURPOSE:        This method initializes fields for a new PipePassCounter instance
+        PRECONDITION:   There are no other instances of this class present
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        self.delta = 0
+
+        self.gap_schedule = GapSchedule(seed)
+        self.pipes_spawned = 0
+
+        self.birds = [Bird(const.BIRD_Y) for _ in range(birds)]
+        self.bird = self.birds[0]
+
+        self.pipes_passed = 0
+
+        self.pipes = list()
+        self.updatables = list()
+        self.drawables = list()
+
+        # Spawn pipes with their set distances, need to include trash distance for consistency.
+        # This method means that if the window width changes then the pipe distance does as well.
+        add_pipe_pair(self, (const.PIPE_TRASH + const.WIDTH))
+        add_pipe_pair(self, (const.PIPE_TRASH + const.WIDTH) * 1.4)
+        add_pipe_pair(self, (const.PIPE_TRASH + const.WIDTH) * 1.8)
+
+        # Add the Floor
+        self.floor = Floor()
+        self.drawables.append(self.floor)
+
+        # Add the bird distance updater
+        # self.updatables.append(BirdDistanceCheck())
+        # add the pipe counter
+        self.drawables.append(PipePassCounter(50, 50))
+
+        # Add a DistanceLine for each bird and the mouse if we are debugging
+        if debug_entities:
+            # Outstanding bug where pygame is not updating the mouse position
+            # mouse_line = MouseLine()
+            # self.updatables.append(mouse_line)
+            # self.drawables.append(mouse_line)
+            for bird in self.birds:
+                distance_line = DistanceLine(bird)
+                self.updatables.append(distance_line)
+                self.drawables.append(distance_line)
+
+        # Set up the background
+        self.bg_i = 0
+
+        self.pipe_speed = const.INIT_SPEED
+
+    def clone(self) -> "GameState":
+        """
+        NAME:           GameState.clone
+        PARAMETERS:     None
+        PURPOSE:        This method creates a snapshot of this game state for a simulated future.
+                        Only the mutable entities are copied, sizes and entity types are shared.
+                        The updatable and drawable lists keep their order and point to the cloned entities.
+        PRECONDITION:   None
+        POSTCONDITION:  A new GameState is returned which can be updated without changing this instance.
+        """
+        new = object.__new__(GameState)
+        new.delta = self.delta
+        new.pipes_passed = self.pipes_passed
+        new.bg_i = self.bg_i
+        new.pipe_speed = self.pipe_speed
+        # The schedule is shared so every future sees the same pipes
+        new.gap_schedule = self.gap_schedule
+        new.pipes_spawned = self.pipes_spawned
+
+        new.bird = self.bird.clone()
+        new.birds = [new.bird]
+        new.pipes = [pipe_pair.clone() for pipe_pair in self.pipes]
+        new.floor = self.floor.clone()
+
+        # Map the entities of this state to their clones so the typed lists can be rebuilt in order
+        clones = {id(self.bird): new.bird, id(self.floor): new.floor}
+        for old_bird in self.birds[1:]:
+            new_bird = old_bird.clone()
+            new.birds.append(new_bird)
+            clones[id(old_bird)] = new_bird
+        for old_pair, new_pair in zip(self.pipes, new.pipes):
+            clones[id(old_pair)] = new_pair
+
+        # Updatables are also drawn, cloning them first lets the drawables share the same clones
+        new.updatables = list()
+        for entity in self.updatables:
+            new_entity = entity.clone()
+            # Lines that measure from a bird of this state must measure from the cloned bird
+            if isinstance(new_entity, DistanceLine) and id(new_entity.start) in clones:
+                new_entity.start = clones[id(new_entity.start)]
+            clones[id(entity)] = new_entity
+            new.updatables.append(new_entity)
+
+        new.drawables = list()
+        for entity in self.drawables:
+            new_entity = clones.get(id(entity))
+            if new_entity is None:
+                new_entity = entity.clone()
+            new.drawables.append(new_entity)
+
+        return new
+
+    def copy_into(self, target: "GameState") -> None:
+        """
+        NAME:           GameState.copy_into
+        PARAMETERS:     target, a game state to overwrite, usually one that is no longer needed
+        PURPOSE:        This method makes target the same as this game state by overwriting the fields of its
+                        entities in place, so a recycled state can be reused without allocating a new clone.
+                        Entities that are only drawn are the same in every future of a game and are left alone.
+        PRECONDITION:   target was cloned from the same game as this state, so it has the same birds, pipes, and
+                        updatables in the same order, and nothing else uses target.
+        POSTCONDITION:  target can be updated exactly like a clone of this state.
+        """
+        target.delta = self.delta
+        target.pipes_passed = self.pipes_passed
+        target.bg_i = self.bg_i
+        target.pipe_speed = self.pipe_speed
+        target.gap_schedule = self.gap_schedule
+        target.pipes_spawned = self.pipes_spawned
+
+        for bird, target_bird in zip(self.birds, target.birds):
+            bird.copy_into(target_bird)
+        for pipe_pair, target_pair in zip(self.pipes, target.pipes):
+            pipe_pair.copy_into(target_pair)
+        self.floor.copy_into(target.floor)
+        for entity, target_entity in zip(self.updatables, target.updatables):
+            entity.copy_into(target_entity)
+
+    def next_gap(self) -> tuple[int, int]:
+        """
+        NAME:           GameState.next_gap
+        PARAMETERS:     None
+        PURPOSE:        This method returns the gap for the next pipe pair to spawn and counts the spawn.
+        PRECONDITION:   None
+        POSTCONDITION:  The top and bottom pipe y positions are returned and pipes_spawned is incremented.
+        """
+        gap = self.gap_schedule.get(self.pipes_spawned)
+        self.pipes_spawned += 1
+        return gap
+
+    def do_update(self) -> None:
+        """
+        NAME:           GameState.do_update
+        PARAMETERS:     None
+        PURPOSE:        This method updates all game entities each frame before they are drawn.
+        PRECONDITION:   The previous frame has been drawn, and the delta has been updated with the previous frame time.
+        POSTCONDITION:  All entities have been updated and are ready to be drawn to the next frame.
+        """
+        # Update the background
+        if self.bg_i == -const.WIDTH:
+            self.bg_i = 0
+        self.bg_i -= 1
+
+        # Update the floor
+        self.floor.update(self)
+
+        # Update all pipe pairs
+        for pipe_pair in self.pipes:
+            pipe_pair.update(self)
+
+        # Update the birds, the world keeps moving for the others after one of them dies
+        if len(self.birds) == 1:
+            self.bird.update(self)
+        else:
+            died = False
+            for bird in self.birds:
+                if not bird.dead:
+                    bird.update(self)
+                    died = died or bird.dead
+            # Dead birds are no longer drawn, so neither are the lines from them
+            if died:
+                self.updatables = [entity for entity in self.updatables if not is_dead_line(entity)]
+                self.drawables = [entity for entity in self.drawables if not is_dead_line(entity)]
+
+        # Update the entities outside of the simulation
+        for entity in self.updatables:
+            entity.update(self)
+
+    def do_draw(self, surface: "pygame.Surface") -> None:
+        """
+        NAME:           GameState.do_draw
+        PARAMETERS:     surface, the surface of the window to draw to
+        PURPOSE:        This method draws all game entities to the next frame
+        PRECONDITION:   All entities have been updated for the frame we're about to draw.
+        POSTCONDITION:  All entities are drawn to the next frame.
+        """
+        self.draw_background(surface)
+        self.draw_entities(surface)
+
+    def draw_background(self, surface: "pygame.Surface") -> None:
+        """
+        NAME:           GameState.draw_background
+        PARAMETERS:     surface, the surface of the window to draw to
+        PURPOSE:        This method draws the scrolled background over the whole surface. Two backgrounds side by
+                        side are composed once into a strip, so it is a single blit.
+        PRECONDITION:   None
+        POSTCONDITION:  The surface is covered by the background.
+        """
+        surface.blit(assets.get_strip('background', 2), (self.bg_i, 0))
+
+    def draw_entities(self, surface: "pygame.Surface") -> list["pygame.Rect"]:
+        """
+        NAME:           GameState.draw_entities
+        PARAMETERS:     surface, the surface of the window to draw to
+        PURPOSE:        This method draws every drawable entity and then the birds over the background. With several
+                        birds, the ones that died are no longer drawn.
+        PRECONDITION:   All entities have been updated for the frame we're about to draw.
+        POSTCONDITION:  All entities are drawn and the areas they were drawn to are returned.
+        """
+        # Draw each entity
+        areas = [entity.draw(self, surface) for entity in self.drawables]
+
+        # Always draw the birds on top
+        for bird in self.birds:
+            if len(self.birds) == 1 or not bird.dead:
+                areas.append(bird.draw(self, surface))
+        return areas
+
+    @staticmethod
+    def do_event() -> None:
+        """
+        NAME:           GameState.do_event
+        PARAMETERS:     None
+        PURPOSE:        This method processes all events each frame, events are mostly from the user.
+        PRECONDITION:   The frame has not been updated or drawn yet.
+        POSTCONDITION:  All relevant logic has been executed for each event.
+        """
+        import pygame
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                exit()
+
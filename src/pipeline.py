@@ -0,0 +1,110 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         pipeline.py
+SPECIFICATION:    Search for the next frames on a separate thread so slow searches don't freeze the window.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import queue
+import threading
+
+
+class SearchWorker(threading.Thread):
+    """
+    NAME:           SearchWorker
+    PURPOSE:        A producer thread which keeps calling a frame function, usually a search and proceed of the tree,
+                    and puts each frame into a bounded queue. The window pops frames from the queue to draw them, so
+                    the search can run up to lookahead frames ahead and a slow search only empties part of the queue
+                    instead of stopping the window. Only the worker touches the tree.
+    INVARIANTS:     frames never holds more than lookahead frames.
+                    None is the last value put in frames, it means the bird died, the worker was stopped, or
+                    advance raised error.
+    """
+    # Produces the next frame, None when there are no more frames
+    advance: callable
+    # Frames waiting to be drawn
+    frames: queue.Queue
+    # Set by the window to stop the worker early
+    stopped: threading.Event
+    # What advance raised on the worker thread, None if it didn't, raised again by next_frame on the window thread
+    error: BaseException
+
+    def __init__(self, advance: callable, lookahead: int):
+        """
+        NAME:           SearchWorker.__init__
+        PARAMETERS:     advance, a function returning the next frame, or None when the game is over
+                        lookahead, how many frames the worker can be ahead of the window
+        PURPOSE:        This method initializes fields for a new SearchWorker instance, call start to run it.
+        PRECONDITION:   lookahead is greater than zero
+        POSTCONDITION:  This instance's fields are initialized and the thread has not started.
+        """
+        # A daemon thread doesn't keep the program running after the window is closed
+        super().__init__(name="search", daemon=True)
+        self.advance = advance
+        self.frames = queue.Queue(maxsize=lookahead)
+        self.stopped = threading.Event()
+        self.error = None
+
+    def run(self) -> None:
+        """
+        NAME:           SearchWorker.run
+        PARAMETERS:     None
+        PURPOSE:        This method produces frames until the game is over or the worker is stopped. It blocks while
+                        the queue is full, which is what keeps it only lookahead frames ahead. An error raised by
+                        advance is kept for the window instead of ending the thread silently.
+        PRECONDITION:   Called by start on the worker thread.
+        POSTCONDITION:  Every produced frame, followed by None, has been put in the queue, and error is set if
+                        advance raised one.
+        """
+        try:
+            while not self.stopped.is_set():
+                frame = self.advance()
+                if frame is None:
+                    break
+                self._put(frame)
+        except BaseException as error:
+            self.error = error
+        finally:
+            # The window waits on the queue without a timeout, so it must always be told the frames ended
+            self._put(None)
+
+    def _put(self, frame) -> None:
+        """
+        NAME:           SearchWorker._put
+        PARAMETERS:     frame, the frame to queue
+        PURPOSE:        This method waits for room in the queue, checking regularly if the worker was stopped.
+        PRECONDITION:   None
+        POSTCONDITION:  The frame is queued, or the worker was stopped and it was dropped.
+        """
+        while not self.stopped.is_set():
+            try:
+                self.frames.put(frame, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def next_frame(self):
+        """
+        NAME:           SearchWorker.next_frame
+        PARAMETERS:     None
+        PURPOSE:        This method pops the next frame for the window, waiting for the worker if the queue is empty.
+        PRECONDITION:   The worker has been started.
+        POSTCONDITION:  The oldest queued frame is returned, None when there are no more frames. The error of the
+                        worker is raised on this thread once every frame before it has been returned.
+        """
+        frame = self.frames.get()
+        if frame is None and self.error is not None:
+            raise self.error
+        return frame
+
+    def stop(self) -> None:
+        """
+        NAME:           SearchWorker.stop
+        PARAMETERS:     None
+        PURPOSE:        This method stops the worker and waits for it to finish its current frame.
+        PRECONDITION:   None
+        POSTCONDITION:  The worker thread is no longer running.
+        """
+        self.stopped.set()
+        if self.is_alive():
+            self.join()
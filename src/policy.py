@@ -0,0 +1,402 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         policy.py
+SPECIFICATION:    Build a table of the action the search tree plays in each discretized game state, and play with it.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import random
+import time
+
+import numpy as np
+
+import const
+from game import GameState
+from telemetry import Telemetry
+from tree import Tree, get_state_score
+
+# The range of each feature of a game state, values outside of them are always uncertain
+# The bird y minus the top of the bottom pipe of the next pipes
+Y_RANGE = (-const.HEIGHT, const.HEIGHT)
+# The bird velocity, the bird can't go up faster than a jump, and falling from the top to the floor stays below the max
+VELOCITY_RANGE = (const.JUMP_VELOCITY, -4 * const.JUMP_VELOCITY)
+# The left side of the next pipes minus the bird x, pipes start up to two screens away
+X_RANGE = (-const.PIPE_X, 2 * const.WIDTH)
+# The size of the gap of the next pipes
+GAP_RANGE = (const.GAP_MIN, const.GAP_MAX)
+# The range and cell size of each axis of the table, in order
+AXES = ((Y_RANGE, const.POLICY_Y_STEP), (VELOCITY_RANGE, const.POLICY_VELOCITY_STEP),
+        (X_RANGE, const.POLICY_X_STEP), (GAP_RANGE, const.POLICY_GAP_STEP))
+# The shape of the table, changing a range or step makes saved tables unusable
+SHAPE = tuple(math.ceil((high - low) / step) for (low, high), step in AXES)
+
+# Values of the table cells
+UNCERTAIN = -1
+NO_JUMP = 0
+JUMP = 1
+
+
+def get_cell(game_state: GameState) -> tuple[int, int, int, int]:
+    """
+    NAME:           get_cell
+    PARAMETERS:     game_state, the game state to discretize
+    PURPOSE:        This function finds the table cell of a game state from its bird and the next pipes, the first
+                    pipes whose right side is not behind the bird.
+    PRECONDITION:   The game state has at least one pipe pair.
+    POSTCONDITION:  The index of the cell on each axis of the table is returned, None when a feature is outside of
+                    its range.
+    """
+    bird = game_state.bird
+    pipes = min((pipe_pair for pipe_pair in game_state.pipes if pipe_pair.x + const.PIPE_X > bird.x),
+                key=lambda pipe_pair: pipe_pair.x, default=None)
+    if pipes is None:
+        return None
+
+    gap_top = pipes.top_pipe.y + pipes.top_pipe.size_y
+    features = (bird.y - pipes.bot_pipe.y, bird.velocity, pipes.x - bird.x, pipes.bot_pipe.y - gap_top)
+    cell = list()
+    for value, ((low, high), step) in zip(features, AXES):
+        if not low <= value < high:
+            return None
+        cell.append(int((value - low) // step))
+    return tuple(cell)
+
+
+def load_table(path: str = None) -> np.ndarray:
+    """
+    NAME:           load_table
+    PARAMETERS:     path, the .npy file of the table, const.POLICY_FILE when None
+    PURPOSE:        This function memory maps a table saved by build_table, so only the cells that are looked up are
+                    read from the file.
+    PRECONDITION:   The file exists.
+    POSTCONDITION:  The read only table is returned, a ValueError is raised if it was made with other cell sizes.
+    """
+    table = np.load(const.POLICY_FILE if path is None else path, mmap_mode='r')
+    if table.shape != SHAPE or table.dtype != np.int8:
+        raise ValueError(f"The policy table has shape {table.shape} instead of {SHAPE}, build it again")
+    return table
+
+
+class PolicyTree:
+    """
+    NAME:           PolicyTree
+    PURPOSE:        Plays with the same interface as Tree, but keeps a plan of actions and the game states they lead to,
+                    like ParallelTree. Each frame the plan is extended by one frame at its end. The action is looked
+                    up in the policy table, and only that action is simulated. When the cell is uncertain, outside of
+                    the table, or the bird would die, both actions are simulated and the better scoring one is kept,
+                    the same choice TreeNode.get_best_child makes. When neither action survives, a Tree searches from
+                    the current state and the plan is rebuilt from its path. The plan looks as far ahead as a search,
+                    so a table action that leads to a dead end is found before it is played.
+    INVARIANTS:     path holds the current game state followed by one state for every action in actions.
+                    path is empty when no path survives.
+                    depth_limit is how far ahead the plan looks, counting the current state.
+    """
+    __slots__ = ('table', 'path', 'actions', 'depth_limit', 'telemetry', 'budget', 'searches', 'budget_hits',
+                 'nodes_expanded', 'lookups', 'uncertain', 'fallbacks')
+
+    # The memory mapped policy table
+    table: np.ndarray
+    # The game states of the plan, starting with the current game state
+    path: list[GameState]
+    # Whether the bird jumps on each frame of the plan
+    actions: list[bool]
+    # The max depth of the plan (frame lookahead)
+    depth_limit: int
+    telemetry: Telemetry
+    # Same statistics as Tree, budget is never used
+    budget: float
+    searches: int
+    budget_hits: int
+    nodes_expanded: int
+    # How many frames of the plan were chosen by the table and by score, and how many times a Tree searched
+    lookups: int
+    uncertain: int
+    fallbacks: int
+
+    def __init__(self, game_state: GameState, delta: float = None, depth_limit: int = None,
+                 telemetry: Telemetry = None, table: np.ndarray = None) -> None:
+        """
+        NAME:           PolicyTree.__init__
+        PARAMETERS:     game_state: the base game state to start the plan from
+                        delta: the time of each frame, const.TREE_DELTA when None
+                        depth_limit: how many frames to look ahead, const.TREE_DEPTH when None
+                        telemetry: where to record each frame's statistics, None to not record them
+                        table: the policy table, loaded from const.POLICY_FILE when None
+        PURPOSE:        This method initializes fields for a new PolicyTree instance.
+        PRECONDITION:   game_state is not None
+        POSTCONDITION:  The plan only holds game_state.
+        """
+        game_state.delta = const.TREE_DELTA if delta is None else delta
+        self.table = load_table() if table is None else table
+        self.path = [game_state]
+        self.actions = list()
+        self.depth_limit = const.TREE_DEPTH if depth_limit is None else depth_limit
+        self.telemetry = telemetry
+
+        self.budget = None
+        self.searches = 0
+        self.budget_hits = 0
+        self.nodes_expanded = 0
+        self.lookups = 0
+        self.uncertain = 0
+        self.fallbacks = 0
+
+    def _simulate(self, game_state: GameState, jump: bool) -> GameState:
+        """
+        NAME:           PolicyTree._simulate
+        PARAMETERS:     game_state, the state to play a frame from
+                        jump, if the bird jumps on the frame
+        PURPOSE:        This method plays one frame of a copy of the game state.
+        PRECONDITION:   The bird of game_state is not dead.
+        POSTCONDITION:  The next game state is returned, game_state is not changed.
+        """
+        child = game_state.clone()
+        if jump:
+            child.bird.jump()
+        child.do_update()
+        return child
+
+    def _extend(self) -> bool:
+        """
+        NAME:           PolicyTree._extend
+        PARAMETERS:     none
+        PURPOSE:        This method adds one frame to the end of the plan, with the action of the table when it is
+                            certain and survives, and otherwise with the better scoring action.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  True is returned if the plan was extended, False if the bird dies with either action
+        """
+        game_state = self.path[-1]
+        children = [None, None]
+        cell = get_cell(game_state)
+        action = UNCERTAIN if cell is None else self.table[cell]
+        if action != UNCERTAIN:
+            jump = bool(action == JUMP)
+            children[jump] = self._simulate(game_state, jump)
+            if not children[jump].bird.dead:
+                self.lookups += 1
+                self.path.append(children[jump])
+                self.actions.append(jump)
+                return True
+
+        self.uncertain += 1
+        self.nodes_expanded += 1
+        for jump in (False, True):
+            if children[jump] is None:
+                children[jump] = self._simulate(game_state, jump)
+        left_state, right_state = children
+        if left_state.bird.dead and right_state.bird.dead:
+            return False
+        jump = left_state.bird.dead or \
+            (not right_state.bird.dead and get_state_score(right_state) >= get_state_score(left_state))
+        self.path.append(children[jump])
+        self.actions.append(jump)
+        return True
+
+    def _search_root(self) -> None:
+        """
+        NAME:           PolicyTree._search_root
+        PARAMETERS:     none
+        PURPOSE:        This method replaces the plan with the path of a Tree searched from the current state. The
+                            actions of the path are simulated again from the current state, so the plan has one state
+                            for every frame even when the Tree waits several frames in one node.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The plan is the path of the search, the path is empty if the bird can't survive
+        """
+        self.fallbacks += 1
+        root = self.path[0]
+        tree = Tree(root, delta=root.delta, depth_limit=self.depth_limit)
+        tree.search()
+        self.nodes_expanded += tree.nodes_expanded
+
+        self.path = list() if len(tree.path) == 0 else [root]
+        self.actions = list()
+        if len(tree.path) > 0:
+            for jump in tree.get_path_actions():
+                self.path.append(self._simulate(self.path[-1], jump))
+                self.actions.append(jump)
+
+    def search(self) -> None:
+        """
+        NAME:           PolicyTree.search
+        PARAMETERS:     none
+        PURPOSE:        This method extends the plan to the depth limit, searching from the current state when it can't.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The plan reaches the depth limit or is as long as the best path found,
+                            the path is empty if the bird can't survive
+        """
+        self.searches += 1
+        start = time.perf_counter()
+        nodes_expanded = self.nodes_expanded
+        fallbacks = self.fallbacks
+
+        while 0 < len(self.path) < self.depth_limit:
+            if not self._extend():
+                self._search_root()
+                break
+
+        if self.telemetry is not None:
+            self.telemetry.frame.update({
+                'frame': self.searches - 1,
+                'search_ms': (time.perf_counter() - start) * 1000,
+                'nodes': self.nodes_expanded - nodes_expanded,
+                'path_frames': len(self.path),
+                'fallback': self.fallbacks > fallbacks,
+            })
+
+    def proceed(self) -> GameState:
+        """
+        NAME:           PolicyTree.proceed
+        PARAMETERS:     none
+        PURPOSE:        This method commits the first action of the plan.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  The game state after the first action is returned and is the new root of the plan
+        """
+        self.path.pop(0)
+        self.actions.pop(0)
+        return self.path[0]
+
+    def next_action(self) -> bool:
+        """
+        NAME:           PolicyTree.next_action
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action the next call to proceed plays, so it can be recorded.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  True is returned if the bird jumps on the next frame, False if it doesn't
+        """
+        return self.actions[0]
+
+    def get_path_states(self) -> list[GameState]:
+        """
+        NAME:           PolicyTree.get_path_states
+        PARAMETERS:     none
+        PURPOSE:        This method returns the game states along the plan.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of game states from the current state to the end of the plan is returned
+        """
+        return list(self.path)
+
+    def get_path_frames(self) -> list[int]:
+        """
+        NAME:           PolicyTree.get_path_frames
+        PARAMETERS:     none
+        PURPOSE:        This method returns how many frames ahead of the current state each state of the plan is.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of frame offsets matching get_path_states is returned
+        """
+        return list(range(len(self.path)))
+
+    def get_path_actions(self) -> list[bool]:
+        """
+        NAME:           PolicyTree.get_path_actions
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action of each frame of the plan.
+        PRECONDITION:   none
+        POSTCONDITION:  A list with True for each frame the bird jumps and False for each frame it doesn't is returned
+        """
+        return list(self.actions)
+
+
+def sample_game(job: tuple[int, int, float]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    NAME:           sample_game
+    PARAMETERS:     job, a tuple of the seed to play, the max number of frames, and the chance of exploring each frame
+    PURPOSE:        This function plays a game with the search tree and records the cell of every frame with the
+                    action the search chose, it is the work done by each process of the pool. When exploring, a
+                    random action is played instead and the search starts over from where it leads, so the table also
+                    learns how to recover from states the search would never play into. A random action the bird
+                    can't survive is undone by going back to the search from before it.
+    PRECONDITION:   None
+    POSTCONDITION:  A tuple of the flat table index of each sampled frame and the action chosen on it is returned.
+    """
+    seed, frames, explore = job
+    rng = random.Random(seed)
+    tree = Tree(GameState(False, seed))
+    # The tree from before the last random action, its path still survives if the random action can't
+    backup = None
+    cells = list()
+    actions = list()
+    for _ in range(frames):
+        tree.search()
+        if len(tree.path) == 0:
+            if backup is None:
+                break
+            # The random action was fatal, play the action of the search instead
+            tree, backup = backup, None
+            tree.proceed()
+            continue
+
+        game_state = tree.get_path_states()[0]
+        cell = get_cell(game_state)
+        if cell is not None:
+            cells.append(cell)
+            actions.append(tree.next_action())
+
+        if rng.random() < explore:
+            child = game_state.clone()
+            if rng.random() < 0.5:
+                child.bird.jump()
+            child.do_update()
+            if not child.bird.dead:
+                backup = tree
+                tree = Tree(child, delta=game_state.delta)
+                continue
+        tree.proceed()
+
+    if len(cells) == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    return np.ravel_multi_index(np.array(cells).T, SHAPE), np.array(actions, dtype=bool)
+
+
+def build_table(seeds: list[int], frames: int, explore: float, workers: int = None) -> tuple[np.ndarray, int]:
+    """
+    NAME:           build_table
+    PARAMETERS:     seeds, the seed of each game to sample
+                    frames, the max number of frames of each game
+                    explore, the chance of playing a random action on each frame
+                    workers, the number of processes to use, one per core when None
+    PURPOSE:        This function samples the games across a process pool and counts how often the search jumped in
+                    each cell. A cell is certain when it was sampled at least const.POLICY_MIN_SAMPLES times and at
+                    least const.POLICY_AGREEMENT of them chose the same action.
+    PRECONDITION:   seeds is not empty
+    POSTCONDITION:  A tuple of the table and the number of frames sampled is returned.
+    """
+    size = math.prod(SHAPE)
+    samples = np.zeros(size, dtype=np.int64)
+    jumps = np.zeros(size, dtype=np.int64)
+    with multiprocessing.Pool(workers) as pool:
+        for cells, actions in pool.imap_unordered(sample_game, [(seed, frames, explore) for seed in seeds]):
+            samples += np.bincount(cells, minlength=size)
+            jumps += np.bincount(cells[actions], minlength=size)
+
+    table = np.full(size, UNCERTAIN, dtype=np.int8)
+    sampled = samples >= const.POLICY_MIN_SAMPLES
+    share = jumps / np.maximum(samples, 1)
+    table[sampled & (share >= const.POLICY_AGREEMENT)] = JUMP
+    table[sampled & (share <= 1 - const.POLICY_AGREEMENT)] = NO_JUMP
+    return table.reshape(SHAPE), int(samples.sum())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the policy table from games played with the search tree.")
+    parser.add_argument('--games', type=int, default=200, help="number of games to sample")
+    parser.add_argument('--first-seed', type=int, default=0, help="seed of the first game, the rest count up")
+    parser.add_argument('--frames', type=int, default=3000, help="max frames per game")
+    parser.add_argument('--explore', type=float, default=0.02,
+                        help="chance of playing a random action on each frame")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument('--output', default=const.POLICY_FILE, help="the .npy file to save the table to")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    policy_table, sampled_frames = build_table(list(range(args.first_seed, args.first_seed + args.games)),
+                                               args.frames, args.explore, args.workers)
+    np.save(args.output, policy_table)
+
+    certain = int((policy_table != UNCERTAIN).sum())
+    print(f"Sampled {sampled_frames} frames in {time.perf_counter() - start:.1f}s")
+    print(f"Certain cells: {certain} of {policy_table.size}, {int((policy_table == JUMP).sum())} jump")
+    print(f"Saved {args.output}, {os.path.getsize(args.output) / 1e6:.1f}MB")
@@ -0,0 +1,69 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         renderer.py
+SPECIFICATION:    Draw game states to the window and update only the parts of the display that changed.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import pygame
+
+import assets
+import const
+
+
+class Renderer:
+    """
+    NAME:           Renderer
+    PURPOSE:        Draws each frame to the window. A scrolling background changes every pixel of the window, so the
+                    whole display is updated. With const.RENDER_SCROLL_BG off the background is still, and each frame
+                    only covers the areas drawn on the last frame with the background, draws the entities again, and
+                    updates just those areas of the display.
+    INVARIANTS:     dirty holds the areas drawn to on the last frame, None before the first frame.
+    """
+    __slots__ = ('window', 'dirty')
+
+    # The surface of the window
+    window: pygame.Surface
+    # Areas drawn to on the last frame, the background is drawn over them on the next frame
+    dirty: list[pygame.Rect]
+
+    def __init__(self, window: pygame.Surface):
+        """
+        NAME:           Renderer.__init__
+        PARAMETERS:     window, the surface of the window to draw to
+        PURPOSE:        This method initializes fields for a new Renderer instance.
+        PRECONDITION:   The window has been opened with pygame.display.set_mode.
+        POSTCONDITION:  This instance's fields are initialized, the first frame will be drawn in full.
+        """
+        self.window = window
+        self.dirty = None
+
+    def draw(self, game_state, birds: list) -> None:
+        """
+        NAME:           Renderer.draw
+        PARAMETERS:     game_state, the game state to draw
+                        birds, extra birds to draw over the game, such as the previews of the best path
+        PURPOSE:        This method draws the frame and updates the display.
+        PRECONDITION:   All entities of game_state have been updated for this frame.
+        POSTCONDITION:  The display shows the frame.
+        """
+        # The whole display changes when the background scrolls, and on the first frame
+        full = const.RENDER_SCROLL_BG or self.dirty is None
+        if const.RENDER_SCROLL_BG:
+            game_state.draw_background(self.window)
+        else:
+            background = assets.get_strip('background', 2)
+            for area in ([self.window.get_rect()] if self.dirty is None else self.dirty):
+                self.window.blit(background, area, area)
+
+        areas = game_state.draw_entities(self.window)
+        for bird in birds:
+            # The bird draw method in specific doesn't need the game state
+            # noinspection PyTypeChecker
+            areas.append(bird.draw(None, self.window))
+
+        if full:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.dirty + areas)
+        self.dirty = areas
@@ -0,0 +1,246 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         replay.py
+SPECIFICATION:    Record games as their seed and the action of every frame, and play or verify the recordings later.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import argparse
+import struct
+import sys
+import time
+
+import numpy as np
+
+import const
+from game import GameState
+
+# The first bytes of every replay file and the version of the format
+MAGIC = b'FBRP'
+VERSION = 1
+# Constants that change how a game plays, a replay only plays the same with the same values
+# Adding or removing a name changes the format, so VERSION must be changed with it
+REPLAY_CONSTS = ('WIDTH', 'HEIGHT', 'FLOOR_Y', 'BASE_X', 'BASE_Y', 'PIPE_X', 'PIPE_Y', 'BIRD_X', 'BIRD_Y',
+                 'BIRD_DEATH', 'BIRD_POS_X', 'INIT_SPEED', 'PIPE_TOP', 'PIPE_BOT', 'GAP_MIN', 'GAP_MAX', 'PIPE_SPAWN',
+                 'PIPE_TRASH', 'BIRD_MIN_Y', 'BIRD_MAX_Y', 'GRAVITY', 'JUMP_VELOCITY', 'MAX_VELOCITY', 'MIN_VELOCITY')
+# Magic, version, number of constants, seed, frame delta, frames, pipes passed, if the bird died, and the final bird
+# y position and velocity, followed by one double for each constant and then the actions packed 8 frames to a byte
+HEADER = struct.Struct('<4sHHQdII?3xdd')
+# How far the replayed bird can end from the recorded bird, games searched with const.TREE_WAIT_FRAMES above 1 play
+# some frames with NoJumpProjection, which rounds slightly differently than updating the game one frame at a time
+END_TOLERANCE = 1e-6
+
+
+class Recording:
+    """
+    NAME:           Recording
+    PURPOSE:        Collects the action played on each frame of a game while it is played, so it can be saved as a
+                    replay. The seed and frame delta are taken from the new game, and the last game state is kept
+                    so the saved file holds the outcome the replay is verified against.
+    INVARIANTS:     actions holds one action for every frame played since the game started.
+                    game_state is the state after the last recorded action.
+    """
+    __slots__ = ('seed', 'delta', 'actions', 'game_state', 'died')
+
+    # The seed of the pipe gaps and the time of each frame
+    seed: int
+    delta: float
+    # True for each frame the bird jumped and False for each frame it didn't
+    actions: list[bool]
+    # The game state after the last frame, and if the game ended because the bird couldn't survive
+    game_state: GameState
+    died: bool
+
+    def __init__(self, game_state: GameState):
+        """
+        NAME:           Recording.__init__
+        PARAMETERS:     game_state, the new game to record
+        PURPOSE:        This method initializes fields for a new Recording instance.
+        PRECONDITION:   No frames of game_state have been played, and its delta has been set by the search tree.
+        POSTCONDITION:  This instance's fields are initialized and no actions are recorded.
+        """
+        self.seed = game_state.gap_schedule.seed
+        self.delta = game_state.delta
+        self.actions = list()
+        self.game_state = game_state
+        self.died = False
+
+    def add(self, jump: bool, game_state: GameState) -> None:
+        """
+        NAME:           Recording.add
+        PARAMETERS:     jump, if the bird jumped on this frame
+                        game_state, the game state after the frame was played
+        PURPOSE:        This method records the action of one frame.
+        PRECONDITION:   game_state is the next frame of the recorded game.
+        POSTCONDITION:  The action is appended and game_state is the last state.
+        """
+        self.actions.append(jump)
+        self.game_state = game_state
+
+    def save(self, path: str) -> None:
+        """
+        NAME:           Recording.save
+        PARAMETERS:     path, the file to write the replay to, it is replaced if it exists
+        PURPOSE:        This method writes the header, the constants, and the packed actions to the file.
+        PRECONDITION:   The seed is from 0 to 2 ** 64 - 1.
+        POSTCONDITION:  The file holds the replay of every recorded frame.
+        """
+        bird = self.game_state.bird
+        header = HEADER.pack(MAGIC, VERSION, len(REPLAY_CONSTS), self.seed, self.delta, len(self.actions),
+                             self.game_state.pipes_passed, self.died, bird.y, bird.velocity)
+        constants = struct.pack(f'<{len(REPLAY_CONSTS)}d', *(getattr(const, name) for name in REPLAY_CONSTS))
+        with open(path, 'wb') as file:
+            file.write(header)
+            file.write(constants)
+            file.write(np.packbits(np.array(self.actions, dtype=bool)).tobytes())
+
+
+class Replay:
+    """
+    NAME:           Replay
+    PURPOSE:        A replay file opened with a memory map. Only the header is read when it is opened, and the actions
+                    are unpacked from the mapped bytes when they are needed, so many files can be opened and checked
+                    without reading them into memory first.
+    INVARIANTS:     frames is the number of actions in the file.
+                    constants holds the value of every name in REPLAY_CONSTS when the game was recorded.
+    """
+    __slots__ = ('path', 'seed', 'delta', 'frames', 'pipes_passed', 'died', 'bird_y', 'bird_velocity', 'constants',
+                 'packed')
+
+    # The file the replay was opened from
+    path: str
+    # The seed of the pipe gaps and the time of each frame
+    seed: int
+    delta: float
+    # The outcome of the recorded game, how many frames were played, the pipes passed, and if the bird died after them
+    frames: int
+    pipes_passed: int
+    died: bool
+    # Where the bird ended up, a replay that plays differently will almost never end at the same position and speed
+    bird_y: float
+    bird_velocity: float
+    # The constants the game was recorded with
+    constants: dict[str, float]
+    # The actions, 8 frames to a byte with the first frame in the highest bit, mapped from the file
+    packed: np.ndarray
+
+    def __init__(self, path: str):
+        """
+        NAME:           Replay.__init__
+        PARAMETERS:     path, the replay file to open
+        PURPOSE:        This method maps the file and reads its header.
+        PRECONDITION:   The file was written by Recording.save.
+        POSTCONDITION:  This instance's fields are read from the file, a ValueError is raised if it isn't a replay
+                        of this version.
+        """
+        self.path = path
+        mapped = np.memmap(path, dtype=np.uint8, mode='r')
+        if len(mapped) < HEADER.size:
+            raise ValueError(f"{path} is too short to be a replay")
+        (magic, version, count, self.seed, self.delta, self.frames, self.pipes_passed, self.died, self.bird_y,
+         self.bird_velocity) = HEADER.unpack(mapped[:HEADER.size].tobytes())
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a replay")
+        if version != VERSION or count != len(REPLAY_CONSTS):
+            raise ValueError(f"{path} is a version {version} replay, only version {VERSION} can be played")
+
+        start = HEADER.size + 8 * count
+        self.constants = dict(zip(REPLAY_CONSTS, struct.unpack(f'<{count}d', mapped[HEADER.size:start].tobytes())))
+        self.packed = mapped[start:]
+
+    def get_actions(self) -> np.ndarray:
+        """
+        NAME:           Replay.get_actions
+        PARAMETERS:     None
+        PURPOSE:        This method unpacks the action of every frame.
+        PRECONDITION:   None
+        POSTCONDITION:  An array with True for each frame the bird jumps and False for each frame it doesn't is
+                        returned.
+        """
+        return np.unpackbits(self.packed, count=self.frames).astype(bool)
+
+    def changed_constants(self) -> list[str]:
+        """
+        NAME:           Replay.changed_constants
+        PARAMETERS:     None
+        PURPOSE:        This method compares the recorded constants to the current values in const.
+        PRECONDITION:   None
+        POSTCONDITION:  The names of the constants that changed since the game was recorded are returned.
+        """
+        return [name for name, value in self.constants.items() if getattr(const, name) != value]
+
+    def play(self, debug: bool = False):
+        """
+        NAME:           Replay.play
+        PARAMETERS:     debug, if the game state should draw the threat line of the bird
+        PURPOSE:        This method plays the recorded actions from a new game with the recorded seed, without
+                        searching. The same game state is updated and yielded for every frame, so it must be copied
+                        to be kept.
+        PRECONDITION:   None
+        POSTCONDITION:  A generator of the game state after each frame is returned, it stops early if the bird dies.
+        """
+        game_state = GameState(debug, self.seed)
+        game_state.delta = self.delta
+        for jump in self.get_actions():
+            if jump:
+                game_state.bird.jump()
+            game_state.do_update()
+            yield game_state
+            if game_state.bird.dead:
+                return
+
+    def verify(self) -> str:
+        """
+        NAME:           Replay.verify
+        PARAMETERS:     None
+        PURPOSE:        This method plays the whole replay and checks it ends the same way as when it was recorded.
+        PRECONDITION:   None
+        POSTCONDITION:  None is returned when the replay matches, otherwise a description of the difference.
+        """
+        changed = self.changed_constants()
+        if len(changed) > 0:
+            return f"recorded with different constants: {', '.join(changed)}"
+
+        played = 0
+        game_state = None
+        for game_state in self.play():
+            played += 1
+        if played < self.frames:
+            return f"the bird died on frame {played} of {self.frames}"
+        if game_state is None:
+            return None
+        if game_state.pipes_passed != self.pipes_passed:
+            return f"passed {game_state.pipes_passed} pipes instead of {self.pipes_passed}"
+        if (abs(game_state.bird.y - self.bird_y) > END_TOLERANCE
+                or abs(game_state.bird.velocity - self.bird_velocity) > END_TOLERANCE):
+            return f"the bird ended at y {game_state.bird.y} instead of {self.bird_y}"
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify that replays play the same as when they were recorded.")
+    parser.add_argument('files', nargs='+', help="replay files to verify")
+    parser.add_argument('--quiet', action='store_true', help="only print the replays that fail and the summary")
+    args = parser.parse_args()
+
+    start_time = time.perf_counter()
+    failed = 0
+    total_frames = 0
+    for replay_path in args.files:
+        try:
+            replay = Replay(replay_path)
+            problem = replay.verify()
+            total_frames += replay.frames
+        except (OSError, ValueError) as error:
+            problem = str(error)
+        if problem is not None:
+            failed += 1
+            print(f"{replay_path}: FAILED, {problem}")
+        elif not args.quiet:
+            print(f"{replay_path}: ok, {replay.frames} frames, {replay.pipes_passed} pipes")
+
+    wall_time = time.perf_counter() - start_time
+    print(f"Verified {len(args.files) - failed} of {len(args.files)} replays, {total_frames} frames in "
+          f"{wall_time:.2f}s ({total_frames / max(wall_time, 1e-9):.0f} frames/sec)")
+    if failed > 0:
+        sys.exit(1)
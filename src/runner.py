@@ -0,0 +1,136 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         runner.py
+SPECIFICATION:    Play many seeded headless games across a pool of processes and summarize how the AI did.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import argparse
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from tree import run_headless
+
+
+class GameResult:
+    """
+    NAME:           GameResult
+    PURPOSE:        The outcome of one headless game, sent from a worker process back to the parent.
+    INVARIANTS:     Every field is zero or greater.
+    """
+    __slots__ = ('seed', 'pipes', 'frames', 'nodes', 'cpu_time')
+
+    # The seed of the pipe gaps
+    seed: int
+    # How many pipes were passed and how many frames the bird survived
+    pipes: int
+    frames: int
+    # How many tree nodes were expanded during the game
+    nodes: int
+    # CPU time of the worker for the game in seconds
+    cpu_time: float
+
+    def __init__(self, seed: int, pipes: int, frames: int, nodes: int, cpu_time: float):
+        """
+        NAME:           GameResult.__init__
+        PARAMETERS:     seed, pipes, frames, nodes, and cpu_time of the game
+        PURPOSE:        This method initializes fields for a new GameResult instance.
+        PRECONDITION:   None
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        self.seed = seed
+        self.pipes = pipes
+        self.frames = frames
+        self.nodes = nodes
+        self.cpu_time = cpu_time
+
+    def __str__(self) -> str:
+        """
+        NAME:           GameResult.__str__
+        PARAMETERS:     None
+        PURPOSE:        This method formats the result as a single line to stream while games are still running.
+        PRECONDITION:   None
+        POSTCONDITION:  A one line description of the game is returned.
+        """
+        return (f"seed {self.seed}: {self.pipes} pipes, {self.frames} frames, {self.nodes} nodes, "
+                f"{self.cpu_time:.2f}s cpu")
+
+
+def play_game(job: tuple[int, int]) -> GameResult:
+    """
+    NAME:           play_game
+    PARAMETERS:     job, a tuple of the seed to play and the max number of frames, None to play until the bird dies
+    PURPOSE:        This function plays one headless game, it is the work done by each process of the pool.
+    PRECONDITION:   None
+    POSTCONDITION:  The result of the game is returned.
+    """
+    seed, frames = job
+    start = time.process_time()
+    survived, passed, nodes, _ = run_headless(frames, seed)
+    return GameResult(seed, passed, survived, nodes, time.process_time() - start)
+
+
+def run_games(seeds: list[int], frames: int = None, workers: int = None, verbose: bool = True) -> list[GameResult]:
+    """
+    NAME:           run_games
+    PARAMETERS:     seeds, the seed of each game to play
+                    frames, the max number of frames of each game, None to play until the bird dies
+                    workers, the number of processes to use, one per core when None
+                    verbose, if each result should be printed as soon as it arrives
+    PURPOSE:        This function shards the games across a process pool. Games are handed out one at a time
+                    so a long game doesn't hold back a batch of short ones, and results are collected in the order
+                    they finish.
+    PRECONDITION:   seeds is not empty
+    POSTCONDITION:  The result of every game is returned in the order they finished.
+    """
+    results = list()
+    with multiprocessing.Pool(workers) as pool:
+        for result in pool.imap_unordered(play_game, [(seed, frames) for seed in seeds]):
+            results.append(result)
+            if verbose:
+                print(result, flush=True)
+    return results
+
+
+def summarize(results: list[GameResult], wall_time: float) -> str:
+    """
+    NAME:           summarize
+    PARAMETERS:     results, the results of every game played
+                    wall_time, how long it took to play every game in seconds
+    PURPOSE:        This function aggregates the results into the score distribution and throughput.
+    PRECONDITION:   results is not empty and wall_time is greater than zero
+    POSTCONDITION:  A multi line summary is returned.
+    """
+    pipes = np.array([result.pipes for result in results])
+    frames = np.array([result.frames for result in results])
+    nodes = sum(result.nodes for result in results)
+    cpu_time = sum(result.cpu_time for result in results)
+    p10, p50, p90 = np.percentile(pipes, [10, 50, 90])
+
+    return "\n".join([
+        f"Games: {len(results)}",
+        f"Pipes: mean {pipes.mean():.2f}, min {pipes.min()}, p10 {p10:g}, median {p50:g}, p90 {p90:g}, max {pipes.max()}",
+        f"Frames: mean {frames.mean():.1f}, total {frames.sum()}",
+        f"Nodes expanded: {nodes}, {nodes / max(cpu_time, 1e-9):.0f} per cpu second",
+        f"Wall time: {wall_time:.2f}s, cpu time: {cpu_time:.2f}s",
+        f"Throughput: {len(results) / wall_time:.2f} games/sec",
+    ])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Play seeded headless games in parallel and summarize the scores.")
+    parser.add_argument('--games', type=int, default=100, help="number of games to play")
+    parser.add_argument('--first-seed', type=int, default=0, help="seed of the first game, the rest count up")
+    parser.add_argument('--frames', type=int, default=5000,
+                        help="max frames per game, 0 to play until the bird dies")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="number of processes")
+    parser.add_argument('--quiet', action='store_true', help="only print the summary")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    game_results = run_games(list(range(args.first_seed, args.first_seed + args.games)),
+                             args.frames or None, args.workers, not args.quiet)
+    print(summarize(game_results, time.perf_counter() - start))
@@ -0,0 +1,61 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         schedule.py
+SPECIFICATION:    Generate pipe gaps from a seed so every simulated future of a game sees the same pipes.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import random
+
+import const
+
+
+class GapSchedule:
+    """
+    NAME:           GapSchedule
+    PURPOSE:        A lazily generated sequence of pipe gaps indexed by how many pipes have been spawned.
+                    Game states share one schedule, so the jump and no jump futures of a state always agree on
+                    where the next pipes will be, and a game can be replayed from its seed.
+    INVARIANTS:     gaps only grows, and the gap at an index never changes once generated.
+                    The same seed always generates the same gaps.
+    """
+    # The seed the gaps are generated from
+    seed: int
+    # The generator, only used to extend gaps
+    rng: random.Random
+    # The (top pipe y, bottom pipe y) of each spawned pipe pair, in spawn order
+    gaps: list[tuple[int, int]]
+
+    def __init__(self, seed: int = None):
+        """
+        NAME:           GapSchedule.__init__
+        PARAMETERS:     seed, the seed to generate gaps from, a seed is taken from the random module when None
+        PURPOSE:        This method initializes fields for a new GapSchedule instance.
+        PRECONDITION:   None
+        POSTCONDITION:  This instance's fields are initialized and no gaps have been generated yet.
+        """
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.gaps = list()
+
+    def get(self, index: int) -> tuple[int, int]:
+        """
+        NAME:           GapSchedule.get
+        PARAMETERS:     index, how many pipe pairs were spawned before the one to get the gap of
+        PURPOSE:        This method returns the y positions of the pipes for a spawn, generating gaps up to it if
+                        needed. The gap size and location have the same bounds PipePair always used.
+        PRECONDITION:   index is zero or greater
+        POSTCONDITION:  A tuple of the top pipe y and bottom pipe y is returned.
+        """
+        while len(self.gaps) <= index:
+            # Calculate the gap size
+            gap = self.rng.randrange(const.GAP_MIN, const.GAP_MAX)
+            # The lowest point the top of the gap can be at to not be too low to show the end of the image
+            lowest = const.HEIGHT - const.PIPE_BOT - gap
+            # Where the top pipe will reach to
+            pipe_loc = self.rng.randrange(const.PIPE_TOP, lowest)
+            self.gaps.append((pipe_loc - const.PIPE_Y, pipe_loc + gap))
+
+        return self.gaps[index]
@@ -0,0 +1,98 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         scheduler.py
+SPECIFICATION:    Keep the displayed frame rate at the simulated frame rate no matter how long each frame takes to make.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import time
+
+
+class FrameScheduler:
+    """
+    NAME:           FrameScheduler
+    PURPOSE:        A fixed timestep clock for the game loop. Each frame has a deadline one frame_time after the
+                    deadline of the frame before it, and wait only sleeps for what is left of the frame after
+                    searching and drawing. A frame that finishes after its deadline is an overrun. When the loop
+                    falls more than a whole frame behind, the deadlines start over from the current time instead of
+                    rushing the following frames to catch up.
+    INVARIANTS:     frame_time is greater than zero.
+                    overruns is never more than frames.
+                    Times are from time.monotonic, so changes to the system clock don't affect them.
+    """
+    # The target time of each frame in seconds
+    frame_time: float
+    # When the first frame started and when the current frame must be done by
+    start_time: float
+    deadline: float
+    # How many frames have been waited for, and how many of them were late
+    frames: int
+    overruns: int
+
+    def __init__(self, frame_time: float):
+        """
+        NAME:           FrameScheduler.__init__
+        PARAMETERS:     frame_time, how many seconds each frame should be shown for
+        PURPOSE:        This method initializes fields for a new FrameScheduler instance, the first frame starts now.
+        PRECONDITION:   frame_time is greater than zero
+        POSTCONDITION:  This instance's fields are initialized and the first deadline is one frame from now.
+        """
+        self.frame_time = frame_time
+        self.start_time = time.monotonic()
+        self.deadline = self.start_time + frame_time
+        self.frames = 0
+        self.overruns = 0
+
+    def behind(self) -> bool:
+        """
+        NAME:           FrameScheduler.behind
+        PARAMETERS:     None
+        PURPOSE:        This method checks if the current frame is already past its deadline, so optional work such as
+                        drawing previews can be skipped.
+        PRECONDITION:   None
+        POSTCONDITION:  True is returned when the deadline of the current frame has passed.
+        """
+        return time.monotonic() > self.deadline
+
+    def wait(self) -> None:
+        """
+        NAME:           FrameScheduler.wait
+        PARAMETERS:     None
+        PURPOSE:        This method sleeps until the deadline of the current frame and starts the next frame.
+        PRECONDITION:   The current frame has been searched and drawn.
+        POSTCONDITION:  The next frame's deadline is set and the frame and overrun counters are updated.
+        """
+        now = time.monotonic()
+        self.frames += 1
+        if now < self.deadline:
+            time.sleep(self.deadline - now)
+            self.deadline += self.frame_time
+            return
+
+        self.overruns += 1
+        self.deadline += self.frame_time
+        # Too far behind to catch up without rushing frames, start over from now
+        if now > self.deadline:
+            self.deadline = now + self.frame_time
+
+    def achieved_fps(self) -> float:
+        """
+        NAME:           FrameScheduler.achieved_fps
+        PARAMETERS:     None
+        PURPOSE:        This method calculates the average frame rate since the first frame.
+        PRECONDITION:   None
+        POSTCONDITION:  The frames per second is returned, zero before any time has passed.
+        """
+        elapsed = time.monotonic() - self.start_time
+        return self.frames / elapsed if elapsed > 0 else 0.0
+
+    def report(self) -> str:
+        """
+        NAME:           FrameScheduler.report
+        PARAMETERS:     None
+        PURPOSE:        This method describes the achieved frame rate compared to the target frame rate.
+        PRECONDITION:   None
+        POSTCONDITION:  A one line summary is returned.
+        """
+        return (f"Achieved {self.achieved_fps():.1f} of {1 / self.frame_time:.1f} fps, "
+                f"{self.overruns} of {self.frames} frames overran")
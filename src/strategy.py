@@ -0,0 +1,256 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         strategy.py
+SPECIFICATION:    The ways Tree can search its nodes for a path where the bird survives.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import heapq
+import itertools
+
+import numpy as np
+
+import const
+from batch import BatchState
+
+
+class SearchStrategy:
+    """
+    NAME:           SearchStrategy
+    PURPOSE:        A super class for the search algorithms of Tree. Every strategy expands nodes with the same
+                    TreeNode and Tree methods, only the order nodes are expanded in is different. Tree.search keeps
+                    the statistics that are shared by every strategy.
+    INVARIANTS:     A strategy holds no state between searches, every node it uses is part of the tree.
+    """
+    __slots__ = ()
+
+    # The name used to select the strategy with const.TREE_STRATEGY
+    name = None
+    # If the strategy consults the transposition table of the tree, Tree only keeps a table for those that do
+    uses_table = False
+
+    def search(self, tree, deadline: float) -> None:
+        """
+        NAME:           SearchStrategy.search
+        PARAMETERS:     tree, the Tree to search
+                        deadline, the time.perf_counter time to stop searching by, None for no limit
+        PURPOSE:        This method searches the tree and sets its path to the best path found.
+        PRECONDITION:   The path of the tree is not empty.
+        POSTCONDITION:  The path goes from the root to the tail and reaches the depth limit, is shorter but has at
+                        least one node after the root when the search ran out of time or nodes, see
+                        Tree._out_of_budget, or is empty if the bird can't survive.
+        """
+        # Error, this should be implemented by every strategy
+        assert False
+
+
+class DepthFirst(SearchStrategy):
+    """
+    NAME:           DepthFirst
+    PURPOSE:        The original greedy depth first search. It follows the best scoring child from the tail and climbs
+                    back up when the bird dies, continuing the path kept from the previous frame.
+    INVARIANTS:     None
+    """
+    __slots__ = ()
+
+    name = 'dfs'
+    uses_table = True
+
+    def search(self, tree, deadline: float) -> None:
+        """
+        NAME:           DepthFirst.search
+        PARAMETERS:     tree, the Tree to search
+                        deadline, the time.perf_counter time to stop searching by, None for no limit
+        PURPOSE:        This method starts from the current tail node and searches down through the tree until
+                            the maximum depth is reached. If the bird dies during the search then the tree is climbed
+                            back up to find another path where the bird survives.
+                        When out of time or nodes the search stops and keeps the path found so far, the next search
+                            continues from where this one stopped.
+        PRECONDITION:   The path of the tree is not empty.
+        POSTCONDITION:  Same as SearchStrategy.search.
+        """
+        # Loop until we find a good route that leads to the frame limit, or every route has been searched
+        # This expands and searches as it goes
+        while len(tree.path) > 0 and tree._depth() < tree.depth_limit:
+            # Out of time or nodes, the next frame can be played as long as there is a next node
+            if len(tree.path) > 1 and tree._out_of_budget(deadline):
+                tree.budget_hits += 1
+                break
+
+            # Case #1, continuing down the tree
+            if not tree.tail.populated:
+                tree.nodes_expanded += 1
+            next_node = tree.tail.get_best_child(tree.get_steps(tree.tail))
+            if tree.transposition is not None and next_node is not None:
+                next_node = tree._consult_table(tree.tail, next_node)
+            if not tree.tail.is_terminal():
+                if next_node is not None:
+                    # Add the node to the path and continue
+                    tree.path.append(next_node)
+                    tree.tail = next_node
+                    continue
+
+            # Case #2, node is terminal, climb and let the next loop search
+            height = len(tree.path)
+            tree._climb()
+            height -= len(tree.path)
+            tree.backtracks += 1
+            tree.climbs += height
+            tree.max_climb = max(tree.max_climb, height)
+
+
+class BestFirst(SearchStrategy):
+    """
+    NAME:           BestFirst
+    PURPOSE:        A best first search which always expands the frontier node with the highest priority, found with
+                    a heap. The priority is the score of the node plus const.TREE_BEST_DEPTH_WEIGHT for every frame it
+                    is ahead of the root, so it moves towards the depth limit while moving around dead ends by
+                    switching to a better node anywhere in the tree instead of climbing back up one node at a time.
+    INVARIANTS:     None
+    """
+    __slots__ = ()
+
+    name = 'best'
+
+    @staticmethod
+    def priority(tree, node) -> float:
+        """
+        NAME:           BestFirst.priority
+        PARAMETERS:     tree, the tree the node is in
+                        node, a node on the frontier
+        PURPOSE:        This method calculates how promising a node is to expand next.
+        PRECONDITION:   node is part of tree
+        POSTCONDITION:  The priority is returned, higher is expanded first.
+        """
+        # A new game hasn't been updated yet and has no threat to score, its root is the only node then
+        if node is tree.root:
+            return 0.0
+        return node.get_score() + const.TREE_BEST_DEPTH_WEIGHT * (node.frame - tree.root.frame)
+
+    def search(self, tree, deadline: float) -> None:
+        """
+        NAME:           BestFirst.search
+        PARAMETERS:     tree, the Tree to search
+                        deadline, the time.perf_counter time to stop searching by, None for no limit
+        PURPOSE:        This method puts every unpopulated node of the tree on the frontier and expands the highest
+                            priority node until one reaches the depth limit. Nodes where the bird dies are removed
+                            from the tree with Tree._prune.
+                        When out of time or nodes the highest priority node on the frontier becomes the tail.
+        PRECONDITION:   The path of the tree is not empty.
+        POSTCONDITION:  Same as SearchStrategy.search.
+        """
+        # The counter breaks ties in the order nodes were added, nodes themselves can't be compared
+        order = itertools.count()
+        frontier = list()
+        stack = [tree.root]
+        while len(stack) > 0:
+            node = stack.pop()
+            if not node.populated:
+                frontier.append((-self.priority(tree, node), next(order), node))
+            else:
+                stack.extend(child for child in (node.left_node, node.right_node) if child is not None)
+        heapq.heapify(frontier)
+
+        goal = tree.root.frame + tree.depth_limit - 1
+        while len(frontier) > 0:
+            node = frontier[0][2]
+            if node.frame >= goal:
+                tree._set_path(node)
+                return
+            if node is not tree.root and tree._out_of_budget(deadline):
+                tree.budget_hits += 1
+                tree._set_path(node)
+                return
+
+            heapq.heappop(frontier)
+            tree.nodes_expanded += 1
+            node._populate_children(tree.get_steps(node))
+            if node.is_terminal():
+                tree._prune(node)
+                if len(tree.path) == 0:
+                    return
+            for child in (node.left_node, node.right_node):
+                if child is not None:
+                    heapq.heappush(frontier, (-self.priority(tree, child), next(order), child))
+
+        # Every node died, pruning will have already emptied the path
+        tree.path.clear()
+
+
+class Beam(SearchStrategy):
+    """
+    NAME:           Beam
+    PURPOSE:        A beam search which keeps its layer of nodes as a batch.BatchState, so every layer is simulated
+                    and scored with one call on NumPy arrays, and keeps only the const.TREE_BEAM_WIDTH best scoring
+                    rows of each layer. Only the index of each row's parent and its action are kept for each layer,
+                    and game states are only made for the path that is chosen. It expands at most the width times two
+                    nodes per frame ahead, no matter how many dead ends there are. A beam can lose every path even
+                    though one exists, the depth first search is used then.
+    INVARIANTS:     width is greater than zero.
+    """
+    __slots__ = ('width',)
+
+    name = 'beam'
+
+    # How many nodes are kept in each layer
+    width: int
+
+    def __init__(self, width: int = None):
+        """
+        NAME:           Beam.__init__
+        PARAMETERS:     width, how many nodes to keep in each layer, const.TREE_BEAM_WIDTH when None
+        PURPOSE:        This method initializes fields for a new Beam instance.
+        PRECONDITION:   width is greater than zero when set
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        self.width = const.TREE_BEAM_WIDTH if width is None else width
+
+    def search(self, tree, deadline: float) -> None:
+        """
+        NAME:           Beam.search
+        PARAMETERS:     tree, the Tree to search
+                        deadline, the time.perf_counter time to stop searching by, None for no limit
+        PURPOSE:        This method moves a layer of rows from the root to the depth limit one frame at a time. The
+                            best scoring row of the last layer is traced back through the parents of each layer to
+                            the actions that lead to it, and the tree follows those actions from the root. When out
+                            of time or nodes, the best row of the current layer is used.
+        PRECONDITION:   The path of the tree is not empty.
+        POSTCONDITION:  Same as SearchStrategy.search.
+        """
+        layer = BatchState([tree.root.game_state])
+        # For every layer, the row each kept row came from in the layer before it and if its bird jumped
+        parents = list()
+        jumps = list()
+        for _ in range(tree.depth_limit - 1):
+            if len(parents) > 0 and tree._out_of_budget(deadline):
+                tree.budget_hits += 1
+                break
+
+            children = layer.branch()
+            tree.nodes_expanded += len(layer)
+            alive = np.flatnonzero(~children.dead)
+            if len(alive) == 0:
+                # The beam lost every path, start over from the root with the depth first search
+                tree.path = [tree.root]
+                tree.tail = tree.root
+                DepthFirst().search(tree, deadline)
+                return
+
+            # A stable sort keeps the earlier row first when scores tie
+            order = np.argsort(-children.get_scores()[alive], kind='stable')
+            kept = alive[order[:self.width]]
+            parents.append(kept // 2)
+            jumps.append(kept % 2 == 1)
+            layer = children.take(kept)
+
+        actions = list()
+        row = int(np.argmax(layer.get_scores())) if len(parents) > 0 else 0
+        for parent, jump in zip(reversed(parents), reversed(jumps)):
+            actions.append(bool(jump[row]))
+            row = int(parent[row])
+        actions.reverse()
+        tree._follow_actions(actions)
+
+
+# Strategies by the name used in const.TREE_STRATEGY
+STRATEGIES = {strategy.name: strategy for strategy in (DepthFirst, BestFirst, Beam)}
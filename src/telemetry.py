@@ -0,0 +1,86 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         telemetry.py
+SPECIFICATION:    Record what the search tree did each frame to a JSON lines file.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import json
+
+import const
+
+
+class Telemetry:
+    """
+    NAME:           Telemetry
+    PURPOSE:        A buffered writer of one JSON record per frame. The search tree and the game loop add fields to
+                    the record of the current frame, and end_frame queues it to be written. Records are written in
+                    batches of buffer_size lines so the file is only touched every few hundred frames.
+                    Code that records telemetry checks for None first, so a disabled writer costs nothing.
+    INVARIANTS:     buffer never holds more than buffer_size lines after end_frame returns.
+                    frame only holds the fields of the frame that has not ended yet.
+    """
+    # The file the records are written to
+    file: object
+    # The fields of the current frame
+    frame: dict
+    # Lines waiting to be written, and how many to wait for before writing them
+    buffer: list[str]
+    buffer_size: int
+    # How many records have ended
+    records: int
+
+    def __init__(self, path: str, buffer_size: int = const.TELEMETRY_BUFFER):
+        """
+        NAME:           Telemetry.__init__
+        PARAMETERS:     path, the file to write the records to, it is replaced if it exists
+                        buffer_size, how many records to hold before writing them
+        PURPOSE:        This method opens the file and initializes fields for a new Telemetry instance.
+        PRECONDITION:   buffer_size is greater than zero
+        POSTCONDITION:  The file is open and empty, and no records are buffered.
+        """
+        self.file = open(path, 'w')
+        self.frame = dict()
+        self.buffer = list()
+        self.buffer_size = buffer_size
+        self.records = 0
+
+    def end_frame(self) -> None:
+        """
+        NAME:           Telemetry.end_frame
+        PARAMETERS:     None
+        PURPOSE:        This method queues the record of the current frame and starts a new one.
+        PRECONDITION:   The file is open.
+        POSTCONDITION:  The record is buffered, and the buffer is written if it is full.
+        """
+        self.buffer.append(json.dumps(self.frame))
+        self.frame = dict()
+        self.records += 1
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        NAME:           Telemetry.flush
+        PARAMETERS:     None
+        PURPOSE:        This method writes every buffered record to the file.
+        PRECONDITION:   The file is open.
+        POSTCONDITION:  The buffer is empty and its records are in the file.
+        """
+        if len(self.buffer) > 0:
+            self.file.write("\n".join(self.buffer) + "\n")
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self) -> None:
+        """
+        NAME:           Telemetry.close
+        PARAMETERS:     None
+        PURPOSE:        This method writes the buffered records and closes the file. The record of a frame that
+                        never ended is dropped.
+        PRECONDITION:   None
+        POSTCONDITION:  The file is closed.
+        """
+        if not self.file.closed:
+            self.flush()
+            self.file.close()
@@ -0,0 +1,161 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         transposition.py
+SPECIFICATION:    Remember which game states are known to die or survive so the search tree can skip them.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+from collections import OrderedDict
+
+import const
+
+
+class TranspositionTable:
+    """
+    NAME:           TranspositionTable
+    PURPOSE:        A least recently used table of quantized game state signatures. Each signature stores the
+                    smallest remaining depth the state is known to die within, and the largest remaining depth it
+                    is known to survive for. Jump and no jump sequences often reach the same state, so a subtree
+                    that was already searched from one of them doesn't need to be searched again.
+    INVARIANTS:     The table never holds more than capacity entries.
+                    A state known to die within d frames also dies within any depth larger than d.
+                    A state known to survive d frames also survives any depth smaller than d.
+    """
+    # Signature -> [dead_depth, survive_depth], None when nothing is known
+    entries: OrderedDict
+    # Max number of entries before the least recently used entry is evicted
+    capacity: int
+
+    # Statistics for how useful the table is
+    hits: int
+    misses: int
+    evictions: int
+
+    def __init__(self, capacity: int = const.TT_SIZE):
+        """
+        NAME:           TranspositionTable.__init__
+        PARAMETERS:     capacity, the max number of signatures to remember
+        PURPOSE:        This method initializes fields for a new TranspositionTable instance.
+        PRECONDITION:   capacity is greater than zero
+        POSTCONDITION:  This instance is empty and its counters are zero.
+        """
+        self.entries = OrderedDict()
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def signature(game_state) -> tuple:
+        """
+        NAME:           TranspositionTable.signature
+        PARAMETERS:     game_state, the state to create a signature for
+        PURPOSE:        This method quantizes the parts of a game state that decide if the bird can survive.
+                        The score, floor, and background don't affect survival and are left out.
+                        States of games with different gap schedules must not share a table.
+        PRECONDITION:   game_state is initialized
+        POSTCONDITION:  A hashable tuple is returned, states that are practically identical share a signature.
+        """
+        pipes = tuple((round(pipe_pair.x / const.TT_PIPE_X), round(pipe_pair.top_pipe.y), round(pipe_pair.bot_pipe.y))
+                      for pipe_pair in game_state.pipes)
+        # The spawn count decides which gaps come next from the schedule
+        return (round(game_state.bird.y / const.TT_Y),
+                round(game_state.bird.velocity / const.TT_VELOCITY),
+                game_state.delta,
+                game_state.pipes_spawned,
+                pipes)
+
+    def _lookup(self, game_state) -> list:
+        """
+        NAME:           TranspositionTable._lookup
+        PARAMETERS:     game_state, the state to look up
+        PURPOSE:        This method finds the entry of a state and marks it as recently used.
+        PRECONDITION:   None
+        POSTCONDITION:  The [dead_depth, survive_depth] entry is returned, or None if the state is unknown.
+        """
+        key = self.signature(game_state)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def _entry(self, game_state) -> list:
+        """
+        NAME:           TranspositionTable._entry
+        PARAMETERS:     game_state, the state to find or create an entry for
+        PURPOSE:        This method returns the entry of a state, creating it and evicting the least recently
+                        used entry when the table is full.
+        PRECONDITION:   None
+        POSTCONDITION:  The entry for the state is returned and is the most recently used entry.
+        """
+        key = self.signature(game_state)
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = [None, None]
+            self.entries[key] = entry
+            if len(self.entries) > self.capacity:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        else:
+            self.entries.move_to_end(key)
+        return entry
+
+    def is_dead(self, game_state, remaining: int) -> bool:
+        """
+        NAME:           TranspositionTable.is_dead
+        PARAMETERS:     game_state, the state to check
+                        remaining, how many more frames the bird must survive after this state
+        PURPOSE:        This method checks if the state is already known to have no surviving path.
+        PRECONDITION:   None
+        POSTCONDITION:  True is returned when the state is known to die within remaining frames.
+                        The hit or miss counter is incremented.
+        """
+        entry = self._lookup(game_state)
+        if entry is not None and entry[0] is not None and entry[0] <= remaining:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def is_survivable(self, game_state, remaining: int) -> bool:
+        """
+        NAME:           TranspositionTable.is_survivable
+        PARAMETERS:     game_state, the state to check
+                        remaining, how many more frames the bird must survive after this state
+        PURPOSE:        This method checks if the state is already known to have a surviving path.
+        PRECONDITION:   None
+        POSTCONDITION:  True is returned when the state is known to survive for remaining frames.
+                        The hit or miss counter is incremented.
+        """
+        entry = self._lookup(game_state)
+        if entry is not None and entry[1] is not None and entry[1] >= remaining:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def record_dead(self, game_state, remaining: int) -> None:
+        """
+        NAME:           TranspositionTable.record_dead
+        PARAMETERS:     game_state, a state where every path was searched and the bird died
+                        remaining, how many more frames the bird needed to survive after this state
+        PURPOSE:        This method remembers that the state dies within remaining frames.
+        PRECONDITION:   The subtree of the state was fully searched to the remaining depth.
+        POSTCONDITION:  The dead depth of the state is lowered to remaining if it was higher or unknown.
+        """
+        entry = self._entry(game_state)
+        if entry[0] is None or remaining < entry[0]:
+            entry[0] = remaining
+
+    def record_survivable(self, game_state, remaining: int) -> None:
+        """
+        NAME:           TranspositionTable.record_survivable
+        PARAMETERS:     game_state, a state on a path where the bird survived
+                        remaining, how many frames the bird survived after this state
+        PURPOSE:        This method remembers that the state survives for remaining frames.
+        PRECONDITION:   A surviving path of remaining frames was found from the state.
+        POSTCONDITION:  The survive depth of the state is raised to remaining if it was lower or unknown.
+        """
+        entry = self._entry(game_state)
+        if entry[1] is None or remaining > entry[1]:
+            entry[1] = remaining
@@ -0,0 +1,1702 @@
+"""
+AUTHOR:           Hunter Hageman, Marshall Patterson
+FILENAME:         tree.py
+SPECIFICATION:    Search the future frames of a game for a path where the bird survives, and play games with it.
+FOR:              CS 3368 Introduction to Artificial Intelligence Section 001
+"""
+
+import itertools
+import math
+import multiprocessing
+import sys
+import time
+from collections import deque
+
+import const
+from ballistic import NoJumpProjection
+from game import Bird, GameState
+from replay import Recording
+from strategy import STRATEGIES, SearchStrategy
+from telemetry import Telemetry
+from transposition import TranspositionTable
+
+
+# ###################################
+# #############[ Start ]#############
+# ########### Search Tree ###########
+# ###################################
+# ###################################
+
+
+def get_state_score(game_state: "GameState") -> float:
+    """
+    NAME:           get_state_score
+    PARAMETERS:     game_state: the state to score
+    PURPOSE:        This function calculates how good a game state is and returns it as a float.
+    PRECONDITION:   game_state is not None and its bird has been updated at least once
+    POSTCONDITION:  The score for the game state is returned, higher is better
+    """
+    # Distance from the middle of the screen.
+    middle_delta = abs(game_state.bird.y - const.SCREEN_MIDDLE)
+    # Subtract the delta to lower the score of the bird the further it travels from the middle.
+    return game_state.bird.threat[0] - middle_delta
+
+
+def get_adaptive_depth(game_state: "GameState", cost_ms: float = 0.0) -> int:
+    """
+    NAME:           get_adaptive_depth
+    PARAMETERS:     game_state: the state the search starts from
+                    cost_ms: the average milliseconds of the recent searches
+    PURPOSE:        This function picks how many frames to look ahead from the next pipes the bird hasn't passed.
+                        While the near side of the pipes is further away than const.TREE_MIN_DEPTH frames, only the
+                        floor and the top of the screen can kill the bird, so the shallowest depth is enough. Once
+                        they are closer, the search looks const.TREE_DEPTH_MARGIN frames past their far side, plus up
+                        to const.TREE_DEPTH_GAP_FRAMES more the smaller their gap is.
+                        When the searches have been slower than const.TREE_DEPTH_COST_MS the depth is shortened by
+                        the same ratio.
+    PRECONDITION:   game_state has a delta and a pipe speed greater than zero
+    POSTCONDITION:  The depth limit is returned, from const.TREE_MIN_DEPTH to const.TREE_MAX_DEPTH
+    """
+    step = game_state.pipe_speed * game_state.delta
+    bird_x = game_state.bird.x + const.BIRD_X / 2
+    pipes = min((pipe_pair for pipe_pair in game_state.pipes if not pipe_pair.passed),
+                key=lambda pipe_pair: pipe_pair.x, default=None)
+
+    depth = const.TREE_MIN_DEPTH
+    if pipes is not None and (pipes.x - bird_x - const.BIRD_DEATH) / step <= const.TREE_MIN_DEPTH:
+        gap = pipes.bot_pipe.y - (pipes.top_pipe.y + pipes.top_pipe.size_y)
+        tightness = (const.GAP_MAX - gap) / (const.GAP_MAX - const.GAP_MIN)
+        far_side = (pipes.x + const.PIPE_X - bird_x + const.BIRD_DEATH) / step
+        depth = math.ceil(far_side + const.TREE_DEPTH_MARGIN + const.TREE_DEPTH_GAP_FRAMES * tightness)
+
+    if cost_ms > const.TREE_DEPTH_COST_MS:
+        depth = int(depth * const.TREE_DEPTH_COST_MS / cost_ms)
+    return max(const.TREE_MIN_DEPTH, min(const.TREE_MAX_DEPTH, depth))
+
+
+def _reachable(obj) -> dict[int, object]:
+    """
+    NAME:           _reachable
+    PARAMETERS:     obj: the object to start from
+    PURPOSE:        This function finds every object that can be reached from an object through its attributes, slots,
+                        and the items of its containers.
+    PRECONDITION:   obj doesn't reference a TreeNode, the whole tree would be reached through it
+    POSTCONDITION:  A dictionary of the reached objects by their id is returned
+    """
+    reached = dict()
+    stack = [obj]
+    while len(stack) > 0:
+        obj = stack.pop()
+        if id(obj) in reached or isinstance(obj, type):
+            continue
+        reached[id(obj)] = obj
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        else:
+            if hasattr(obj, '__dict__'):
+                stack.append(obj.__dict__)
+            for cls in type(obj).__mro__:
+                for name in getattr(cls, '__slots__', ()):
+                    if hasattr(obj, name):
+                        stack.append(getattr(obj, name))
+    return reached
+
+
+def get_node_bytes(game_state: "GameState") -> int:
+    """
+    NAME:           get_node_bytes
+    PARAMETERS:     game_state: a game state of the tree
+    PURPOSE:        This function estimates how many bytes each tree node takes. A clone of the game state is made
+                        and updated like a child node, and only the objects of the clone that aren't shared with the
+                        original, like the gap schedule, are counted, along with the TreeNode itself.
+    PRECONDITION:   game_state is not None
+    POSTCONDITION:  The estimated bytes of one node are returned
+    """
+    shared = _reachable(game_state)
+    node = TreeNode(None, game_state.clone())
+    node.game_state.do_update()
+    size = sys.getsizeof(node) + sys.getsizeof(node.__dict__)
+    for key, obj in _reachable(node.game_state).items():
+        if key not in shared:
+            size += sys.getsizeof(obj)
+    return size
+
+
+class TreeNode:
+    """
+    NAME:           TreeNode
+    PURPOSE:        A node within a search tree that contains information about the GameState it represents.
+    INVARIANTS:     game_state is always set to what represents this node and should not be updated or changed.
+                    populated is true when the branches of this node have been created, false otherwise.
+                    parent is set to the node preceding this node in the game state simulation. None when this node is
+                        the current game state and not a potential future state.
+                    left_node is the potential future game state where the bird doesn't jump,
+                        None when unpopulated or when all of its branches lead to bird death
+                    right_node is the potential future game state where the bird does jump
+                        None when unpopulated or when all of its branches lead to bird death
+                    frame is the number of frames simulated since the first root of the tree
+                    frames is the number of frames between the parent and this node, more than 1 when the bird waits
+                        several frames without jumping or the node is coarse
+                    coarse is true when the bird can only jump on the first of the node's frames, it is split into
+                        one frame nodes as the root gets closer
+    """
+
+    # The game state that this node represents
+    game_state: "GameState"
+    # How many frames this node is from the first root node, used to measure the remaining search depth
+    frame: int
+    # How many frames this node is from its parent node
+    frames: int
+    # If the node covers several frames because it is far from the root, instead of because the bird waits
+    coarse: bool
+
+    # If this node has created its child nodes before, used to prevent researching and infinite recursion
+    populated: bool
+
+    # This nodes parent node, None if root
+    parent: "TreeNode"
+    # The future game state if the bird falls, null when explored/unpopulated
+    left_node: "TreeNode"
+    # The future game state if the bird jumps, null when explored/unpopulated
+    right_node: "TreeNode"
+
+    def __init__(self, parent: "TreeNode", game_state: "GameState", frames: int = 1, coarse: bool = False):
+        """
+        NAME:           TreeNode.__init__
+        PARAMETERS:     parent: The parent node which precedes this nodes game_state, None when this is the root node
+                        game_state: the state of this game this node represents, never None
+                        frames: how many frames were simulated from the parent's game state to this one
+                        coarse: if the node covers several frames because it is far from the root
+        PURPOSE:        This method initializes fields for a new TreeNode instance.
+        PRECONDITION:   game_state and populated are set to a non None value,
+                        parent is set to the provided value,
+                        left_node and right_node are set to None.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        self.game_state = game_state
+        self.frames = frames
+        self.coarse = coarse
+        self.frame = 0 if parent is None else parent.frame + frames
+        self.populated = False
+        self.parent = parent
+        # noinspection PyTypeChecker
+        self.left_node = None
+        # noinspection PyTypeChecker
+        self.right_node = None
+
+    def _populate_children(self, steps: int = 1):
+        """
+        NAME:           TreeNode._populate_children
+        PARAMETERS:     steps: how many frames each branch covers, see Tree.get_steps
+        PURPOSE:        This method populates the branches of this node.
+                        When const.TREE_WAIT_FRAMES is more than 1 and the bird survives that many frames without
+                            jumping, the left branch skips ahead all of those frames at once.
+                        With more than one step, both branches are coarse. Their frames are still updated one at a
+                            time, but the bird can only jump on the first of them, so the tree branches less often.
+        PRECONDITION:   This node has not populated its children before, populated is False
+        POSTCONDITION:  This node's branches are set to potential futures of the game state and are no longer None
+                        populated is set to True
+        """
+        self.populated = True
+
+        if steps > 1:
+            left_state = self.game_state.clone()
+            right_state = self.game_state.clone()
+            right_state.bird.jump()
+            for state in (left_state, right_state):
+                for _ in range(steps):
+                    state.do_update()
+                    if state.bird.dead:
+                        break
+            self._set_children(left_state, right_state, steps, steps)
+            return
+
+        # Wait several frames at once if nothing happens to the bird during them
+        left_state = None
+        left_frames = 1
+        if const.TREE_WAIT_FRAMES > 1:
+            projection = NoJumpProjection(self.game_state, const.TREE_WAIT_FRAMES)
+            if projection.event_frame is None:
+                left_state = self.game_state.clone()
+                projection.apply(left_state)
+                left_frames = const.TREE_WAIT_FRAMES
+
+        # Clone the states and make the right state jump
+        if left_state is None:
+            left_state = self.game_state.clone()
+            left_state.do_update()
+        right_state = self.game_state.clone()
+        right_state.bird.jump()
+        # Update the states, simulate the future
+        right_state.do_update()
+
+        self._set_children(left_state, right_state, left_frames)
+
+    def _set_children(self, left_state: "GameState", right_state: "GameState", left_frames: int = 1,
+                      coarse_frames: int = 1) -> None:
+        """
+        NAME:           TreeNode._set_children
+        PARAMETERS:     left_state: the simulated future without a jump, None if it is already known to be dead
+                        right_state: the simulated future with a jump, None if it is already known to be dead
+                        left_frames: how many frames the bird waited without jumping to reach left_state
+                        coarse_frames: how many frames both states cover when they are coarse, 1 when they are not
+        PURPOSE:        This method creates the branches of this node from already simulated game states.
+        PRECONDITION:   populated is True and both states were simulated from this node's game_state.
+        POSTCONDITION:  left_node and right_node are set to new nodes, or None when the bird is dead in that future.
+        """
+        # Set left and right nodes if the bird isn't dead, dead bird will always be a terminal node
+        coarse = coarse_frames > 1
+        if left_state is not None and not left_state.bird.dead:
+            self.left_node = TreeNode(self, left_state, max(left_frames, coarse_frames), coarse)
+        else:
+            # noinspection PyTypeChecker
+            self.left_node = None
+
+        if right_state is not None and not right_state.bird.dead:
+            self.right_node = TreeNode(self, right_state, coarse_frames, coarse)
+        else:
+            # noinspection PyTypeChecker
+            self.right_node = None
+
+    def get_best_child(self, steps: int = 1) -> "TreeNode":
+        """
+        NAME:           TreeNode.get_best_child
+        PARAMETERS:     steps: how many frames each branch covers when they are populated
+        PURPOSE:        This method returns the best child node with the lowest threat level.
+        PRECONDITION:   This node is not terminal, populated is false and either node is not None
+        POSTCONDITION:  Both child nodes are populated if possible, and the best child node is returned
+        """
+
+        if not self.populated:
+            self._populate_children(steps)
+
+        if self.left_node is not None and self.right_node is not None:
+            left_better = self.left_node.get_score() > self.right_node.get_score()
+            return self.left_node if left_better else self.right_node
+        elif self.left_node is None and self.right_node is not None:
+            return self.right_node
+        elif self.left_node is not None and self.right_node is None:
+            return self.left_node
+
+    def get_score(self) -> float:
+        """
+        NAME:           TreeNode.get_score
+        PARAMETERS:     No parameters
+        PURPOSE:        This method calculates how good the current game state is and returns it as a float.
+        PRECONDITION:   game_state is not None
+        POSTCONDITION:  The score for this node is returned
+        """
+        return get_state_score(self.game_state)
+
+    def is_terminal(self):
+        """
+        NAME:           TreeNode.is_terminal
+        PARAMETERS:     No parameters
+        PURPOSE:        This method determines if this node has no good branches
+        PRECONDITION:   none
+        POSTCONDITION:  True is returned if this node can be explored no further, False otherwise
+        """
+        return self.left_node is None and self.right_node is None
+
+    def remove_child(self, child: "TreeNode"):
+        """
+        NAME:           TreeNode.remove_child
+        PARAMETERS:     child: the child node to remove
+        PURPOSE:        This method removes the provided child node from itself
+        PRECONDITION:   The child parameter is either the left or right node of this node.
+        POSTCONDITION:  True is returned if this node can be explored no further, False otherwise
+        """
+        if self.left_node == child:
+            # noinspection PyTypeChecker
+            self.left_node = None
+        elif self.right_node == child:
+            # noinspection PyTypeChecker
+            self.right_node = None
+        else:
+            raise Exception("Neither child matched!")
+
+    def disintegrate(self):
+        """
+        NAME:           TreeNode.disintegrate
+        PARAMETERS:     none
+        PURPOSE:        This method recourses through child nodes before removing them from this instance to remove
+                            references to the nodes for garbage collection.
+        PRECONDITION:   none
+        POSTCONDITION:  this node and all its now previous child nodes have removed their references to each other.
+        """
+        if self.left_node is not None:
+            self.left_node.disintegrate()
+            # noinspection PyTypeChecker
+            self.left_node = None
+
+        if self.right_node is not None:
+            self.right_node.disintegrate()
+            # noinspection PyTypeChecker
+            self.right_node = None
+
+
+class Tree:
+    """
+    NAME:           Tree
+    PURPOSE:        A Tree data structure similar to a binary search tree which contains the current game state at its
+                    root and future game states as its nodes/branches. As time progresses and frames are drawn, the
+                    root of the tree moves down the branch that is calculated to have the best odds of survival.
+    INVARIANTS:     root is the topmost node of the tree and is never None
+                    tail is one of the lowest nodes in the tree and is the current best node
+                    path is a list of nodes from the root to the tail, needed to access the next node to render a frame
+                    depth_limit is how far deep the search can go before exiting, same as how far into the future the
+                        tree can predict
+    """
+    # The root node
+    root: TreeNode
+    # The ending node
+    tail: TreeNode
+    # Ordered list of nodes from the root node to the best ending node
+    # the length of this list also acts as the depth counter
+    path: list[TreeNode]
+    # The max depth of the search tree (frame lookahead)
+    depth_limit: int
+    # Known dead and survivable states, None when disabled
+    transposition: TranspositionTable
+    # The tail when the path was last recorded into the transposition table, None before the first record
+    recorded: TreeNode
+    # Max wall time of each search in milliseconds, None for no limit
+    budget: float
+    # Max nodes each search may expand, None for no limit. Unlike budget it stops a seeded search at the same place
+    # on every run
+    node_budget: int
+    # The nodes_expanded count the current search stops at, None for no limit
+    node_limit: int
+    # How many searches have run, and how many of them ran out of time or nodes
+    searches: int
+    budget_hits: int
+    # How many nodes have had their children simulated
+    nodes_expanded: int
+    # How many times the search climbed back up after a dead end, and how many nodes it climbed in total
+    backtracks: int
+    climbs: int
+    # The most nodes climbed at once during the last search
+    max_climb: int
+    # The order nodes are searched in
+    strategy: SearchStrategy
+    # Where each frame's search statistics are recorded, None when disabled
+    telemetry: Telemetry
+    # Most nodes kept before branches off the path are evicted, from const.TREE_MAX_NODES and const.TREE_MAX_BYTES,
+    # None for no limit
+    max_nodes: int
+    # Estimated bytes of each node, None when there is no byte limit or telemetry to use it
+    node_bytes: int
+    # Most nodes the tree can have right now, exact after the nodes are counted and only grows until the next count
+    live_bound: int
+    # The most nodes counted at once, and how many branches have been evicted
+    peak_nodes: int
+    evictions: int
+    # If the depth limit is picked before each search with get_adaptive_depth
+    adaptive: bool
+    # Average milliseconds of the recent searches, weighted towards the latest
+    search_cost: float
+
+    # This data structure lacks a list of visited nodes, as when a node has been fully explored and becomes terminal
+    #   it is removed from the structure. Which effectively performs the same function of preventing traveled nodes
+    #   from being revisited.
+
+    def __init__(self, game_state: "GameState", transposition: TranspositionTable = None,
+                 delta: float = None, depth_limit: int = None, telemetry: Telemetry = None,
+                 strategy: SearchStrategy = None) -> None:
+        """
+        NAME:           Tree.__init__
+        PARAMETERS:     game_state: the base game state to start this tree from, and to represent the root node with
+                        transposition: the table of known states to share with this tree,
+                            a new table is created when None and const.TT_ENABLED is set,
+                            no table is used when the strategy doesn't consult it
+                        delta: the time of each simulated frame, const.TREE_DELTA when None
+                        depth_limit: how many frames to look ahead, const.TREE_DEPTH when None, or picked before
+                            every search when const.TREE_ADAPTIVE_DEPTH is set
+                        telemetry: where to record each frame's search statistics, None to not record them
+                        strategy: how to search the tree, the strategy named by const.TREE_STRATEGY when None
+        PURPOSE:        This method initializes fields for a new Tree instance.
+        PRECONDITION:   game_state and populated are set to a non None value,
+                        parent is set to the provided value,
+                        left_node and right_node are set to None.
+        POSTCONDITION:  This instance's fields are initialized to the provided parameters.
+        """
+        # Override the frame time delta to our simulation speed
+        # This is copied to all updated nodes when cloned, so it is effectively a fixed time
+        game_state.delta = const.TREE_DELTA if delta is None else delta
+        # noinspection PyTypeChecker
+        self.root = TreeNode(None, game_state)
+        self.tail = self.root
+        self.path = list()
+        self.path.append(self.root)
+        self.depth_limit = const.TREE_DEPTH if depth_limit is None else depth_limit
+        self.adaptive = depth_limit is None and const.TREE_ADAPTIVE_DEPTH
+        self.search_cost = 0.0
+
+        self.strategy = STRATEGIES[const.TREE_STRATEGY]() if strategy is None else strategy
+        # Recording every path into a table only the depth first search reads would just slow the others down
+        if not self.strategy.uses_table:
+            transposition = None
+        elif transposition is None and const.TT_ENABLED:
+            transposition = TranspositionTable()
+        self.transposition = transposition
+        # noinspection PyTypeChecker
+        self.recorded = None
+
+        self.budget = const.TREE_BUDGET_MS
+        self.node_budget = None
+        # noinspection PyTypeChecker
+        self.node_limit = None
+        self.searches = 0
+        self.budget_hits = 0
+        self.nodes_expanded = 0
+        self.backtracks = 0
+        self.climbs = 0
+        self.max_climb = 0
+        self.telemetry = telemetry
+
+        self.node_bytes = None
+        if const.TREE_MAX_BYTES is not None or telemetry is not None:
+            self.node_bytes = get_node_bytes(game_state)
+        limits = [const.TREE_MAX_NODES]
+        if const.TREE_MAX_BYTES is not None:
+            limits.append(const.TREE_MAX_BYTES // self.node_bytes)
+        limits = [limit for limit in limits if limit is not None]
+        self.max_nodes = min(limits) if len(limits) > 0 else None
+        self.live_bound = 1
+        self.peak_nodes = 1
+        self.evictions = 0
+
+    def _remaining(self, node: TreeNode) -> int:
+        """
+        NAME:           Tree._remaining
+        PARAMETERS:     node: a node within this tree
+        PURPOSE:        This method calculates how many more frames the bird must survive after the node's game state
+                            for the path to reach the depth limit.
+        PRECONDITION:   node is the root or one of its descendants
+        POSTCONDITION:  The number of frames between the node and the depth limit is returned
+        """
+        return self.root.frame + self.depth_limit - 1 - node.frame
+
+    def _depth(self) -> int:
+        """
+        NAME:           Tree._depth
+        PARAMETERS:     none
+        PURPOSE:        This method calculates how many frames the path covers, counting the root.
+                            This is the length of the path when every node on it is one frame long.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The number of frames from the root to the tail plus one is returned
+        """
+        return self.tail.frame - self.root.frame + 1
+
+    def _consult_table(self, node: TreeNode, best_child: TreeNode) -> TreeNode:
+        """
+        NAME:           Tree._consult_table
+        PARAMETERS:     node: the populated node being searched from
+                        best_child: the child node with the best score
+        PURPOSE:        This method removes children of the node which are already known to die, and prefers a child
+                            which is known to survive over a better scoring child which isn't.
+        PRECONDITION:   The transposition table is enabled and node is populated
+        POSTCONDITION:  The child to search next is returned, None if every child is known to die
+        """
+        for child in (node.left_node, node.right_node):
+            if child is not None and self.transposition.is_dead(child.game_state, self._remaining(child)):
+                node.remove_child(child)
+                child.disintegrate()
+
+        if node.is_terminal():
+            return None
+        if node.left_node is None or node.right_node is None:
+            return node.get_best_child()
+
+        other_child = node.left_node if best_child is node.right_node else node.right_node
+        if not self.transposition.is_survivable(best_child.game_state, self._remaining(best_child)) and \
+                self.transposition.is_survivable(other_child.game_state, self._remaining(other_child)):
+            return other_child
+        return best_child
+
+    def _climb(self) -> None:
+        """
+        NAME:           Tree._climb
+        PARAMETERS:     none
+        PURPOSE:        This method climbs up from the tail node to the node above it.
+                            The tail node and path are updated accordingly.
+                            If the new tail node is terminal then this method becomes recursive on it.
+        PRECONDITION:   The tail is terminal.
+        POSTCONDITION:  The tail is the lowest node on the path that is not terminal,
+                            the path is empty if every node including the root is terminal
+        """
+        if not self.tail.is_terminal():
+            raise Exception("Back propagating when tail isn't terminal!")
+
+        # Coarse children only jump every few frames, the bird might survive the state when it can jump on any frame
+        if self.transposition is not None and self.get_steps(self.tail) == 1:
+            self.transposition.record_dead(self.tail.game_state, self._remaining(self.tail))
+
+        parent = self.tail.parent
+        if parent is None:
+            # The root is terminal, there is no path where the bird survives
+            self.path.clear()
+            return
+
+        self.tail.disintegrate()
+        self.path.pop()
+        parent.remove_child(self.tail)
+        self.tail = parent
+
+        # Keep climbing up until we find an unexplored path
+        if parent.is_terminal():
+            self._climb()
+
+    def _set_path(self, node: TreeNode) -> None:
+        """
+        NAME:           Tree._set_path
+        PARAMETERS:     node: the node to make the tail
+        PURPOSE:        This method replaces the path with the nodes from the root down to the node.
+        PRECONDITION:   node is the root or one of its descendants
+        POSTCONDITION:  The path goes from the root to node and node is the tail
+        """
+        path = list()
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        path.reverse()
+        self.path = path
+        self.tail = path[-1]
+
+    def get_steps(self, node: TreeNode) -> int:
+        """
+        NAME:           Tree.get_steps
+        PARAMETERS:     node: the node whose children are about to be simulated
+        PURPOSE:        This method picks how many frames the children of a node cover. Within const.TREE_FINE_DEPTH
+                            frames of the root every frame is simulated, and each const.TREE_FINE_DEPTH frames further
+                            ahead a child covers const.TREE_COARSE_FACTOR times more frames, up to
+                            const.TREE_COARSE_MAX.
+        PRECONDITION:   node is the root or one of its descendants
+        POSTCONDITION:  The number of frames is returned, 1 when const.TREE_FINE_DEPTH is None
+        """
+        if const.TREE_FINE_DEPTH is None:
+            return 1
+        level = (node.frame - self.root.frame) // const.TREE_FINE_DEPTH
+        return min(const.TREE_COARSE_MAX, const.TREE_COARSE_FACTOR ** level)
+
+    def _refine(self) -> None:
+        """
+        NAME:           Tree._refine
+        PARAMETERS:     none
+        PURPOSE:        This method splits the coarse nodes on the path which now cover more frames than get_steps
+                            gives for their parent, as the root moves closer to them. Coarse states are updated one
+                            frame at a time, so splitting them doesn't change any state after them and the rest of the
+                            path and its branches are kept.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  Every coarse node on the path covers no more frames than get_steps gives for its parent
+        """
+        index = 1
+        while index < len(self.path):
+            node = self.path[index]
+            if node.coarse and node.frames > self.get_steps(self.path[index - 1]):
+                self._split(node)
+            index += 1
+
+    def set_depth_limit(self, depth_limit: int) -> None:
+        """
+        NAME:           Tree.set_depth_limit
+        PARAMETERS:     depth_limit: how many frames to look ahead
+        PURPOSE:        This method changes how far ahead the tree searches. When the limit is shorter than the path,
+                            the nodes past it are removed from the path but kept in the tree, so a later deeper search
+                            follows them again without simulating them.
+        PRECONDITION:   depth_limit is greater than one
+        POSTCONDITION:  The path is no deeper than the depth limit
+        """
+        self.depth_limit = depth_limit
+        if len(self.path) > 0 and self._depth() > depth_limit:
+            while len(self.path) > 1 and self.path[-1].frame > self.root.frame + depth_limit - 1:
+                self.path.pop()
+            self.tail = self.path[-1]
+
+    def _prune(self, node: TreeNode) -> None:
+        """
+        NAME:           Tree._prune
+        PARAMETERS:     node: a terminal node
+        PURPOSE:        This method removes a node where the bird always dies from the tree, along with every parent
+                            that has no other child left. This is the same as climbing, but for nodes off the path.
+        PRECONDITION:   node is terminal
+        POSTCONDITION:  The lowest remaining ancestor of node has a child, the path is empty if the root was removed
+        """
+        while node.is_terminal():
+            parent = node.parent
+            if parent is None:
+                # The root is terminal, there is no path where the bird survives
+                self.path.clear()
+                return
+            parent.remove_child(node)
+            node = parent
+
+    def search(self) -> None:
+        """
+        NAME:           Tree.search
+        PARAMETERS:     none
+        PURPOSE:        This method searches the tree with its strategy until a path reaches the depth limit, see
+                            DepthFirst, BestFirst, and Beam in strategy.py.
+                        When a budget or node budget is set the search stops once it runs out of time or nodes and
+                            keeps the path found so far, the next search continues from where this one stopped.
+        PRECONDITION:   The current depth of the tree is not at the depth limit
+        POSTCONDITION:  A new best route is calculated where the bird lives. With a budget, the route may be shorter
+                            than the depth limit but has at least one node after the root unless the bird can't survive.
+        """
+        self.searches += 1
+        start = time.perf_counter()
+        deadline = None if self.budget is None else start + self.budget / 1000
+        nodes_expanded = self.nodes_expanded
+        self.node_limit = None if self.node_budget is None else nodes_expanded + self.node_budget
+        backtracks = self.backtracks
+        climbs = self.climbs
+        self.max_climb = 0
+
+        if self.adaptive:
+            self.set_depth_limit(get_adaptive_depth(self.root.game_state, self.search_cost))
+        if const.TREE_FINE_DEPTH is not None and len(self.path) > 0:
+            self._refine()
+        if len(self.path) > 0 and self._depth() < self.depth_limit:
+            self.strategy.search(self, deadline)
+        # Each expanded node adds at most two children
+        self.live_bound += 2 * (self.nodes_expanded - nodes_expanded)
+        evictions = self.evictions
+        if self.max_nodes is not None and self.live_bound > self.max_nodes and len(self.path) > 0:
+            self._evict()
+        weight = const.TREE_DEPTH_COST_WEIGHT
+        self.search_cost += weight * ((time.perf_counter() - start) * 1000 - self.search_cost)
+
+        # Every state on the path survives until the end of the path. The nodes up to the last recorded tail were
+        #   recorded by an earlier search, so only the nodes added after it are, which is usually just the new tail
+        if self.transposition is not None and len(self.path) > 0:
+            for node in reversed(self.path):
+                if node is self.recorded:
+                    break
+                self.transposition.record_survivable(node.game_state, self.tail.frame - node.frame)
+            self.recorded = self.tail
+
+        if self.telemetry is not None:
+            self.telemetry.frame.update({
+                'frame': self.root.frame,
+                'search_ms': (time.perf_counter() - start) * 1000,
+                'nodes': self.nodes_expanded - nodes_expanded,
+                'backtracks': self.backtracks - backtracks,
+                'climbs': self.climbs - climbs,
+                'max_climb': self.max_climb,
+                'path_frames': self._depth() if len(self.path) > 0 else 0,
+                'score': self.tail.get_score() if len(self.path) > 0 else None,
+                'depth_limit': self.depth_limit,
+                'evicted': self.evictions - evictions,
+            })
+
+    def _out_of_budget(self, deadline: float) -> bool:
+        """
+        NAME:           Tree._out_of_budget
+        PARAMETERS:     deadline: the time.perf_counter time to stop searching by, None for no limit
+        PURPOSE:        This method checks if the current search should stop, either because it expanded node_budget
+                            nodes or because the deadline passed.
+        PRECONDITION:   Called by a strategy during Tree.search
+        POSTCONDITION:  True is returned when the search is out of nodes or time.
+        """
+        if self.node_limit is not None and self.nodes_expanded >= self.node_limit:
+            return True
+        return deadline is not None and time.perf_counter() > deadline
+
+    def _follow_actions(self, actions: list[bool]) -> None:
+        """
+        NAME:           Tree._follow_actions
+        PARAMETERS:     actions: whether the bird jumps on each frame after the root
+        PURPOSE:        This method makes the path the nodes the actions lead to from the root, so a path found
+                            outside of the tree, such as by Beam in arrays, can be played. Nodes that exist are
+                            reused and missing ones are simulated one frame at a time. A node that covers several
+                            frames is followed when the actions jump on at most its first frame, the same as it does.
+        PRECONDITION:   actions were found from the root's game state.
+        POSTCONDITION:  The path goes from the root as far along the actions as the nodes do, the bird survives
+                            every node of it.
+        """
+        node = self.root
+        path = [node]
+        index = 0
+        while index < len(actions):
+            if not node.populated:
+                self.nodes_expanded += 1
+                node.populated = True
+                left_state = node.game_state.clone()
+                left_state.do_update()
+                right_state = node.game_state.clone()
+                right_state.bird.jump()
+                right_state.do_update()
+                node._set_children(left_state, right_state)
+
+            child = node.right_node if actions[index] else node.left_node
+            if child is None or index + child.frames > len(actions) or any(actions[index + 1:index + child.frames]):
+                break
+            path.append(child)
+            node = child
+            index += child.frames
+
+        self.path = path
+        self.tail = node
+
+    def proceed(self) -> "GameState":
+        """
+        NAME:           Tree.proceed
+        PARAMETERS:     none
+        PURPOSE:        This method advances the root of the tree to the next best node, then removes the new root
+                            from its parent to disintegrate references of the old root and its branches.
+                            The path has the first element removed.
+                            The game state of the new root is then returned.
+                        A new root that waits several frames is split so only one frame is played.
+        PRECONDITION:   The root node is not the tail node, and the length of path is at least 2
+        POSTCONDITION:  The game state of the new root is returned
+        """
+        if self.path[1].frames > 1:
+            self._split(self.path[1])
+
+        new_root = self.path[1]
+        self.path.pop(0)
+        self.root.remove_child(new_root)
+        self.root.disintegrate()
+        self.root = new_root
+        new_root.parent = None
+
+        if self.telemetry is not None:
+            live = self._count_live()
+            self.telemetry.frame.update({
+                'live_nodes': live,
+                'live_bytes': live * self.node_bytes,
+                'peak_bytes': self.peak_nodes * self.node_bytes,
+            })
+        return self.root.game_state
+
+    def live_nodes(self, node: TreeNode = None) -> int:
+        """
+        NAME:           Tree.live_nodes
+        PARAMETERS:     node: the node to count from, the root when None
+        PURPOSE:        This method counts the nodes in the tree by walking it from the root, so it is only used when
+                            recording telemetry or when the tree might be over its memory limit.
+        PRECONDITION:   node is the root or one of its descendants
+        POSTCONDITION:  The number of nodes reachable from the node, counting itself, is returned
+        """
+        count = 0
+        stack = [self.root if node is None else node]
+        while len(stack) > 0:
+            node = stack.pop()
+            count += 1
+            if node.left_node is not None:
+                stack.append(node.left_node)
+            if node.right_node is not None:
+                stack.append(node.right_node)
+        return count
+
+    def _count_live(self) -> int:
+        """
+        NAME:           Tree._count_live
+        PARAMETERS:     none
+        PURPOSE:        This method counts the nodes in the tree and keeps the highest count seen.
+        PRECONDITION:   none
+        POSTCONDITION:  The number of live nodes is returned, live_bound is exact and peak_nodes is updated
+        """
+        live = self.live_nodes()
+        self.live_bound = live
+        self.peak_nodes = max(self.peak_nodes, live)
+        return live
+
+    def _evict(self) -> None:
+        """
+        NAME:           Tree._evict
+        PARAMETERS:     none
+        PURPOSE:        This method keeps the tree within max_nodes by forgetting the subtrees of the branches off the
+                            path, starting with the lowest scoring. Each evicted branch keeps its first node,
+                            unpopulated, so the search can simulate it again if the path dies and it is needed. The
+                            path, the first node of every branch off it, and the nodes below the tail are never
+                            evicted, so a limit below about twice the depth limit can't always be met.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The tree has at most max_nodes nodes, or every branch off the path has been evicted
+        """
+        live = self._count_live()
+        if live <= self.max_nodes:
+            return
+
+        branches = list()
+        for parent, node in zip(self.path, self.path[1:]):
+            other = parent.left_node if node is parent.right_node else parent.right_node
+            if other is not None and other.populated:
+                branches.append(other)
+        branches.sort(key=lambda branch: branch.get_score())
+
+        for branch in branches:
+            if live <= self.max_nodes:
+                break
+            live -= self.live_nodes(branch) - 1
+            branch.disintegrate()
+            branch.populated = False
+            self.evictions += 1
+        self.live_bound = live
+
+    def _split(self, node: TreeNode) -> None:
+        """
+        NAME:           Tree._split
+        PARAMETERS:     node: a node on the path which covers more than one frame
+        PURPOSE:        This method simulates the first frame of the node as its own node between its parent and
+                            node, with the same action. The rest of node's frames don't jump, so node becomes the no
+                            jump future of the new node, and the new node can still jump instead. Used for nodes that
+                            wait several frames and coarse nodes, so their middle frames don't lose that option.
+        PRECONDITION:   node is on the path after the root and node.frames is more than 1
+        POSTCONDITION:  The path goes through the new one frame node, and node covers one frame less
+        """
+        parent = node.parent
+        jumps = node is parent.right_node
+        first_state = parent.game_state.clone()
+        if jumps:
+            first_state.bird.jump()
+        first_state.do_update()
+        first = TreeNode(parent, first_state)
+
+        jump_state = first_state.clone()
+        jump_state.bird.jump()
+        jump_state.do_update()
+        self.live_bound += 2
+
+        # The rest of the node is kept as the no jump future of the first frame
+        first.populated = True
+        first._set_children(None, jump_state)
+        first.left_node = node
+        node.parent = first
+        node.frames -= 1
+        node.coarse = node.coarse and node.frames > 1
+
+        if jumps:
+            parent.right_node = first
+        else:
+            parent.left_node = first
+        self.path.insert(self.path.index(node), first)
+
+    def get_path_states(self) -> list["GameState"]:
+        """
+        NAME:           Tree.get_path_states
+        PARAMETERS:     none
+        PURPOSE:        This method returns the game states along the current best path.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of game states from the root to the tail is returned
+        """
+        return [node.game_state for node in self.path]
+
+    def get_path_frames(self) -> list[int]:
+        """
+        NAME:           Tree.get_path_frames
+        PARAMETERS:     none
+        PURPOSE:        This method returns how many frames ahead of the root each state on the path is.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of frame offsets matching get_path_states is returned
+        """
+        return [node.frame - self.root.frame for node in self.path]
+
+    def next_action(self) -> bool:
+        """
+        NAME:           Tree.next_action
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action the next call to proceed plays, so it can be recorded.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  True is returned if the bird jumps on the next frame, False if it doesn't
+        """
+        return self.path[1] is self.root.right_node
+
+    def get_path_actions(self) -> list[bool]:
+        """
+        NAME:           Tree.get_path_actions
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action of each frame along the current best path, a node that waits
+                            several frames adds a no jump action for each of them, and a coarse node that jumps adds
+                            the jump followed by a no jump action for each of its other frames.
+        PRECONDITION:   none
+        POSTCONDITION:  A list with True for each frame the bird jumps and False for each frame it doesn't is returned
+        """
+        actions = list()
+        for parent, node in zip(self.path, self.path[1:]):
+            if node is parent.right_node:
+                actions.append(True)
+                actions.extend([False] * (node.frames - 1))
+            else:
+                actions.extend([False] * node.frames)
+        return actions
+
+
+# Index used by ArenaTree for a missing node
+NO_NODE = -1
+
+
+class ArenaTree:
+    """
+    NAME:           ArenaTree
+    PURPOSE:        A search tree with the same behavior as Tree, but its nodes are stored in preallocated lists and
+                    referenced by index instead of being separate TreeNode instances. Removed nodes are put on a free
+                    list and reused by later frames, and their game states are kept as spares which new nodes are
+                    copied into with GameState.copy_into, so after the first frames expanding a node allocates no
+                    objects. Climbing, pruning, and advancing the root are done with loops instead of recursion,
+                    and the path is a deque, so the cost of a frame doesn't depend on how deep the tree is.
+    INVARIANTS:     root is the index of the current game state and is never NO_NODE
+                    tail is the index of the last node in path
+                    path is a list of indexes from the root to the tail
+                    every index is either in use by the tree or in free, never both
+                    a game state is either the state of a node or in spares, never both, and the root states returned
+                        by proceed are in neither
+                    depth_limit is how far deep the search can go before exiting
+    """
+    # Node fields, the node at index i is made up of the value at index i of each list
+    states: list["GameState"]
+    parents: list[int]
+    left_nodes: list[int]
+    right_nodes: list[int]
+    populated: list[bool]
+
+    # Indexes which are not in use and can be given to new nodes
+    free: list[int]
+    # Game states of removed nodes, overwritten for new nodes instead of cloning
+    spares: list["GameState"]
+
+    # The root node index
+    root: int
+    # The ending node index
+    tail: int
+    # Ordered node indexes from the root node to the best ending node, the root is popped from the left
+    path: deque[int]
+    # The max depth of the search tree (frame lookahead)
+    depth_limit: int
+    # Max wall time of each search in milliseconds, None for no limit
+    budget: float
+    # How many searches have run, and how many of them ran out of time
+    searches: int
+    budget_hits: int
+    # How many nodes have had their children simulated
+    nodes_expanded: int
+    # How many times the search climbed back up after a dead end, and how many nodes it climbed in total
+    backtracks: int
+    climbs: int
+    # Where each frame's search statistics are recorded, None when disabled
+    telemetry: Telemetry
+
+    def __init__(self, game_state: "GameState", capacity: int = const.TREE_ARENA_SIZE,
+                 delta: float = None, depth_limit: int = None, telemetry: Telemetry = None) -> None:
+        """
+        NAME:           ArenaTree.__init__
+        PARAMETERS:     game_state: the base game state to start this tree from, and to represent the root node with
+                        capacity: how many nodes to allocate space for before the tree has to grow
+                        delta: the time of each simulated frame, const.TREE_DELTA when None
+                        depth_limit: how many frames to look ahead, const.TREE_DEPTH when None
+                        telemetry: where to record each frame's search statistics, None to not record them
+        PURPOSE:        This method initializes fields for a new ArenaTree instance.
+        PRECONDITION:   game_state is not None and capacity is greater than zero
+        POSTCONDITION:  This instance's fields are initialized and the root node uses the first index.
+        """
+        self.states = list()
+        self.parents = list()
+        self.left_nodes = list()
+        self.right_nodes = list()
+        self.populated = list()
+        self.free = list()
+        self.spares = list()
+        self._grow(capacity)
+
+        # Override the frame time delta to our simulation speed, same as Tree
+        game_state.delta = const.TREE_DELTA if delta is None else delta
+        self.root = self._new_node(NO_NODE, game_state)
+        self.tail = self.root
+        self.path = deque([self.root])
+        self.depth_limit = const.TREE_DEPTH if depth_limit is None else depth_limit
+
+        self.budget = const.TREE_BUDGET_MS
+        self.searches = 0
+        self.budget_hits = 0
+        self.nodes_expanded = 0
+        self.backtracks = 0
+        self.climbs = 0
+        self.telemetry = telemetry
+
+    def _grow(self, amount: int) -> None:
+        """
+        NAME:           ArenaTree._grow
+        PARAMETERS:     amount: how many nodes to add space for
+        PURPOSE:        This method extends every node list and adds the new indexes to the free list.
+        PRECONDITION:   amount is greater than zero
+        POSTCONDITION:  There are at least amount free indexes.
+        """
+        start = len(self.states)
+        self.states.extend([None] * amount)
+        self.parents.extend([NO_NODE] * amount)
+        self.left_nodes.extend([NO_NODE] * amount)
+        self.right_nodes.extend([NO_NODE] * amount)
+        self.populated.extend([False] * amount)
+        # Reversed so the lowest indexes are handed out first
+        self.free.extend(range(start + amount - 1, start - 1, -1))
+
+    def _new_node(self, parent: int, game_state: "GameState") -> int:
+        """
+        NAME:           ArenaTree._new_node
+        PARAMETERS:     parent: the index of the parent node, NO_NODE for the root
+                        game_state: the state the new node represents
+        PURPOSE:        This method takes an index from the free list and sets it up as a new unpopulated node.
+                            The lists double in size when there are no free indexes.
+        PRECONDITION:   game_state is not None
+        POSTCONDITION:  The index of the new node is returned.
+        """
+        if len(self.free) == 0:
+            self._grow(len(self.states))
+
+        index = self.free.pop()
+        self.states[index] = game_state
+        self.parents[index] = parent
+        self.left_nodes[index] = NO_NODE
+        self.right_nodes[index] = NO_NODE
+        self.populated[index] = False
+        return index
+
+    def _release(self, index: int) -> None:
+        """
+        NAME:           ArenaTree._release
+        PARAMETERS:     index: the node at the top of the subtree to remove
+        PURPOSE:        This method returns a node and every node below it to the free list, and keeps their game
+                            states as spares.
+        PRECONDITION:   The node has already been removed from its parent.
+        POSTCONDITION:  Every index of the subtree is free and no longer references its game state.
+        """
+        stack = [index]
+        while len(stack) > 0:
+            node = stack.pop()
+            if self.left_nodes[node] != NO_NODE:
+                stack.append(self.left_nodes[node])
+            if self.right_nodes[node] != NO_NODE:
+                stack.append(self.right_nodes[node])
+            # The states of old roots were handed out by proceed and are not reused
+            if self.states[node] is not None:
+                self.spares.append(self.states[node])
+                self.states[node] = None
+            self.free.append(node)
+
+    def _remove_child(self, parent: int, child: int) -> None:
+        """
+        NAME:           ArenaTree._remove_child
+        PARAMETERS:     parent: the node to remove the child from
+                        child: the left or right node of the parent
+        PURPOSE:        This method unlinks the child from its parent without freeing it.
+        PRECONDITION:   The child is the left or right node of the parent.
+        POSTCONDITION:  The parent no longer links to the child.
+        """
+        if self.left_nodes[parent] == child:
+            self.left_nodes[parent] = NO_NODE
+        elif self.right_nodes[parent] == child:
+            self.right_nodes[parent] = NO_NODE
+        else:
+            raise Exception("Neither child matched!")
+
+    def _is_terminal(self, index: int) -> bool:
+        """
+        NAME:           ArenaTree._is_terminal
+        PARAMETERS:     index: the node to check
+        PURPOSE:        This method determines if the node has no good branches, same as TreeNode.is_terminal.
+        PRECONDITION:   index is in use
+        POSTCONDITION:  True is returned if the node can be explored no further, False otherwise
+        """
+        return self.left_nodes[index] == NO_NODE and self.right_nodes[index] == NO_NODE
+
+    def _copy_state(self, game_state: "GameState") -> "GameState":
+        """
+        NAME:           ArenaTree._copy_state
+        PARAMETERS:     game_state: the state to copy
+        PURPOSE:        This method overwrites a spare game state with game_state, or clones it when there are no
+                            spares left.
+        PRECONDITION:   game_state belongs to this tree
+        POSTCONDITION:  A game state which can be updated without changing game_state is returned.
+        """
+        if len(self.spares) == 0:
+            return game_state.clone()
+        spare = self.spares.pop()
+        game_state.copy_into(spare)
+        return spare
+
+    def _populate_children(self, index: int) -> None:
+        """
+        NAME:           ArenaTree._populate_children
+        PARAMETERS:     index: the node to populate
+        PURPOSE:        This method simulates the no jump and jump futures of the node, same as
+                            TreeNode._populate_children.
+        PRECONDITION:   The node has not been populated before
+        POSTCONDITION:  The node is populated and links to the futures where the bird survives, the states of the
+                            futures where it dies are kept as spares
+        """
+        self.populated[index] = True
+        self.nodes_expanded += 1
+        game_state = self.states[index]
+
+        left_state = self._copy_state(game_state)
+        right_state = self._copy_state(game_state)
+        right_state.bird.jump()
+        left_state.do_update()
+        right_state.do_update()
+
+        if not left_state.bird.dead:
+            self.left_nodes[index] = self._new_node(index, left_state)
+        else:
+            self.spares.append(left_state)
+        if not right_state.bird.dead:
+            self.right_nodes[index] = self._new_node(index, right_state)
+        else:
+            self.spares.append(right_state)
+
+    def _get_best_child(self, index: int) -> int:
+        """
+        NAME:           ArenaTree._get_best_child
+        PARAMETERS:     index: the node to pick a child of
+        PURPOSE:        This method returns the child with the best score, same as TreeNode.get_best_child.
+        PRECONDITION:   index is in use
+        POSTCONDITION:  The node is populated and the index of the best child is returned, NO_NODE if there is none
+        """
+        if not self.populated[index]:
+            self._populate_children(index)
+
+        left = self.left_nodes[index]
+        right = self.right_nodes[index]
+        if left != NO_NODE and right != NO_NODE:
+            left_better = get_state_score(self.states[left]) > get_state_score(self.states[right])
+            return left if left_better else right
+        return left if left != NO_NODE else right
+
+    def _climb(self) -> None:
+        """
+        NAME:           ArenaTree._climb
+        PARAMETERS:     none
+        PURPOSE:        This method frees terminal nodes from the tail upwards until the tail has an unexplored branch.
+        PRECONDITION:   The tail is terminal.
+        POSTCONDITION:  The tail is the lowest node on the path that is not terminal,
+                            the path is empty if every node including the root is terminal
+        """
+        while self._is_terminal(self.tail):
+            parent = self.parents[self.tail]
+            if parent == NO_NODE:
+                # The root is terminal, there is no path where the bird survives
+                self.path.clear()
+                return
+
+            self._remove_child(parent, self.tail)
+            self._release(self.tail)
+            self.path.pop()
+            self.tail = parent
+
+    def search(self) -> None:
+        """
+        NAME:           ArenaTree.search
+        PARAMETERS:     none
+        PURPOSE:        This method searches down from the tail until the maximum depth is reached, climbing back up
+                            when the bird dies, same as Tree.search. The budget is also handled the same way.
+        PRECONDITION:   The current depth of the tree is not at the depth limit
+        POSTCONDITION:  A new best route is calculated where the bird lives, or the path is empty if there is none.
+        """
+        self.searches += 1
+        start = time.perf_counter()
+        deadline = None if self.budget is None else start + self.budget / 1000
+        nodes_expanded = self.nodes_expanded
+        backtracks = self.backtracks
+        climbs = self.climbs
+        max_climb = 0
+
+        while 0 < len(self.path) < self.depth_limit:
+            if deadline is not None and len(self.path) > 1 and time.perf_counter() > deadline:
+                self.budget_hits += 1
+                break
+
+            next_node = self._get_best_child(self.tail)
+            if next_node != NO_NODE:
+                self.path.append(next_node)
+                self.tail = next_node
+            else:
+                height = len(self.path)
+                self._climb()
+                height -= len(self.path)
+                self.backtracks += 1
+                self.climbs += height
+                max_climb = max(max_climb, height)
+
+        if self.telemetry is not None:
+            self.telemetry.frame.update({
+                'frame': self.searches - 1,
+                'search_ms': (time.perf_counter() - start) * 1000,
+                'nodes': self.nodes_expanded - nodes_expanded,
+                'backtracks': self.backtracks - backtracks,
+                'climbs': self.climbs - climbs,
+                'max_climb': max_climb,
+                'path_frames': len(self.path),
+                'score': get_state_score(self.states[self.tail]) if len(self.path) > 0 else None,
+            })
+
+    def proceed(self) -> "GameState":
+        """
+        NAME:           ArenaTree.proceed
+        PARAMETERS:     none
+        PURPOSE:        This method advances the root to the next node on the path and frees the old root along with
+                            every branch that was not taken. The state of the old root was returned by the last
+                            call and may still be drawn or recorded, so it is dropped instead of kept as a spare.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  The game state of the new root is returned
+        """
+        new_root = self.path[1]
+        self.path.popleft()
+        self._remove_child(self.root, new_root)
+        self.states[self.root] = None
+        self._release(self.root)
+        self.root = new_root
+        self.parents[new_root] = NO_NODE
+
+        if self.telemetry is not None:
+            self.telemetry.frame['live_nodes'] = len(self.states) - len(self.free)
+        return self.states[new_root]
+
+    def get_path_states(self) -> list["GameState"]:
+        """
+        NAME:           ArenaTree.get_path_states
+        PARAMETERS:     none
+        PURPOSE:        This method returns the game states along the current best path.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of game states from the root to the tail is returned
+        """
+        return [self.states[index] for index in self.path]
+
+    def get_path_frames(self) -> list[int]:
+        """
+        NAME:           ArenaTree.get_path_frames
+        PARAMETERS:     none
+        PURPOSE:        This method returns how many frames ahead of the root each state on the path is.
+                            Every node of this tree is one frame, so this is the index of each node.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of frame offsets matching get_path_states is returned
+        """
+        return list(range(len(self.path)))
+
+    def next_action(self) -> bool:
+        """
+        NAME:           ArenaTree.next_action
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action the next call to proceed plays, so it can be recorded.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  True is returned if the bird jumps on the next frame, False if it doesn't
+        """
+        return self.right_nodes[self.root] == self.path[1]
+
+    def get_path_actions(self) -> list[bool]:
+        """
+        NAME:           ArenaTree.get_path_actions
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action of each frame along the current best path.
+        PRECONDITION:   none
+        POSTCONDITION:  A list with True for each frame the bird jumps and False for each frame it doesn't is returned
+        """
+        children = itertools.islice(self.path, 1, None)
+        return [self.right_nodes[parent] == node for parent, node in zip(self.path, children)]
+
+
+def search_subtree(job: tuple["GameState", list[bool], int, int]) -> tuple[list[bool], int, float, int]:
+    """
+    NAME:           search_subtree
+    PARAMETERS:     job, a tuple of the game state after an action prefix, the prefix, the depth to search to, and
+                    the most nodes the search may expand, None for no limit
+    PURPOSE:        This function is the work of one ParallelTree process. It searches the subtree below the prefix
+                    with a regular Tree and sends back only the actions of the path it found, which are much smaller
+                    than the game states along it. A prefix that leads into a pipe can only be ruled out by searching
+                    every path below it, the node budget stops that search with the partial path found so far.
+                    Counting nodes instead of time keeps seeded games the same on every run and machine.
+    PRECONDITION:   The bird of the game state is not dead.
+    POSTCONDITION:  A tuple of the prefix followed by the actions of the path, how many frames the path reaches,
+                    the score at its end, and the nodes expanded is returned. The actions are None when every path
+                    dies.
+    """
+    game_state, prefix, depth_limit, node_budget = job
+    tree = Tree(game_state, delta=game_state.delta, depth_limit=depth_limit)
+    tree.node_budget = node_budget
+    tree.search()
+    if len(tree.path) == 0:
+        return None, 0, 0.0, tree.nodes_expanded
+    return prefix + tree.get_path_actions(), len(prefix) + tree._depth(), tree.tail.get_score(), tree.nodes_expanded
+
+
+class ParallelTree:
+    """
+    NAME:           ParallelTree
+    PURPOSE:        A search that keeps a planned list of actions and the game states they lead to. Every frame each
+                    2^prefix_depth action prefix of the root is searched to the depth limit at once, one Tree per
+                    prefix, across a process pool. The longest and then best scoring path is kept, its first action
+                    is the one committed, and its actions are simulated again from the root to rebuild the plan. The
+                    gap schedule makes this simulation the same as the one in the worker.
+                    With every_frame off the pool is only a fallback for dead ends: the plan is extended by one frame
+                    with the better scoring action, which is as cheap as a Tree search that doesn't need to
+                    backtrack, and the prefixes are only searched when neither action survives.
+    INVARIANTS:     path holds the game state of the root followed by one state for every action in actions.
+                    path is empty when no path survives.
+                    depth_limit is how far ahead the plan looks, counting the root.
+    """
+    # The game states of the plan, starting with the current game state
+    path: list["GameState"]
+    # Whether the bird jumps on each frame of the plan
+    actions: list[bool]
+    # The max depth of the plan (frame lookahead)
+    depth_limit: int
+    # How many frames of actions each process is given as its prefix
+    prefix_depth: int
+    # If every prefix is searched on every frame, instead of only when the plan can't be extended
+    every_frame: bool
+    # The processes searching the prefixes
+    pool: multiprocessing.Pool
+    # Same statistics as Tree, budget is never used
+    budget: float
+    searches: int
+    budget_hits: int
+    nodes_expanded: int
+    # How many times every prefix had to be searched
+    parallel_searches: int
+    telemetry: Telemetry
+
+    def __init__(self, game_state: "GameState", delta: float = None, depth_limit: int = None,
+                 telemetry: Telemetry = None, prefix_depth: int = None, workers: int = None,
+                 every_frame: bool = None) -> None:
+        """
+        NAME:           ParallelTree.__init__
+        PARAMETERS:     game_state: the base game state to start the plan from
+                        delta: the time of each simulated frame, const.TREE_DELTA when None
+                        depth_limit: how many frames to look ahead, const.TREE_DEPTH when None
+                        telemetry: where to record each frame's search statistics, None to not record them
+                        prefix_depth: how many frames of actions to split the search on,
+                            const.TREE_PARALLEL_PREFIX when None
+                        workers: how many processes to search with, const.TREE_PARALLEL_WORKERS when None
+                        every_frame: if the prefixes are searched on every frame, const.TREE_PARALLEL_EVERY_FRAME
+                            when None
+        PURPOSE:        This method initializes fields for a new ParallelTree instance and starts its processes.
+        PRECONDITION:   game_state is not None
+        POSTCONDITION:  The plan only holds game_state, and the process pool is running.
+        """
+        game_state.delta = const.TREE_DELTA if delta is None else delta
+        self.path = [game_state]
+        self.actions = list()
+        self.depth_limit = const.TREE_DEPTH if depth_limit is None else depth_limit
+        self.prefix_depth = const.TREE_PARALLEL_PREFIX if prefix_depth is None else prefix_depth
+        self.every_frame = const.TREE_PARALLEL_EVERY_FRAME if every_frame is None else every_frame
+        self.pool = multiprocessing.Pool(const.TREE_PARALLEL_WORKERS if workers is None else workers)
+
+        self.budget = None
+        self.searches = 0
+        self.budget_hits = 0
+        self.nodes_expanded = 0
+        self.parallel_searches = 0
+        self.telemetry = telemetry
+
+    def _extend(self) -> bool:
+        """
+        NAME:           ParallelTree._extend
+        PARAMETERS:     none
+        PURPOSE:        This method adds one frame to the end of the plan, choosing the action the same way
+                            TreeNode.get_best_child does.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  True is returned if the plan was extended, False if the bird dies with either action
+        """
+        self.nodes_expanded += 1
+        left_state = self.path[-1].clone()
+        left_state.do_update()
+        right_state = self.path[-1].clone()
+        right_state.bird.jump()
+        right_state.do_update()
+
+        if left_state.bird.dead and right_state.bird.dead:
+            return False
+        if right_state.bird.dead or \
+                (not left_state.bird.dead and get_state_score(left_state) > get_state_score(right_state)):
+            self.path.append(left_state)
+            self.actions.append(False)
+        else:
+            self.path.append(right_state)
+            self.actions.append(True)
+        return True
+
+    def _search_prefixes(self) -> None:
+        """
+        NAME:           ParallelTree._search_prefixes
+        PARAMETERS:     none
+        PURPOSE:        This method replaces the plan with the best path found by searching every action prefix of
+                            the root in parallel.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The plan is the longest surviving path, the path is empty if every prefix dies
+        """
+        self.parallel_searches += 1
+        root = self.path[0]
+
+        # Simulate the prefixes here, they are short and the workers only need the states at their ends
+        prefixes = [([], root)]
+        for _ in range(self.prefix_depth):
+            next_prefixes = list()
+            for actions, game_state in prefixes:
+                for jump in (False, True):
+                    child = game_state.clone()
+                    if jump:
+                        child.bird.jump()
+                    child.do_update()
+                    if not child.bird.dead:
+                        next_prefixes.append((actions + [jump], child))
+            self.nodes_expanded += len(prefixes)
+            prefixes = next_prefixes
+
+        remaining = self.depth_limit - self.prefix_depth
+        jobs = [(game_state, actions, remaining, const.TREE_PARALLEL_MAX_NODES) for actions, game_state in prefixes]
+        best = None
+        for actions, frames, score, nodes in self.pool.map(search_subtree, jobs):
+            self.nodes_expanded += nodes
+            if actions is not None and (best is None or (frames, score) > best[1:]):
+                best = actions, frames, score
+
+        self.path = list() if best is None else [root]
+        self.actions = list()
+        if best is not None:
+            for jump in best[0]:
+                child = self.path[-1].clone()
+                if jump:
+                    child.bird.jump()
+                child.do_update()
+                self.path.append(child)
+                self.actions.append(jump)
+
+    def search(self) -> None:
+        """
+        NAME:           ParallelTree.search
+        PARAMETERS:     none
+        PURPOSE:        This method searches every prefix again, or with every_frame off, extends the plan to the
+                            depth limit and only searches every prefix again when it can't.
+        PRECONDITION:   The path is not empty
+        POSTCONDITION:  The plan reaches the depth limit or is as long as the best path found,
+                            the path is empty if the bird can't survive
+        """
+        self.searches += 1
+        start = time.perf_counter()
+        nodes_expanded = self.nodes_expanded
+
+        if self.every_frame:
+            self._search_prefixes()
+        else:
+            while 0 < len(self.path) < self.depth_limit:
+                if not self._extend():
+                    self._search_prefixes()
+                    break
+
+        if self.telemetry is not None:
+            self.telemetry.frame.update({
+                'frame': self.searches - 1,
+                'search_ms': (time.perf_counter() - start) * 1000,
+                'nodes': self.nodes_expanded - nodes_expanded,
+                'path_frames': len(self.path),
+                'score': get_state_score(self.path[-1]) if len(self.path) > 0 else None,
+            })
+
+    def proceed(self) -> "GameState":
+        """
+        NAME:           ParallelTree.proceed
+        PARAMETERS:     none
+        PURPOSE:        This method commits the first action of the plan.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  The game state after the first action is returned and is the new root of the plan
+        """
+        self.path.pop(0)
+        self.actions.pop(0)
+        return self.path[0]
+
+    def get_path_states(self) -> list["GameState"]:
+        """
+        NAME:           ParallelTree.get_path_states
+        PARAMETERS:     none
+        PURPOSE:        This method returns the game states along the plan.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of game states from the root to the end of the plan is returned
+        """
+        return list(self.path)
+
+    def get_path_frames(self) -> list[int]:
+        """
+        NAME:           ParallelTree.get_path_frames
+        PARAMETERS:     none
+        PURPOSE:        This method returns how many frames ahead of the root each state of the plan is.
+        PRECONDITION:   none
+        POSTCONDITION:  A list of frame offsets matching get_path_states is returned
+        """
+        return list(range(len(self.path)))
+
+    def next_action(self) -> bool:
+        """
+        NAME:           ParallelTree.next_action
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action the next call to proceed plays, so it can be recorded.
+        PRECONDITION:   The length of path is at least 2
+        POSTCONDITION:  True is returned if the bird jumps on the next frame, False if it doesn't
+        """
+        return self.actions[0]
+
+    def get_path_actions(self) -> list[bool]:
+        """
+        NAME:           ParallelTree.get_path_actions
+        PARAMETERS:     none
+        PURPOSE:        This method returns the action of each frame of the plan.
+        PRECONDITION:   none
+        POSTCONDITION:  A list with True for each frame the bird jumps and False for each frame it doesn't is returned
+        """
+        return list(self.actions)
+
+    def close(self) -> None:
+        """
+        NAME:           ParallelTree.close
+        PARAMETERS:     none
+        PURPOSE:        This method stops the processes of the pool.
+        PRECONDITION:   none
+        POSTCONDITION:  The pool is shut down and search can no longer search prefixes
+        """
+        self.pool.terminate()
+        self.pool.join()
+
+
+# ###################################
+# ###################################
+# ########### Search Tree ###########
+# ##############[ End ]##############
+# ###################################
+
+# Driving game logic
+# The trees create_tree can create, by the name used in const.TREE_BACKEND
+BACKENDS = ('object', 'arena', 'parallel', 'policy', 'neural')
+
+
+def create_tree(game_state: GameState, delta: float = None, depth_limit: int = None, telemetry: Telemetry = None,
+                strategy: str = None,
+                backend: str = None) -> "Tree | ArenaTree | ParallelTree | PolicyTree | NeuralController":
+    """
+    NAME:           create_tree
+    PARAMETERS:     game_state, the state to start the search from
+                    delta, the time of each simulated frame, const.TREE_DELTA when None
+                    depth_limit, how many frames to look ahead, const.TREE_DEPTH when None
+                    telemetry, where the tree records each frame's search statistics, None to not record them
+                    strategy, the name of the strategy a Tree searches with, const.TREE_STRATEGY when None
+                    backend, the kind of tree to create, const.TREE_BACKEND when None
+    PURPOSE:        This function creates the search tree selected by backend.
+    PRECONDITION:   game_state is a new game.
+    POSTCONDITION:  A Tree, ArenaTree, ParallelTree, PolicyTree, or NeuralController rooted at game_state is
+                    returned.
+    """
+    if backend is None:
+        backend = const.TREE_BACKEND
+    if backend == 'arena':
+        return ArenaTree(game_state, delta=delta, depth_limit=depth_limit, telemetry=telemetry)
+    if backend == 'parallel':
+        return ParallelTree(game_state, delta=delta, depth_limit=depth_limit, telemetry=telemetry)
+    if backend == 'policy':
+        # policy.py builds its table with Tree, so it is imported here instead of at the top
+        from policy import PolicyTree
+        return PolicyTree(game_state, delta=delta, depth_limit=depth_limit, telemetry=telemetry)
+    if backend == 'neural':
+        from evolve import NeuralController
+        return NeuralController(game_state, delta=delta, depth_limit=depth_limit, telemetry=telemetry)
+
+    # Allow deeper recursions, fix would be to limit the depth in each search call on each frame
+    sys.setrecursionlimit(1000000)
+    return Tree(game_state, delta=delta, depth_limit=depth_limit, telemetry=telemetry,
+                strategy=STRATEGIES[strategy]() if strategy is not None else None)
+
+
+def run_headless(frames: int = None, seed: int = None, delta: float = None, depth_limit: int = None,
+                 telemetry: Telemetry = None, strategy: str = None, record: str = None,
+                 backend: str = None) -> tuple[int, int, int, float]:
+    """
+    NAME:           run_headless
+    PARAMETERS:     frames, the max number of frames to play, None to play until the bird dies
+                    seed, the seed of the pipe gaps, a random seed is used when None
+                    delta, depth_limit, telemetry, strategy, and backend, the search settings passed to create_tree
+                    record, the file to save a replay of the game to, None to not record it
+    PURPOSE:        This function plays a game with the search tree as fast as possible, without a window and
+                    without sleeping between frames.
+    PRECONDITION:   None, no display is needed.
+    POSTCONDITION:  A tuple of the frames survived, the pipes passed, the number of tree nodes expanded, and the
+                    wall time in seconds is returned.
+    """
+    game_state = GameState(False, seed)
+    tree = create_tree(game_state, delta, depth_limit, telemetry, strategy, backend)
+    recording = Recording(game_state) if record is not None else None
+
+    start = time.perf_counter()
+    played = 0
+    try:
+        while frames is None or played < frames:
+            tree.search()
+            if len(tree.path) == 0:
+                if telemetry is not None:
+                    telemetry.end_frame()
+                if recording is not None:
+                    recording.died = True
+                break
+            jump = tree.next_action() if recording is not None else False
+            game_state = tree.proceed()
+            played += 1
+            if recording is not None:
+                recording.add(jump, game_state)
+            if telemetry is not None:
+                telemetry.end_frame()
+    finally:
+        close_tree(tree)
+    if recording is not None:
+        recording.save(record)
+    return played, game_state.pipes_passed, tree.nodes_expanded, time.perf_counter() - start
+
+
+def close_tree(tree: "Tree | ArenaTree | ParallelTree | PolicyTree | NeuralController") -> None:
+    """
+    NAME:           close_tree
+    PARAMETERS:     tree, a tree made by create_tree
+    PURPOSE:        This function stops the processes of a ParallelTree, the other trees have nothing to stop.
+    PRECONDITION:   None
+    POSTCONDITION:  No processes of the tree are running.
+    """
+    if isinstance(tree, ParallelTree):
+        tree.close()
+
+
+def advance_frame(tree: "Tree | ArenaTree", previews: bool,
+                  recording: Recording = None) -> tuple[GameState, list[Bird]]:
+    """
+    NAME:           advance_frame
+    PARAMETERS:     tree, the search tree of the game
+                    previews, if the birds of the best path should be returned to preview it
+                    recording, where the action of the frame is recorded, None to not record it
+    PURPOSE:        This function searches for the best path and advances the tree to its next game state.
+                    The preview birds are copies moved to where they will be on the screen, so they can be drawn
+                    while the tree keeps changing, and at most every const.TREE_STEP frames of the path is kept.
+    PRECONDITION:   The bird of the tree's root is not dead.
+    POSTCONDITION:  A tuple of the next game state and the preview birds is returned,
+                    None is returned when the bird cannot survive.
+    """
+    tree.search()
+    if len(tree.path) == 0:
+        if recording is not None:
+            recording.died = True
+        return None
+    jump = tree.next_action() if recording is not None else False
+    game_state = tree.proceed()
+    if recording is not None:
+        recording.add(jump, game_state)
+
+    birds = list()
+    if previews:
+        path_states = tree.get_path_states()
+        path_frames = tree.get_path_frames()
+        # Skip indexes in the list to draw less birds
+        indexes = list(range(const.TREE_STEP, len(path_states), const.TREE_STEP))
+        # Manually append the last part of the path to clearly see when the bird encounters death
+        indexes.append(len(path_states) - 1)
+        for i in indexes:
+            # Move the bird x position "into the future" by how far the pipes move until then
+            bird = path_states[i].bird.clone()
+            bird.x += game_state.pipe_speed * game_state.delta * path_frames[i]
+            birds.append(bird)
+
+    return game_state, birds
+